@@ -0,0 +1,39 @@
+"""
+Benchmark of saving and loading sessions as json and as binary session
+files, on the session of session_loading.build_session. Run from the
+repository root:
+
+    python benchmarks/session_files.py [n_panels] [n_laminates]
+"""
+
+import sys
+
+from session_loading import REPEAT, best, build_session
+
+from gl_hsc_scantling.session import Session
+
+
+def main(n_panels: int = 5000, n_laminates: int = 15000):
+    session = build_session(n_panels, n_laminates)
+    json = session.dumps_json()
+    binary = session.dumps_binary()
+    loaded = Session()
+    loaded.loads_binary(binary)
+    assert loaded == session
+    dumps_json = best(session.dumps_json)
+    dumps_binary = best(session.dumps_binary)
+    loads_json = best(lambda: Session().loads_json(json))
+    loads_binary = best(lambda: Session().loads_binary(binary))
+    print(f"json {len(json)} bytes, binary {len(binary)} bytes, best of {REPEAT}")
+    print(
+        f"save: json {dumps_json:.3f} s, binary {dumps_binary:.3f} s "
+        f"({dumps_json / dumps_binary:.1f}x)"
+    )
+    print(
+        f"load: json {loads_json:.3f} s, binary {loads_binary:.3f} s "
+        f"({loads_json / loads_binary:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
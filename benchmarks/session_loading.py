@@ -0,0 +1,186 @@
+"""
+Benchmark of session loading: deserialize_dataclass against the
+bulk.constructor builders Session.load_session uses.
+
+The session is the test suite's example session plus n_panels panels and
+n_laminates laminates. Run from the repository root:
+
+    python benchmarks/session_loading.py [n_panels] [n_laminates]
+"""
+
+import sys
+from json import dumps, loads
+from timeit import repeat
+
+from dataclass_tools.tools import deserialize_dataclass
+
+from gl_hsc_scantling.composites import (
+    Fiber,
+    Lamina,
+    LaminaMonolith,
+    Matrix,
+    Ply,
+    PlyStack,
+    SingleSkinLaminate,
+)
+from gl_hsc_scantling.elements import StructuralElement
+from gl_hsc_scantling.locations import Bottom, WetDeck
+from gl_hsc_scantling.panels import Panel
+from gl_hsc_scantling.session import COLLECTION_TYPES, TYPE_LABEL, Session
+from gl_hsc_scantling.stiffeners import LBar, Stiffener, StiffenerSectionWithFoot
+from gl_hsc_scantling.vessel import Catamaran
+
+REPEAT = 3
+
+
+def build_session(n_panels: int = 5000, n_laminates: int = 15000) -> Session:
+    """Session of n_panels bottom panels and wet deck stiffeners over
+    n_laminates laminates.
+    """
+    session = Session()
+    vessel = Catamaran(
+        name="catamaran",
+        speed=15,
+        displacement=6,
+        length=10,
+        beam=6.5,
+        fwd_perp=10,
+        aft_perp=0,
+        draft=0.51,
+        z_baseline=-0.51,
+        block_coef=0.4,
+        water_plane_area=10,
+        lcg=4,
+        deadrise_lcg=12,
+        dist_hull_cl=4.6,
+        type_of_service="PASSENGER",
+        service_range="USR",
+    )
+    polyester = Matrix(
+        name="polyester",
+        density=1200,
+        modulus_x=3000000,
+        modulus_xy=1140000,
+        poisson=0.316,
+    )
+    e_glass = Fiber(
+        name="e_glass",
+        density=2540,
+        modulus_x=73000000,
+        modulus_y=73000000,
+        modulus_xy=30000000,
+        poisson=0.18,
+    )
+    et_0900 = Lamina(
+        LaminaMonolith(
+            name="et_0900",
+            modulus_x=14336000,
+            modulus_y=39248000,
+            modulus_xy=4530000,
+            poisson_xy=0.09,
+            thickness=0.000228,
+            f_mass_cont=0.7,
+            f_area_density=0.304,
+            max_strain_x=0.035,
+            max_strain_xy=0.07,
+        )
+    )
+    session.add_stuff([vessel, polyester, e_glass, et_0900])
+    laminates = [
+        SingleSkinLaminate(
+            name=f"laminate {i}",
+            ply_stack=PlyStack(
+                [Ply(material=et_0900, orientation=angle) for angle in (0, 90)],
+                multiple=10 + i % 10,
+            ),
+        )
+        for i in range(max(n_laminates, 1))
+    ]
+    session.add_stuff(laminates)
+    section = StiffenerSectionWithFoot(
+        LBar(
+            name="lbar_01",
+            laminate_web=laminates[0],
+            dimension_web=0.05,
+            laminate_flange=laminates[0],
+            dimension_flange=0.02,
+        )
+    )
+    session.add_stuff(section)
+    for i in range(n_panels):
+        laminate = laminates[i % len(laminates)]
+        x = 1 + 8 * i / max(n_panels, 1)
+        session.add_stuff(
+            [
+                StructuralElement(
+                    name=f"panel {i}",
+                    x=x,
+                    z=-0.3,
+                    vessel=vessel,
+                    model=Panel(
+                        dim_x=1,
+                        dim_y=0.5 + i % 5 / 10,
+                        curvature_x=0.1,
+                        curvature_y=0.1,
+                        laminate=laminate,
+                    ),
+                    location=Bottom(deadrise=20),
+                ),
+                StructuralElement(
+                    name=f"stiffener {i}",
+                    x=x,
+                    z=0.7,
+                    vessel=vessel,
+                    model=Stiffener(
+                        stiff_section=section,
+                        span=1,
+                        spacing_1=0.5,
+                        spacing_2=0.5,
+                        stiff_att_plate=1,
+                        stiff_att_angle=0,
+                        att_plate_1=laminate,
+                        att_plate_2=laminate,
+                    ),
+                    location=WetDeck(deadrise=0, air_gap=0.7),
+                ),
+            ]
+        )
+    return session
+
+
+def load_with_deserialize_dataclass(serialized: dict) -> Session:
+    """Loading as load_session did before bulk.constructor."""
+    session = Session()
+    collections = session.session_dict
+    for name, types in COLLECTION_TYPES.items():
+        collection = collections[name]
+        for value in serialized.get(name, []):
+            typ = types[value[TYPE_LABEL]] if isinstance(types, dict) else types
+            collection[value["name"]] = deserialize_dataclass(
+                dct=value,
+                dataclass=typ,
+                build_instance=True,
+                dict_of_collections=collections,
+            )
+    return session
+
+
+def best(function) -> float:
+    return min(repeat(function, number=1, repeat=REPEAT))
+
+
+def main(n_panels: int = 5000, n_laminates: int = 15000):
+    serialized = loads(build_session(n_panels, n_laminates).dumps_json())
+    expected = Session()
+    expected.load_session(serialized)
+    assert load_with_deserialize_dataclass(serialized) == expected
+    baseline = best(lambda: load_with_deserialize_dataclass(serialized))
+    bulk = best(lambda: Session().load_session(serialized))
+    entities = sum(len(values) for values in serialized.values())
+    print(f"{entities} entities, best of {REPEAT}")
+    print(f"deserialize_dataclass: {baseline:.3f} s")
+    print(f"bulk.constructor:      {bulk:.3f} s ({baseline / bulk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,282 @@
+"""
+Batch evaluation of stiffeners.
+
+A StiffenerBatch holds N stiffeners and evaluates the C3.8.4 loads, responses
+and criteria of all of them as arrays. The sections with attached plates are
+concatenated into one set of rectangle arrays and their properties are
+segmented reductions, one segment per stiffener.
+"""
+
+from dataclasses import dataclass, replace
+from functools import cached_property as property
+
+import numpy as np
+import pandas as pd
+
+from .elements import StructuralElement
+from .stiffeners import (
+    BOUND_COND_COEF_BEND,
+    BOUND_COND_COEF_DEFLECTION,
+    EFF_WIDTH_FP,
+    EFF_WIDTH_XP,
+    LENGTH_BET_MOM_FACTOR,
+    SPAN_DEFLECTION_FACTOR,
+    STRAIN_LINEAR_LIMIT,
+    STRAIN_SAFETY_FACTOR,
+    STRAIN_SHEAR_LIMIT,
+    BoundaryCondition,
+    Point2D,
+    RectArrays,
+    Stiffener,
+    att_plate_section_factory,
+)
+from .utils import Criteria
+
+BOUND_CONDS = list(BoundaryCondition)
+
+
+def _lookup(table: dict, codes: np.ndarray) -> np.ndarray:
+    """Vectorized boundary condition table lookup, codes being positions in
+    BOUND_CONDS.
+    """
+    return np.array([table[bound_cond] for bound_cond in BOUND_CONDS])[codes]
+
+
+@dataclass
+class StiffenerBatch:
+    """Array counterpart of Stiffener for a list of stiffeners. Pressures
+    may be a float or an array with one pressure per stiffener.
+    """
+
+    stiffeners: list[Stiffener]
+
+    def _values(self, name: str) -> np.ndarray:
+        return np.array([getattr(stiffener, name) for stiffener in self.stiffeners])
+
+    @property
+    def span(self) -> np.ndarray:
+        return self._values("span").astype(float)
+
+    @property
+    def spacings(self) -> np.ndarray:
+        """Shape (N, 2)."""
+        return np.column_stack([self._values("spacing_1"), self._values("spacing_2")])
+
+    @property
+    def spacing(self) -> np.ndarray:
+        return np.sum(self.spacings, axis=1)
+
+    @property
+    def bound_cond(self) -> np.ndarray:
+        """Positions in BOUND_CONDS."""
+        return np.array(
+            [BOUND_CONDS.index(stiffener.bound_cond) for stiffener in self.stiffeners],
+            dtype=int,
+        )
+
+    @property
+    def length_bet_mom(self) -> np.ndarray:
+        return _lookup(LENGTH_BET_MOM_FACTOR, self.bound_cond) * self.span
+
+    @property
+    def eff_widths(self) -> np.ndarray:
+        """Shape (N, 2)."""
+        spacing = self.spacing
+        weff = np.interp(self.length_bet_mom / spacing, EFF_WIDTH_XP, EFF_WIDTH_FP)
+        weffs = self.spacings * weff[:, None]
+        rows = np.arange(len(self.stiffeners))
+        index = self._values("stiff_att_plate") - 1
+        foot_width = np.array(
+            [stiffener.stiff_section.foot_width for stiffener in self.stiffeners]
+        )
+        weffs[rows, index] = np.minimum(
+            self.spacings[rows, index], weffs[rows, index] + foot_width
+        )
+        return weffs
+
+    @property
+    def curvature_correction_coef(self) -> np.ndarray:
+        return 1.15 - 5 * self._values("curvature") / self.span
+
+    @property
+    def boundary_cond_coef_bend(self) -> np.ndarray:
+        return _lookup(BOUND_COND_COEF_BEND, self.bound_cond)
+
+    @property
+    def boundary_cond_coef_deflection(self) -> np.ndarray:
+        return _lookup(BOUND_COND_COEF_DEFLECTION, self.bound_cond)
+
+    @property
+    def _rects(self) -> tuple[RectArrays, np.ndarray]:
+        """Rectangles of all sections with attached plates and the stiffener
+        index of each rectangle.
+        """
+        unit_plates = {}
+        parts = []
+        counts = []
+        for stiffener, eff_widths in zip(self.stiffeners, self.eff_widths):
+            stiffener_parts = []
+            for laminate, width in zip(stiffener.att_plates_lam, eff_widths):
+                if id(laminate) not in unit_plates:
+                    plate = att_plate_section_factory(type(laminate))(laminate, 1)
+                    unit_plates[id(laminate)] = RectArrays.from_elmts(plate.elmts)
+                unit = unit_plates[id(laminate)]
+                stiffener_parts.append(replace(unit, width=unit.width * width))
+            att_plate = stiffener.att_plates_lam[stiffener.stiff_att_plate - 1]
+            stiffener_parts.append(
+                stiffener.stiff_section.rects.placed(
+                    Point2D(0, att_plate.thickness), stiffener.stiff_att_angle
+                )
+            )
+            parts += stiffener_parts
+            counts.append(sum(len(part.width) for part in stiffener_parts))
+        segments = np.repeat(np.arange(len(self.stiffeners)), counts)
+        return RectArrays.concatenate(parts), segments
+
+    def _segment_sum(self, values: np.ndarray) -> np.ndarray:
+        _, segments = self._rects
+        return np.bincount(segments, weights=values, minlength=len(self.stiffeners))
+
+    @property
+    def stiff(self) -> np.ndarray:
+        rects, _ = self._rects
+        return self._segment_sum(rects.stiffs)
+
+    @property
+    def center(self) -> Point2D:
+        rects, _ = self._rects
+        y, z = rects.centers
+        return Point2D(
+            self._segment_sum(rects.stiffs * y) / self.stiff,
+            self._segment_sum(rects.stiffs * z) / self.stiff,
+        )
+
+    @property
+    def bend_stiff(self) -> np.ndarray:
+        """Bending stiffness about the neutral axis, y direction (kN m2)."""
+        rects, _ = self._rects
+        _, z = rects.centers
+        inertia = rects.inertia()
+        base = self._segment_sum(inertia.y * rects.modulus + rects.stiffs * z**2)
+        return base - self.stiff * self.center.z**2
+
+    @property
+    def shear_stiff(self) -> np.ndarray:
+        rects, _ = self._rects
+        return self._segment_sum(rects.area * rects.modulus_shear * rects.web)
+
+    @property
+    def limit_z_center(self) -> np.ndarray:
+        """Bottom and top fibres' z distance to the neutral axis, shape (2, N)."""
+        rects, segments = self._rects
+        _, z = rects.corners
+        starts = np.searchsorted(segments, np.arange(len(self.stiffeners)))
+        limits = np.array(
+            [
+                np.minimum.reduceat(z.min(axis=1), starts),
+                np.maximum.reduceat(z.max(axis=1), starts),
+            ]
+        )
+        return limits - self.center.z
+
+    @property
+    def shear_buckling_strain(self) -> np.ndarray:
+        """Evaluated once per section and span."""
+        strains = {}
+        for stiffener in self.stiffeners:
+            key = (id(stiffener.stiff_section), stiffener.span)
+            if key not in strains:
+                strains[key] = stiffener.stiff_section.shear_buckling_strain(
+                    stiffener.span
+                )
+        return np.array(
+            [
+                strains[(id(stiffener.stiff_section), stiffener.span)]
+                for stiffener in self.stiffeners
+            ]
+        )
+
+    def bending_momt(self, pressure) -> np.ndarray:
+        return (
+            pressure
+            * self.spacing
+            * self.span**2
+            * self.curvature_correction_coef
+            / self.boundary_cond_coef_bend
+        )
+
+    def shear_force(self, pressure) -> np.ndarray:
+        return pressure * self.span * self.spacing / 2
+
+    def deflection(self, pressure) -> np.ndarray:
+        return (
+            pressure
+            * self.spacing
+            * self.span**4
+            * self.boundary_cond_coef_deflection
+            / (384 * self.bend_stiff)
+        )
+
+    def linear_strains(self, pressure) -> np.ndarray:
+        """Bottom and top fibres' strains, shape (2, N)."""
+        return self.bending_momt(pressure) * self.limit_z_center / self.bend_stiff
+
+    def shear_strain(self, pressure) -> np.ndarray:
+        return self.shear_force(pressure) / self.shear_stiff
+
+    def criteria(self, pressure) -> dict[str, Criteria]:
+        """Same criteria as Stiffener.criteria, with array values."""
+        return self.load_criteria(
+            self.bending_momt(pressure),
+            self.shear_force(pressure),
+            self.deflection(pressure),
+        )
+
+    def load_criteria(
+        self, bending_momt, shear_force, deflection
+    ) -> dict[str, Criteria]:
+        """Stiffener criteria for given bending moments (kN m), shear forces
+        (kN) and deflections (m), e.g. from a grillage analysis.
+        """
+        strains = bending_momt * self.limit_z_center / self.bend_stiff
+        shear_strain = shear_force / self.shear_stiff
+        return {
+            "deflection": Criteria(deflection, SPAN_DEFLECTION_FACTOR * self.span, 1),
+            "linear_strain_ratio_bottom": Criteria(
+                np.abs(strains[0]), STRAIN_LINEAR_LIMIT, STRAIN_SAFETY_FACTOR
+            ),
+            "linear_strain_ratio_top": Criteria(
+                np.abs(strains[1]), STRAIN_LINEAR_LIMIT, STRAIN_SAFETY_FACTOR
+            ),
+            "shear_strain_ratio": Criteria(
+                shear_strain, STRAIN_SHEAR_LIMIT, STRAIN_SAFETY_FACTOR
+            ),
+            "shear_strain_buckling_ratio": Criteria(
+                shear_strain, self.shear_buckling_strain, 1
+            ),
+        }
+
+    def ratios(self, pressure) -> pd.DataFrame:
+        """Criteria ratios (allowable/calculated), one row per stiffener."""
+        if not self.stiffeners:
+            return pd.DataFrame()
+        return criteria_ratios(self.criteria(pressure))
+
+
+def criteria_ratios(criteria: dict[str, Criteria]) -> pd.DataFrame:
+    return pd.DataFrame({name: value.ratio for name, value in criteria.items()})
+
+
+def stiffeners_rule_check(elements: list[StructuralElement]) -> pd.DataFrame:
+    """Criteria ratios of every stiffener element at its design pressure,
+    evaluated in a single StiffenerBatch.
+    """
+    elements = [elmt for elmt in elements if isinstance(elmt.model, Stiffener)]
+    if not elements:
+        return pd.DataFrame()
+    batch = StiffenerBatch([elmt.model for elmt in elements])
+    pressures = np.array([elmt.design_pressure for elmt in elements])
+    ratios = batch.ratios(pressures)
+    ratios.insert(0, "design_pressure", pressures)
+    ratios.insert(0, "name", [elmt.name for elmt in elements])
+    return ratios
@@ -0,0 +1,269 @@
+"""
+Binary session files.
+
+A binary session file holds a serialized session (the collections' lists of
+serialized entities, as in the json files) as a string table plus typed
+records. The entities of each collection are grouped by their fields into
+tables, whose columns are contiguous arrays: float64 or int64 numbers, bool
+flags, string table indices, or json text of nested values (also in the
+string table). Arrays are 8 byte aligned, so a file's numeric element data
+(x, z, dimensions, spacings...) can be memory mapped read only, e.g. by the
+workers of a process pool, instead of each one loading a copy. Sessions
+write their entities' columns and build their entities from the tables'
+columns (see bulk.serialized_tables and bulk.column_constructor), with no
+dict per entity.
+
+Layout: MAGIC, version and header size (uint64), the json header describing
+the tables, then the arrays.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from json import dumps, loads
+from pathlib import Path
+from typing import BinaryIO, Iterator, Union
+
+import numpy as np
+
+MAGIC = b"GLHSCBIN"
+VERSION = 1
+ALIGNMENT = 8
+DTYPES = {
+    "float": np.float64,
+    "int": np.int64,
+    "bool": np.uint8,
+    "str": np.int64,
+    "json": np.int64,
+}
+
+
+def _kind(values: list) -> str:
+    types = {type(value) for value in values}
+    if types == {bool}:
+        return "bool"
+    if types == {int}:
+        return "int"
+    if types <= {int, float}:
+        return "float"
+    if types == {str}:
+        return "str"
+    return "json"
+
+
+@dataclass
+class _Writer:
+    """Strings and aligned arrays of a file being written."""
+
+    strings: dict[str, int] = field(default_factory=dict)
+    arrays: list[np.ndarray] = field(default_factory=list)
+    size: int = 0
+
+    def string(self, value: str) -> int:
+        return self.strings.setdefault(value, len(self.strings))
+
+    def array(self, values) -> int:
+        """Offset of the array in the data section."""
+        array = np.ascontiguousarray(values)
+        offset = self.size
+        self.arrays.append(array)
+        self.size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        return offset
+
+    def column(self, kind: str, values: list) -> int:
+        if kind == "str":
+            indices = {value: self.string(value) for value in dict.fromkeys(values)}
+            values = [indices[value] for value in values]
+        elif kind == "json":
+            values = [self.string(dumps(value)) for value in values]
+        return self.array(np.array(values, dtype=DTYPES[kind]))
+
+    def table(self, keys: list[str], positions: list[int], columns: list) -> dict:
+        kinds = [_kind(values) for values in columns]
+        return {
+            "keys": list(keys),
+            "kinds": kinds,
+            "count": len(positions),
+            "positions": self.array(np.array(positions, dtype=np.int64)),
+            "columns": [
+                self.column(kind, values) for kind, values in zip(kinds, columns)
+            ],
+        }
+
+    def tables(self, records: list[dict]) -> list[dict]:
+        """Records grouped by fields, in order of appearance."""
+        groups: dict[tuple, list[int]] = {}
+        for position, record in enumerate(records):
+            groups.setdefault(tuple(record), []).append(position)
+        return [
+            self.table(
+                keys, positions, [[records[i][key] for i in positions] for key in keys]
+            )
+            for keys, positions in groups.items()
+        ]
+
+    def write(self, collections: dict[str, dict], f: BinaryIO):
+        encoded = [string.encode() for string in self.strings]
+        ends = np.cumsum([len(string) for string in encoded], dtype=np.int64)
+        header = {
+            "strings": {
+                "count": len(encoded),
+                "ends": self.array(ends),
+                "data": self.array(np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+            },
+            "collections": collections,
+        }
+        header_bytes = dumps(header).encode()
+        header_bytes += b" " * (-len(header_bytes) % ALIGNMENT)
+        f.write(MAGIC)
+        f.write(np.array([VERSION, len(header_bytes)], dtype=np.uint64).tobytes())
+        f.write(header_bytes)
+        for array in self.arrays:
+            f.write(array.tobytes())
+            f.write(b"\0" * (-array.nbytes % ALIGNMENT))
+
+
+def write_session(data: dict[str, list[dict]], f: BinaryIO):
+    """Writes the collections' lists of serialized entities to a binary
+    stream.
+    """
+    writer = _Writer()
+    collections = {
+        name: {"count": len(records), "tables": writer.tables(records)}
+        for name, records in data.items()
+    }
+    writer.write(collections, f)
+
+
+def write_tables(data: dict[str, list[tuple[list[int], dict[str, list]]]], f: BinaryIO):
+    """Writes the collections' tables, the positions of their entities and
+    their serialized columns by key (see bulk.serialized_tables), to a binary
+    stream. Skips building a dict per entity.
+    """
+    writer = _Writer()
+    collections = {
+        name: {
+            "count": sum(len(positions) for positions, _ in tables),
+            "tables": [
+                writer.table(list(columns), positions, list(columns.values()))
+                for positions, columns in tables
+            ],
+        }
+        for name, tables in data.items()
+    }
+    writer.write(collections, f)
+
+
+class SessionFile:
+    """Binary session file read from a path, memory mapped read only, or from
+    bytes.
+    """
+
+    def __init__(self, source: Union[str, Path, bytes]):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.buffer = np.frombuffer(source, dtype=np.uint8)
+        else:
+            self.buffer = np.memmap(source, dtype=np.uint8, mode="r")
+        if self.buffer[: len(MAGIC)].tobytes() != MAGIC:
+            raise ValueError("Not a binary session file.")
+        start = len(MAGIC)
+        version, header_size = self.buffer[start : start + 16].view(np.uint64)
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary session file version {version}.")
+        start += 16
+        self.header = loads(self.buffer[start : start + int(header_size)].tobytes())
+        self.data_offset = start + int(header_size)
+
+    def _array(self, offset: int, kind: str, count: int) -> np.ndarray:
+        dtype = np.dtype(DTYPES[kind])
+        start = self.data_offset + offset
+        return self.buffer[start : start + count * dtype.itemsize].view(dtype)
+
+    @cached_property
+    def strings(self) -> list[str]:
+        strings = self.header["strings"]
+        ends = self._array(strings["ends"], "int", strings["count"])
+        start = self.data_offset + strings["data"]
+        size = int(ends[-1]) if len(ends) else 0
+        data = self.buffer[start : start + size].tobytes()
+        starts = [0, *ends[:-1].tolist()]
+        return [data[i:j].decode() for i, j in zip(starts, ends.tolist())]
+
+    def _values(self, kind: str, column: np.ndarray, shared: bool = False) -> list:
+        strings = self.strings
+        if kind == "str":
+            return [strings[i] for i in column.tolist()]
+        if kind == "json" and shared:
+            indices = column.tolist()
+            values = {i: loads(strings[i]) for i in set(indices)}
+            return [values[i] for i in indices]
+        if kind == "json":
+            return [loads(strings[i]) for i in column.tolist()]
+        if kind == "bool":
+            return column.astype(bool).tolist()
+        return column.tolist()
+
+    def tables(
+        self, collection: str, shared: bool = False
+    ) -> Iterator[tuple[list[int], dict[str, list]]]:
+        """Positions of the entities of each of the collection's tables and
+        their serialized columns by key. If shared, json values of the same
+        text are decoded once, the rows sharing them.
+        """
+        for table in self.header["collections"][collection]["tables"]:
+            count = table["count"]
+            positions = self._array(table["positions"], "int", count).tolist()
+            yield positions, {
+                key: self._values(kind, self._array(offset, kind, count), shared)
+                for key, kind, offset in zip(
+                    table["keys"], table["kinds"], table["columns"]
+                )
+            }
+
+    def records(self, collection: str) -> list[dict]:
+        """Serialized entities of the collection, in their original order."""
+        records = [None] * self.header["collections"][collection]["count"]
+        for positions, columns in self.tables(collection):
+            keys = list(columns)
+            for position, row in zip(positions, zip(*columns.values())):
+                records[position] = dict(zip(keys, row))
+        return records
+
+    def to_dict(self) -> dict[str, list[dict]]:
+        return {name: self.records(name) for name in self.header["collections"]}
+
+    def columns(self, collection: str) -> dict[str, np.ndarray]:
+        """Numeric fields shared by all the collection's entities, in their
+        original order. Fields of a single table are views of the file, with
+        no copy.
+        """
+        header = self.header["collections"][collection]
+        tables = header["tables"]
+        numeric = [
+            {
+                key: (kind, offset)
+                for key, kind, offset in zip(
+                    table["keys"], table["kinds"], table["columns"]
+                )
+                if kind in ("float", "int")
+            }
+            for table in tables
+        ]
+        if not tables:
+            return {}
+        shared = [key for key in numeric[0] if all(key in table for table in numeric)]
+        if len(tables) == 1:
+            count = tables[0]["count"]
+            return {
+                key: self._array(numeric[0][key][1], numeric[0][key][0], count)
+                for key in shared
+            }
+        columns = {}
+        for key in shared:
+            column = np.empty(header["count"])
+            for table, fields_ in zip(tables, numeric):
+                kind, offset = fields_[key]
+                count = table["count"]
+                positions = self._array(table["positions"], "int", count)
+                column[positions] = self._array(offset, kind, count)
+            columns[key] = column
+        return columns
@@ -0,0 +1,430 @@
+"""
+Specialized (de)serialization of session entities.
+
+deserialize_dataclass inspects a dataclass' fields, type hints and options
+for every dict it builds. constructor inspects them once per dataclass and
+returns a function building instances from serialized dicts, with a
+converter per field: references looked up in the collections by name,
+enums, nested and flattened dataclasses (the subtype picked from the type
+label), lists of those, or values passed as they are.
+
+column_constructor and column_serializer do the same a column at a time,
+for binary session files: the first builds the instances of a table of
+serialized columns (lists of equal length by key), the second gives the
+columns serialize_dataclass would give to a list of entities of the same
+layout (their type and their flattened fields' types, which give their
+keys).
+"""
+
+import gc
+import typing
+from contextlib import contextmanager
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import cache
+from operator import attrgetter
+from types import UnionType
+from typing import Any, Callable, Optional
+
+from dataclass_tools.tools import DESERIALIZER_OPTIONS, DeSerializerOptions
+
+Converter = Callable[[Any, dict], Any]
+# Builds count instances from their serialized columns and the collections
+ColumnsConverter = Callable[[dict[str, list], int, dict], list]
+SCALARS = frozenset({int, float, str, bool, type(None)})
+
+
+@contextmanager
+def gc_paused():
+    """Pauses the garbage collector, whose collections, triggered by the
+    allocations, would traverse every entity built so far many times over.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _hints(cls: type) -> dict:
+    try:
+        return typing.get_type_hints(cls)
+    except (NameError, TypeError):
+        return {field_.name: field_.type for field_ in fields(cls)}
+
+
+def _reference(collection: str) -> Converter:
+    return lambda value, collections: collections[collection][value]
+
+
+def _converter(typ, options: Optional[DeSerializerOptions]) -> Optional[Converter]:
+    """Converter of a serialized field value, None if it's taken as is."""
+    if options is not None and options.subs_by_attr:
+        return _reference(options.subs_collection_name)
+    origin = typing.get_origin(typ)
+    args = typing.get_args(typ)
+    if origin is list and args:
+        item = _converter(args[0], None)
+        if item is None:
+            return None
+        return lambda value, collections: [item(v, collections) for v in value]
+    if origin in (typing.Union, UnionType):
+        return _converter(next(arg for arg in args if arg is not type(None)), None)
+    if isinstance(typ, type) and is_dataclass(typ):
+        build = constructor(typ)
+        return lambda value, collections: (
+            build(value, collections) if isinstance(value, dict) else value
+        )
+    if isinstance(typ, type) and issubclass(typ, Enum):
+        return lambda value, collections: typ(value)
+    return None
+
+
+def _flattened(typ, name: str, options: DeSerializerOptions) -> Converter:
+    """Builds a field serialized in its parent's dict."""
+    if not options.subtype_table:
+        return constructor(typ)
+    label = options.type_label or name
+    table = options.subtype_table
+    # Subtypes' constructors are made when first used, not every subtype
+    # being a dataclass
+    return lambda dct, collections: constructor(table[dct[label]])(dct, collections)
+
+
+@cache
+def constructor(cls: type) -> Callable[[dict, dict], Any]:
+    """Function building instances of the dataclass from serialized dicts and
+    the dict of collections references are looked up in, as
+    deserialize_dataclass does.
+    """
+    hints = _hints(cls)
+    flat = []
+    steps = []
+    for field_ in fields(cls):
+        if not field_.init:
+            continue
+        options = field_.metadata.get(DESERIALIZER_OPTIONS)
+        typ = hints.get(field_.name, field_.type)
+        if options is not None and options.flatten:
+            flat.append((field_.name, _flattened(typ, field_.name, options)))
+            continue
+        key = (options and options.overwrite_key) or field_.name
+        steps.append((field_.name, key, _converter(typ, options)))
+
+    def build(dct: dict, collections: dict):
+        kwargs = {name: convert(dct, collections) for name, convert in flat}
+        for name, key, convert in steps:
+            if key in dct:
+                value = dct[key]
+                if convert is not None and value is not None:
+                    value = convert(value, collections)
+                kwargs[name] = value
+        return cls(**kwargs)
+
+    return build
+
+
+def _column_converter(
+    typ, options: Optional[DeSerializerOptions]
+) -> Optional[Callable[[list, dict], list]]:
+    """Converter of a column of serialized field values, None if they're taken
+    as they are.
+    """
+    if options is not None and options.subs_by_attr:
+        name = options.subs_collection_name
+
+        def reference(values: list, collections: dict) -> list:
+            table = collections[name]
+            return [None if value is None else table[value] for value in values]
+
+        return reference
+    if isinstance(typ, type) and issubclass(typ, Enum):
+
+        def enum(values: list, collections: dict) -> list:
+            members = {value: typ(value) for value in set(values) if value is not None}
+            return [members.get(value) for value in values]
+
+        return enum
+    args = typing.get_args(typ)
+    if (
+        typing.get_origin(typ) is list
+        and args
+        and isinstance(args[0], type)
+        and is_dataclass(args[0])
+    ):
+        return _items_converter(column_constructor(args[0]))
+    convert = _converter(typ, options)
+    if convert is None:
+        return None
+    return lambda values, collections: [
+        None if value is None else convert(value, collections) for value in values
+    ]
+
+
+def _items_converter(build: ColumnsConverter) -> Callable[[list, dict], list]:
+    """Builds lists of serialized dataclasses (e.g. plies) as one table, or
+    item by item if their dicts don't have the same keys.
+    """
+
+    def one(value, collections: dict):
+        if not isinstance(value, dict):
+            return value
+        return build({key: [field] for key, field in value.items()}, 1, collections)[0]
+
+    def items(values: list, collections: dict) -> list:
+        dicts = [item for value in values if value is not None for item in value]
+        keys = dicts[0].keys() if dicts else {}
+        if not all(isinstance(value, dict) and value.keys() == keys for value in dicts):
+            return [
+                None if value is None else [one(item, collections) for item in value]
+                for value in values
+            ]
+        built = build(
+            {key: [value[key] for value in dicts] for key in keys},
+            len(dicts),
+            collections,
+        )
+        column = []
+        start = 0
+        for value in values:
+            if value is None:
+                column.append(None)
+                continue
+            column.append(built[start : start + len(value)])
+            start += len(value)
+        return column
+
+    return items
+
+
+def _rows(columns: dict[str, list], rows: list[int]) -> dict[str, list]:
+    return {key: [values[i] for i in rows] for key, values in columns.items()}
+
+
+def subtype_column_constructor(table: dict, label: str) -> ColumnsConverter:
+    """Builds each row as the subtype its label column gives. Rows of labels
+    not in the table are left None.
+    """
+
+    def build(columns: dict[str, list], count: int, collections: dict) -> list:
+        groups: dict[str, list[int]] = {}
+        for row, value in enumerate(columns[label]):
+            groups.setdefault(value, []).append(row)
+        if len(groups) == 1 and next(iter(groups)) in table:
+            return column_constructor(table[next(iter(groups))])(
+                columns, count, collections
+            )
+        entities = [None] * count
+        for value, rows in groups.items():
+            if value not in table:
+                continue
+            built = column_constructor(table[value])(
+                _rows(columns, rows), len(rows), collections
+            )
+            for row, entity in zip(rows, built):
+                entities[row] = entity
+        return entities
+
+    return build
+
+
+@cache
+def column_constructor(cls: type) -> ColumnsConverter:
+    """Function building the instances of the dataclass of a table of
+    serialized columns, as constructor does row by row.
+    """
+    hints = _hints(cls)
+    init = [field_.name for field_ in fields(cls) if field_.init]
+    positional = not any(getattr(field_, "kw_only", False) for field_ in fields(cls))
+    steps = []
+    for field_ in fields(cls):
+        if not field_.init:
+            continue
+        options = field_.metadata.get(DESERIALIZER_OPTIONS)
+        typ = hints.get(field_.name, field_.type)
+        if options is not None and options.flatten:
+            if options.subtype_table:
+                build = subtype_column_constructor(
+                    options.subtype_table, options.type_label or field_.name
+                )
+            else:
+                build = column_constructor(typ)
+            steps.append((field_.name, None, build))
+            continue
+        key = (options and options.overwrite_key) or field_.name
+        steps.append((field_.name, key, _column_converter(typ, options)))
+
+    def build(columns: dict[str, list], count: int, collections: dict) -> list:
+        names = []
+        values = []
+        for name, key, convert in steps:
+            if key is None:
+                values.append(convert(columns, count, collections))
+            elif key in columns:
+                column = columns[key]
+                values.append(
+                    column if convert is None else convert(column, collections)
+                )
+            else:
+                continue
+            names.append(name)
+        if not names:
+            return [cls() for _ in range(count)]
+        if positional and names == init[: len(names)]:
+            return list(map(cls, *values))
+        return [cls(**dict(zip(names, row))) for row in zip(*values)]
+
+    return build
+
+
+@cache
+def _flattened_fields(cls: type) -> tuple[str, ...]:
+    return tuple(
+        field_.name
+        for field_ in fields(cls)
+        if getattr(field_.metadata.get(DESERIALIZER_OPTIONS), "flatten", False)
+    )
+
+
+def _layout(entity) -> tuple:
+    return (
+        type(entity),
+        *(_layout(getattr(entity, name)) for name in _flattened_fields(type(entity))),
+    )
+
+
+def _layouts(entities: list) -> list[tuple]:
+    """Layouts of the entities, a flattened field at a time if they're of the
+    same type.
+    """
+    types = {type(entity) for entity in entities}
+    if len(types) != 1:
+        return [_layout(entity) for entity in entities]
+    typ = types.pop()
+    nested = [
+        _layouts(list(map(attrgetter(name), entities)))
+        for name in _flattened_fields(typ)
+    ]
+    if not nested:
+        return [(typ,)] * len(entities)
+    return [(typ, *row) for row in zip(*nested)]
+
+
+def _by_layout(entities: list) -> dict[tuple, list[int]]:
+    """Positions of the entities of each layout, in order of appearance."""
+    groups: dict[tuple, list[int]] = {}
+    for position, key in enumerate(_layouts(entities)):
+        groups.setdefault(key, []).append(position)
+    return groups
+
+
+def _type_name(value, options: DeSerializerOptions) -> str:
+    return options.type_name(value) if options.type_name else type(value).__name__
+
+
+def _serialized_items(items: list) -> list[dict]:
+    """Serialized dataclasses, sharing the columns of the same layouts."""
+    dicts = [None] * len(items)
+    for positions in _by_layout(items).values():
+        columns = column_serializer(type(items[positions[0]]))(
+            [items[i] for i in positions]
+        )
+        keys = list(columns)
+        for position, row in zip(positions, zip(*columns.values())):
+            dicts[position] = dict(zip(keys, row))
+    return dicts
+
+
+def _serialized(value, options: Optional[DeSerializerOptions] = None):
+    """A field value as serialize_dataclass serializes it."""
+    if type(value) in SCALARS:
+        return value
+    if is_dataclass(value):
+        dct = _serialized_items([value])[0]
+        if options is not None and options.add_type:
+            dct[options.type_label or "typ"] = _type_name(value, options)
+        return dct
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _serialized(item, options) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and all(is_dataclass(item) for item in value):
+            return _serialized_items(value)
+        return [_serialized(item) for item in value]
+    return value
+
+
+def _serialized_column(values: list, options: Optional[DeSerializerOptions]) -> list:
+    if options is not None and options.subs_by_attr:
+        attribute = options.subs_by_attr
+        return [
+            None if value is None else getattr(value, attribute) for value in values
+        ]
+    types = set(map(type, values))
+    if types <= SCALARS:
+        return values
+    if all(issubclass(typ, Enum) for typ in types - {type(None)}):
+        return [None if value is None else value.value for value in values]
+    lists = [value for value in values if isinstance(value, list)]
+    if len(lists) == len(values) and all(
+        is_dataclass(item) for value in lists for item in value
+    ):
+        # e.g. plies, serialized together
+        items = _serialized_items([item for value in lists for item in value])
+        column = []
+        start = 0
+        for value in lists:
+            column.append(items[start : start + len(value)])
+            start += len(value)
+        return column
+    return [_serialized(value, options) for value in values]
+
+
+@cache
+def column_serializer(cls: type) -> Callable[[list], dict[str, list]]:
+    """Function giving the serialized columns, by key in serialize_dataclass'
+    order, of a list of instances of the dataclass of the same layout.
+    """
+    steps = []
+    for field_ in fields(cls):
+        options = field_.metadata.get(DESERIALIZER_OPTIONS)
+        if options is not None and options.flatten:
+            steps.append((field_.name, None, options))
+        else:
+            key = (options and options.overwrite_key) or field_.name
+            steps.append((field_.name, key, options))
+
+    def serialize(entities: list) -> dict[str, list]:
+        columns = {}
+        for name, key, options in steps:
+            values = list(map(attrgetter(name), entities))
+            if key is not None:
+                columns[key] = _serialized_column(values, options)
+                continue
+            columns.update(column_serializer(type(values[0]))(values))
+            if options.add_type:
+                columns[options.type_label or name] = [
+                    _type_name(value, options) for value in values
+                ]
+        return columns
+
+    return serialize
+
+
+def serialized_tables(
+    entities: list, type_label: Optional[str] = None
+) -> list[tuple[list[int], dict[str, list]]]:
+    """Positions and serialized columns of the entities of each layout, in
+    order of appearance, with their type names in a type_label column if
+    given.
+    """
+    tables = []
+    for key, positions in _by_layout(entities).items():
+        columns = column_serializer(key[0])([entities[i] for i in positions])
+        if type_label is not None:
+            columns[type_label] = [key[0].__name__] * len(positions)
+        tables.append((positions, columns))
+    return tables
@@ -0,0 +1,195 @@
+"""
+Stiffener section catalogs.
+
+Precomputed section properties of profile libraries, optionally with typical
+attached plates, stored column by column in a numpy .npz file. Every column
+has a sorted index, so range queries ("lightest profile with EI >= X and
+GA >= Y") don't recompute or scan the sections.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .composites import Laminate
+from .stiffeners import (
+    PlacedStiffnerSection,
+    Point2D,
+    SectionElementListChain,
+    StiffenerSection,
+    att_plate_section_factory,
+)
+
+SECTION_COLUMNS = ["linear_density", "bend_stiff", "shear_stiff", "stiff", "z_center"]
+NAME_LABEL = "name"
+WIDTHS_LABEL = "att_plate_widths"
+COLUMN_PREFIX = "column_"
+INDEX_PREFIX = "index_"
+
+
+def att_plate_column(width: float) -> str:
+    """Name of the bending stiffness column with an attached plate of the
+    given width (m).
+    """
+    return f"bend_stiff_att_{width * 1000:.0f}"
+
+
+def _with_att_plate(
+    section: StiffenerSection, laminate: Laminate, width: float
+) -> StiffenerSection:
+    return StiffenerSection(
+        SectionElementListChain(
+            [
+                att_plate_section_factory(type(laminate))(laminate, width),
+                PlacedStiffnerSection(
+                    stiff_section=section,
+                    angle=0,
+                    anchor_pt=Point2D(0, laminate.thickness),
+                ),
+            ]
+        )
+    )
+
+
+def _section_row(section, att_plate, att_plate_widths) -> dict[str, float]:
+    row = {
+        "linear_density": section.linear_density,
+        "bend_stiff": section.bend_stiff_0.y,
+        "shear_stiff": section.shear_stiff,
+        "stiff": section.stiff,
+        "z_center": section.center_0.z,
+    }
+    for width in att_plate_widths:
+        row[att_plate_column(width)] = _with_att_plate(
+            section, att_plate, width
+        ).bend_stiff_0.y
+    return row
+
+
+@dataclass
+class SectionCatalog:
+    """Section properties of a profile library, one row per section: linear
+    density (kg/m), bending stiffness about the neutral axis (kN m2), web shear
+    stiffness (kN), extensional stiffness (kN) and neutral axis height (m),
+    plus the bending stiffness with each attached plate width.
+    """
+
+    names: np.ndarray
+    columns: dict[str, np.ndarray]
+    att_plate_widths: np.ndarray = field(default_factory=lambda: np.array([]))
+    indexes: dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+    _sorted: dict[str, np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for name, values in self.columns.items():
+            if name not in self.indexes:
+                self.indexes[name] = np.argsort(values, kind="stable")
+            self._sorted[name] = values[self.indexes[name]]
+
+    @classmethod
+    def from_sections(
+        cls,
+        sections: Iterable[StiffenerSection],
+        att_plate: Optional[Laminate] = None,
+        att_plate_widths: Iterable[float] = (),
+    ) -> "SectionCatalog":
+        """Catalog of sections, e.g. Session.stiffener_sections.values().
+        Attached plate widths (m) require the attached plate laminate.
+        """
+        sections = list(sections)
+        att_plate_widths = list(att_plate_widths)
+        if att_plate_widths and att_plate is None:
+            raise ValueError("att_plate_widths given without att_plate laminate")
+        rows = [
+            _section_row(section, att_plate, att_plate_widths) for section in sections
+        ]
+        columns = {
+            name: np.array([row[name] for row in rows], dtype=float)
+            for name in SECTION_COLUMNS
+            + [att_plate_column(width) for width in att_plate_widths]
+        }
+        return cls(
+            names=np.array([section.name for section in sections], dtype=str),
+            columns=columns,
+            att_plate_widths=np.array(att_plate_widths, dtype=float),
+        )
+
+    def save(self, file_name: str):
+        np.savez(
+            file_name,
+            **{NAME_LABEL: self.names, WIDTHS_LABEL: self.att_plate_widths},
+            **{COLUMN_PREFIX + name: values for name, values in self.columns.items()},
+            **{INDEX_PREFIX + name: index for name, index in self.indexes.items()},
+        )
+
+    @classmethod
+    def load(cls, file_name: str) -> "SectionCatalog":
+        with np.load(file_name, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+
+        def prefixed(prefix):
+            return {
+                key[len(prefix) :]: value
+                for key, value in arrays.items()
+                if key.startswith(prefix)
+            }
+
+        return cls(
+            names=arrays[NAME_LABEL],
+            columns=prefixed(COLUMN_PREFIX),
+            att_plate_widths=arrays[WIDTHS_LABEL],
+            indexes=prefixed(INDEX_PREFIX),
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def range(self, column: str, low: float = -np.inf, high: float = np.inf):
+        """Rows (positions) with low <= column <= high, in ascending column
+        order, found by binary search on the column's sorted index.
+        """
+        index = self.indexes[column]
+        values = self._sorted[column]
+        start = np.searchsorted(values, low, side="left")
+        stop = np.searchsorted(values, high, side="right")
+        return index[start:stop]
+
+    def query(self, **bounds: tuple[float, float]) -> np.ndarray:
+        """Rows satisfying every column=(low, high) bound, None meaning
+        unbounded. The narrowest range is searched on its index and the
+        others are checked on its rows only.
+        """
+        bounds = {
+            column: (
+                -np.inf if low is None else low,
+                np.inf if high is None else high,
+            )
+            for column, (low, high) in bounds.items()
+        }
+        if not bounds:
+            return np.arange(len(self))
+        ranges = {
+            column: self.range(column, *bound) for column, bound in bounds.items()
+        }
+        narrowest = min(ranges, key=lambda column: len(ranges[column]))
+        rows = ranges[narrowest]
+        for column, (low, high) in bounds.items():
+            values = self.columns[column][rows]
+            rows = rows[(values >= low) & (values <= high)]
+        return np.sort(rows)
+
+    def lightest(self, **bounds: tuple[float, float]) -> Optional[str]:
+        """Name of the lightest section within bounds, None if there's none.
+        e.g. catalog.lightest(bend_stiff=(10, None), shear_stiff=(2000, None))
+        """
+        rows = self.query(**bounds)
+        if not len(rows):
+            return None
+        return str(self.names[rows[np.argmin(self.columns["linear_density"][rows])]])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, index=pd.Index(self.names, name=NAME_LABEL))
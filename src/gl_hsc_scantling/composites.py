@@ -4,6 +4,7 @@ Created on Thu Aug  6 11:49:36 2020
 
 @author: ruy
 """
+
 from abc import ABC, abstractmethod, abstractproperty
 from copy import deepcopy
 from dataclasses import asdict, dataclass, field, astuple
@@ -57,6 +58,7 @@ from .common_field_options import (
     SYMMETRIC_OPTIONS,
     THICKNESS_OPTIONS,
 )
+from .persistent import persistent_property
 from .utils import Criteria, criteria
 
 if TYPE_CHECKING:
@@ -66,6 +68,8 @@ if TYPE_CHECKING:
 DIRECTION_LABELS = ["x", "y", "xy"]
 Z_LABEL = "z"
 PLY_LABEL = "ply"
+# Panel laminate check driven by the shear force, all others by the bending moment
+CORE_SHEAR_CRITERIA = "core_shear_stress_ratio"
 PLY_MATERIAL_OPTIONS = DeSerializerOptions(
     subs_by_attr="name",
     subs_collection_name="laminas",
@@ -304,6 +308,7 @@ LAMININA_TYPE_OPTIONS = DeSerializerOptions(
     metadata=PrintMetadata(long_name="Lamina defition"),
 )
 
+
 # Factored data out to get composition over inheritance. Redirected the calls to the data object so the code doesnt breakdown
 @dataclass
 class Lamina:
@@ -633,7 +638,7 @@ class Laminate(ABC):
             }
         )
 
-    @property
+    @persistent_property
     def stiff_matrix(self):
         def ABD_element(Q_array, z_array, power, i, j):
             return sum(
@@ -657,7 +662,7 @@ class Laminate(ABC):
             *[single_matrix(Q_array, z_array, power) for power in range(1, 4)]
         )
 
-    @property
+    @persistent_property
     def compl_matrix(self):
         return _matrix_inv(self.stiff_matrix)
 
@@ -665,7 +670,7 @@ class Laminate(ABC):
     def thickness_eff(self):
         return np.sum([ply.material.thickness for ply in self.plies])
 
-    @property
+    @persistent_property
     def modulus(self):
         return np.array(
             [1 / (self.thickness_eff * self.compl_matrix[i][i]) for i in range(3)]
@@ -679,7 +684,7 @@ class Laminate(ABC):
     def modulus_xy(self):
         return self.modulus[2]
 
-    @property
+    @persistent_property
     def modulus_simp(self):
         return np.array(
             [
@@ -707,7 +712,7 @@ class Laminate(ABC):
             [bend_stiff_ / (self.thickness / 2) for bend_stiff_ in self.bend_stiff]
         )
 
-    @property
+    @persistent_property
     def bend_stiff_simp(self):
         return np.array(
             [
@@ -725,7 +730,7 @@ class Laminate(ABC):
             ]
         )
 
-    @property
+    @persistent_property
     def neutral_axis(self):
         sum_Etzs = [0, 0]
         sum_Ets = [0, 0]
@@ -1222,7 +1227,7 @@ class SandwichLaminate(Laminate):
             theoretical_limit_value=self.core.material.strength_shear,
             safety_factor=CORE_SHEAR_SF,
         )
-        return pd.DataFrame({"core_shear_stress_ratio": [ratio]})
+        return pd.DataFrame({CORE_SHEAR_CRITERIA: [ratio]})
 
     def _critical_skin_wrinkling_solid_core(self, panel):
         """C3.8.6.1 Skin wrinkling of sandwich skins"""
@@ -0,0 +1,136 @@
+"""
+Dependency tracking of session entities.
+
+Model classes cache their derived values (functools.cached_property), so
+editing an input in place - a fiber's modulus, a core's thickness - leaves
+every entity built on it with stale values. The DependencyGraph records which
+entity references which (fiber -> lamina -> laminate -> panel/stiffener ->
+element) and clears the cached values of exactly the entities depending on an
+edited one.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import cache, cached_property
+from typing import Iterable, Iterator
+
+from .persistent import SHARED_VALUES
+
+
+@cache
+def _cached_names(cls: type) -> tuple[str, ...]:
+    """Names of the class' cached properties."""
+    return tuple(
+        {
+            name
+            for klass in cls.__mro__
+            for name, value in vars(klass).items()
+            if isinstance(value, cached_property)
+        }
+    )
+
+
+def clear_cached(obj):
+    """Drops the object's cached property values, and the values it shares
+    with content identical objects, see persistent.share.
+    """
+    for name in _cached_names(type(obj)):
+        obj.__dict__.pop(name, None)
+    obj.__dict__.pop(SHARED_VALUES, None)
+
+
+def _is_entity(value) -> bool:
+    return is_dataclass(value) and not isinstance(value, type)
+
+
+def _collect(value) -> Iterator:
+    if _is_entity(value):
+        yield value
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _collect(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _collect(item)
+
+
+def references(obj) -> list:
+    """Dataclass instances referenced by the object's fields, directly or
+    through lists, tuples and dicts.
+    """
+    return [
+        ref for field_ in fields(obj) for ref in _collect(getattr(obj, field_.name))
+    ]
+
+
+@dataclass
+class DependencyGraph:
+    """Reference graph of every dataclass instance reachable from roots,
+    e.g. a session's collections. Entities are tracked by identity.
+    """
+
+    roots: Iterable
+    _objects: dict = field(default_factory=dict, init=False, repr=False)
+    _references: dict = field(default_factory=dict, init=False, repr=False)
+    _dependents: dict = field(
+        default_factory=lambda: defaultdict(set), init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self.add(*_collect(list(self.roots)))
+
+    def __contains__(self, obj) -> bool:
+        return id(obj) in self._objects
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._objects.values()))
+
+    def add(self, *objs):
+        """Adds the objects and everything they reference."""
+        stack = [obj for obj in objs if obj not in self]
+        while stack:
+            obj = stack.pop()
+            if obj in self:
+                continue
+            self._objects[id(obj)] = obj
+            refs = references(obj)
+            self._references[id(obj)] = {id(ref) for ref in refs}
+            for ref in refs:
+                self._dependents[id(ref)].add(id(obj))
+                if ref not in self:
+                    stack.append(ref)
+
+    def _relink(self, obj):
+        for ref in self._references.pop(id(obj), ()):
+            self._dependents[ref].discard(id(obj))
+        del self._objects[id(obj)]
+        self.add(obj)
+
+    def dependents(self, obj) -> list:
+        """The object and every entity depending on it, directly or not."""
+        seen = {id(obj): obj}
+        stack = [id(obj)]
+        while stack:
+            for dependent in self._dependents.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen[dependent] = self._objects[dependent]
+                    stack.append(dependent)
+        return list(seen.values())
+
+    def invalidate(self, obj) -> list:
+        """Clears the cached values of the object and its dependents, to be
+        called after editing the object in place. Returns the affected
+        entities.
+        """
+        if obj in self:
+            self._relink(obj)
+        affected = self.dependents(obj)
+        for entity in affected:
+            clear_cached(entity)
+        return affected
+
+    def update(self, obj, **changes) -> list:
+        """Sets the object's fields and invalidates what depends on it."""
+        for name, value in changes.items():
+            setattr(obj, name, value)
+        return self.invalidate(obj)
@@ -7,7 +7,7 @@ Created on Fri Aug  7 15:36:31 2020
 CODE FOR USING German Lloyd 2012 High Speed Craft strucutural rules
 # """
 from typing import Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from re import L
 
@@ -34,6 +34,7 @@ from .locations import (
 from .locations_abc import Location
 from .panels import Panel
 from .stiffeners import Stiffener
+from .utils import Criteria
 from .vessel import Monohull, Catamaran
 
 
@@ -41,6 +42,12 @@ def _distance(start, end):
     return end - start
 
 
+def _scale_criteria(value, factor: float):
+    if isinstance(value, Criteria):
+        return replace(value, calculated_value=value.calculated_value * factor)
+    return value
+
+
 MODEL_TYPE_TABLE = {
     Panel.__name__: Panel,
     Stiffener.__name__: Stiffener,
@@ -109,6 +116,14 @@ class StructuralElement:
             self.vessel.fwd_perp - self.vessel.aft_perp
         )
 
+    @property
+    def model_type(self) -> type:
+        return type(self.model)
+
+    @property
+    def area(self) -> float:
+        return self.model.area
+
     @property
     def pressures(self) -> dict[str, float]:
         return self.location.calc_pressures(self)
@@ -134,3 +149,100 @@ class StructuralElement:
         )
         results = self.model.rule_check(pressure=self.design_pressure)
         return pd.concat([resume, results], axis=1)
+
+    def load_cases_check(self, exact: bool = False) -> pd.DataFrame:
+        """Rule check for every pressure type of the location, one row per load
+        case. The panel and stiffener models are linear, so every criteria's
+        calculated value is proportional to the pressure: the model is checked
+        once, at the design pressure, and the results are scaled to each load
+        case. exact=True runs the model check for each load case instead.
+        Load cases without pressure at the element (e.g. impact outside the
+        impact region) can't govern and are left out.
+        """
+        pressures = {name: value for name, value in self.pressures.items() if value > 0}
+        if not pressures:
+            return pd.DataFrame(columns=["name", "pressure_type", "pressure"])
+        design_pressure = self.design_pressure
+        if exact or design_pressure <= 0:
+            results = [
+                self.model.rule_check(pressure=value) for value in pressures.values()
+            ]
+        else:
+            reference = self.model.rule_check(pressure=design_pressure)
+            results = [
+                pd.DataFrame(
+                    {
+                        column: [
+                            _scale_criteria(criteria, value / design_pressure)
+                            for criteria in values
+                        ]
+                        for column, values in reference.items()
+                    }
+                )
+                for value in pressures.values()
+            ]
+        resume = pd.DataFrame(
+            {
+                "name": [self.name] * len(pressures),
+                "pressure_type": list(pressures),
+                "pressure": [
+                    Quantity(value, self.location.units) for value in pressures.values()
+                ],
+            }
+        )
+        return pd.concat([resume, pd.concat(results, ignore_index=True)], axis=1)
+
+    @property
+    def governing_load_cases(self) -> pd.DataFrame:
+        """Governing pressure type and its criteria, by rule check criteria."""
+        check = self.load_cases_check()
+        if check.empty:
+            return pd.DataFrame(columns=["pressure_type", "criteria"])
+        governing = {}
+        for column, values in check.items():
+            if not isinstance(values.iloc[0], Criteria):
+                continue
+            index = min(values.index, key=lambda i: values[i].ratio)
+            governing[column] = {
+                "pressure_type": check.at[index, "pressure_type"],
+                "criteria": values[index],
+            }
+        return pd.DataFrame.from_dict(governing, orient="index")
+
+
+@dataclass
+class StructuralElementArray:
+    """Array counterpart of StructuralElement, exposing only what the location
+    pressures need. x, z and area may be floats or numpy arrays that broadcast
+    against each other, so the rule pressures of many positions/panel areas are
+    calculated in a single call.
+    """
+
+    x: np.ndarray
+    z: np.ndarray
+    area: np.ndarray
+    vessel: Monohull | Catamaran
+    location: Location
+    model_type: type = Panel
+
+    @property
+    def z_baseline(self):
+        return _distance(self.vessel.z_baseline, self.z)
+
+    @property
+    def z_waterline(self):
+        return self.z - self.vessel.z_waterline
+
+    @property
+    def x_pos(self):
+        return (self.x - self.vessel.aft_perp) / (
+            self.vessel.fwd_perp - self.vessel.aft_perp
+        )
+
+    @property
+    def pressures(self) -> dict[str, np.ndarray]:
+        return self.location.calc_pressures(self)
+
+    @property
+    def design_pressure(self) -> np.ndarray:
+        return np.max(np.broadcast_arrays(*self.pressures.values()), axis=0)
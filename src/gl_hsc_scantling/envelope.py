@@ -0,0 +1,85 @@
+"""
+Operating envelope maps - C3.3.3 Assessment of limit operating conditions.
+
+Evaluates the maximum wave height and the significant wave height limited by
+the vertical acceleration at LCG over dense grids of speed and loading
+condition, by lifting the vessel's own formulas to numpy arrays.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .vessel import Catamaran, Monohull
+
+LOADING_CONDITION = ["displacement", "lcg", "water_plane_area"]
+ENVELOPE_COEFS = ["vert_acg", "coef_kf", "coef_kt", "coef_k", "coef_kh", "coef_kcat"]
+ENVELOPE_CURVES = ["max_wave_height", "sig_wave_height", "limit_wave_height"]
+
+
+@dataclass
+class OperatingEnvelope:
+    """Speed vs. wave height envelope of a vessel. Each loading condition
+    parameter left unset is kept at the vessel's value. Arrays returned by
+    curves have shape (speeds, displacements, lcgs, water_plane_areas).
+    """
+
+    vessel: Monohull | Catamaran
+    speeds: list[float]
+    displacements: Optional[list[float]] = None
+    lcgs: Optional[list[float]] = None
+    water_plane_areas: Optional[list[float]] = None
+
+    @property
+    def axes(self) -> dict[str, np.ndarray]:
+        values = [self.displacements, self.lcgs, self.water_plane_areas]
+        return {
+            "speed": np.asarray(self.speeds, dtype=float),
+            **{
+                name: np.asarray(
+                    value if value is not None else [getattr(self.vessel, name)],
+                    dtype=float,
+                )
+                for name, value in zip(LOADING_CONDITION, values)
+            },
+        }
+
+    @property
+    def grid(self) -> dict[str, np.ndarray]:
+        return dict(zip(self.axes, np.meshgrid(*self.axes.values(), indexing="ij")))
+
+    @property
+    def vessels(self) -> Monohull | Catamaran:
+        """Copy of the vessel with the grid arrays as inputs."""
+        return replace(self.vessel, **self.grid)
+
+    @property
+    def curves(self) -> dict[str, np.ndarray]:
+        """Envelope coefficients and wave heights (m). limit_wave_height is the
+        most restrictive of C3.3.3.1 and C3.3.3.2.
+        """
+        vessels = self.vessels
+        shape = vessels.speed.shape
+        curves = {
+            name: np.broadcast_to(getattr(vessels, name), shape)
+            for name in ENVELOPE_COEFS + ENVELOPE_CURVES[:2]
+        }
+        curves["limit_wave_height"] = np.minimum(
+            curves["max_wave_height"], curves["sig_wave_height"]
+        )
+        return curves
+
+    def to_frame(self) -> pd.DataFrame:
+        """Envelope in long format, one row per speed and loading condition."""
+        data = {**self.grid, **self.curves}
+        return pd.DataFrame({name: values.ravel() for name, values in data.items()})
+
+    def to_csv(self, file_name: str = "envelope.csv"):
+        """Exports the envelope to a csv file."""
+        self.to_frame().to_csv(file_name, index=False)
+
+    def to_json(self, file_name: str = "envelope.json"):
+        """Exports the envelope to a json file, one record per row."""
+        self.to_frame().to_json(file_name, orient="records")
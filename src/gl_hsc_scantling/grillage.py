@@ -0,0 +1,353 @@
+"""
+Grillage analysis of stiffened panel assemblies.
+
+Crossing stiffeners (e.g. longitudinals and frames) are modelled as a plane
+grid of beam elements with out of plane deflection and rotations about x and
+y at each node. The sparse stiffness system is solved with a sparse direct
+solver and the members' bending moments, shear forces and deflections are
+checked with the C3.8.4 stiffener criteria, instead of the isolated member
+table coefficients (Table C3.8.2).
+"""
+
+from dataclasses import dataclass
+from functools import cached_property as property
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import spsolve
+
+from .batch import StiffenerBatch, criteria_ratios
+from .stiffeners import Stiffener
+from .structural_model import BoundaryCondition
+from .utils import Criteria
+
+# Node degrees of freedom: deflection and rotations about x and y
+NODE_DOFS = 3
+# Points along each element where the deflection is evaluated
+DEFLECTION_POINTS = np.linspace(0, 1, 11)
+# Euler-Bernoulli beam stiffness for (w1, slope1, w2, slope2), to be
+# multiplied by length**powers * EI / length**3
+BEAM_STIFFNESS = np.array(
+    [[12, 6, -12, 6], [6, 4, -6, 2], [-12, -6, 12, -6], [6, 2, -6, 4]]
+)
+BEAM_STIFFNESS_POWERS = np.array(
+    [[0, 1, 0, 1], [1, 2, 1, 2], [0, 1, 0, 1], [1, 2, 1, 2]]
+)
+
+
+@dataclass
+class GrillageMember:
+    """Stiffener between two (x, y) points (m) of the grillage plane, parallel
+    to x or y. The pressure (kPa) acts on the stiffener's spacing; members
+    only loaded through their crossings (e.g. web frames supporting
+    longitudinals) have no pressure. torsion_stiff is G*J (kN m2), usually
+    neglected for open sections.
+    """
+
+    stiffener: Stiffener
+    start: tuple[float, float]
+    end: tuple[float, float]
+    pressure: float = 0
+    torsion_stiff: float = 0
+    name: str = ""
+
+
+@dataclass
+class Grillage:
+    """Members are split into beam elements at their crossings and at other
+    members' ends lying on them. Member ends not connected to any other member
+    are supported according to the stiffener's boundary condition: FIXED
+    restrains deflection and rotations, SIMPLY_SUPPORTED only deflection.
+    Bending moments include the stiffener's curvature correction coefficient,
+    as in Stiffener.bending_momt.
+    """
+
+    members: list[GrillageMember]
+    tolerance: float = 1e-6
+
+    @property
+    def batch(self) -> StiffenerBatch:
+        return StiffenerBatch([member.stiffener for member in self.members])
+
+    @property
+    def _geometry(self) -> dict[str, np.ndarray]:
+        start = np.array([member.start for member in self.members], dtype=float)
+        end = np.array([member.end for member in self.members], dtype=float)
+        along_x = np.abs(end[:, 1] - start[:, 1]) <= self.tolerance
+        along_y = np.abs(end[:, 0] - start[:, 0]) <= self.tolerance
+        if not np.all(along_x ^ along_y):
+            raise ValueError("grillage members must be parallel to either x or y")
+        return {"start": start, "end": end, "along_x": along_x}
+
+    @property
+    def _points(self) -> tuple[np.ndarray, np.ndarray]:
+        """Member and (x, y) coordinates of every member end and crossing."""
+        start, end, along_x = self._geometry.values()
+        longs = np.flatnonzero(along_x)
+        trans = np.flatnonzero(~along_x)
+        x_trans = start[trans, 0]
+        y_longs = start[longs, 1]
+        tol = self.tolerance
+        crossing = (
+            (x_trans >= np.minimum(start[longs, 0], end[longs, 0])[:, None] - tol)
+            & (x_trans <= np.maximum(start[longs, 0], end[longs, 0])[:, None] + tol)
+            & (y_longs[:, None] >= np.minimum(start[trans, 1], end[trans, 1]) - tol)
+            & (y_longs[:, None] <= np.maximum(start[trans, 1], end[trans, 1]) + tol)
+        )
+        i_long, i_trans = np.nonzero(crossing)
+        crossings = np.column_stack([x_trans[i_trans], y_longs[i_long]])
+        members = np.arange(len(self.members))
+        return (
+            np.concatenate([longs[i_long], trans[i_trans], members, members]),
+            np.concatenate([crossings, crossings, start, end]),
+        )
+
+    @property
+    def _mesh(self) -> dict[str, np.ndarray]:
+        members, coords = self._points
+        keys = np.round(coords / self.tolerance).astype(np.int64)
+        _, first, points_node = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True
+        )
+        points_node = points_node.ravel()
+        start = self._geometry["start"][members]
+        along = np.abs(coords - start).sum(axis=1)
+        order = np.lexsort((along, members))
+        members, nodes = members[order], points_node[order]
+        consecutive = (members[:-1] == members[1:]) & (nodes[:-1] != nodes[1:])
+        return {
+            "nodes": coords[first],
+            "member": members[:-1][consecutive],
+            "start": nodes[:-1][consecutive],
+            "end": nodes[1:][consecutive],
+        }
+
+    @property
+    def nodes(self) -> np.ndarray:
+        """(x, y) coordinates of the nodes (m)."""
+        return self._mesh["nodes"]
+
+    @property
+    def elements(self) -> pd.DataFrame:
+        """Member and start and end node of every beam element."""
+        mesh = self._mesh
+        return pd.DataFrame({name: mesh[name] for name in ["member", "start", "end"]})
+
+    @property
+    def _element_props(self) -> dict[str, np.ndarray]:
+        mesh = self._mesh
+        member = mesh["member"]
+        delta = self.nodes[mesh["end"]] - self.nodes[mesh["start"]]
+        length = np.hypot(*delta.T)
+        batch = self.batch
+        pressure = np.array([member.pressure for member in self.members])
+        torsion = np.array([member.torsion_stiff for member in self.members])
+        return {
+            "length": length,
+            "cos": delta[:, 0] / length,
+            "sin": delta[:, 1] / length,
+            "bend_stiff": batch.bend_stiff[member],
+            "torsion_stiff": torsion[member],
+            "load": (pressure * batch.spacing)[member],
+        }
+
+    @property
+    def _transforms(self) -> np.ndarray:
+        """Global (w, rx, ry) to local (w, twist, slope) element DOFs, shape
+        (E, 6, 6).
+        """
+        props = self._element_props
+        cos, sin = props["cos"], props["sin"]
+        one, zero = np.ones_like(cos), np.zeros_like(cos)
+        rotation = np.array(
+            [[one, zero, zero], [zero, cos, sin], [zero, sin, -cos]]
+        ).transpose(2, 0, 1)
+        transforms = np.zeros((len(cos), 6, 6))
+        transforms[:, :3, :3] = rotation
+        transforms[:, 3:, 3:] = rotation
+        return transforms
+
+    @property
+    def _local_stiffness(self) -> np.ndarray:
+        props = self._element_props
+        length, bend_stiff = props["length"], props["bend_stiff"]
+        bending = (
+            BEAM_STIFFNESS
+            * length[:, None, None] ** BEAM_STIFFNESS_POWERS
+            * (bend_stiff / length**3)[:, None, None]
+        )
+        torsion = props["torsion_stiff"] / length
+        stiffness = np.zeros((len(length), 6, 6))
+        stiffness[np.ix_(range(len(length)), [0, 2, 3, 5], [0, 2, 3, 5])] = bending
+        stiffness[:, 1, 1] = stiffness[:, 4, 4] = torsion
+        stiffness[:, 1, 4] = stiffness[:, 4, 1] = -torsion
+        return stiffness
+
+    @property
+    def _local_loads(self) -> np.ndarray:
+        """Nodal loads equivalent to the uniform line load."""
+        props = self._element_props
+        length, load = props["length"], props["load"]
+        zero = np.zeros_like(length)
+        return load[:, None] * np.column_stack(
+            [length / 2, zero, length**2 / 12, length / 2, zero, -(length**2) / 12]
+        )
+
+    @property
+    def _element_dofs(self) -> np.ndarray:
+        mesh = self._mesh
+        offsets = np.arange(NODE_DOFS)
+        return np.column_stack(
+            [
+                mesh["start"][:, None] * NODE_DOFS + offsets,
+                mesh["end"][:, None] * NODE_DOFS + offsets,
+            ]
+        )
+
+    @property
+    def stiffness_matrix(self):
+        """Global sparse stiffness matrix (CSC)."""
+        transforms = self._transforms
+        stiffness = np.einsum(
+            "eki,ekl,elj->eij", transforms, self._local_stiffness, transforms
+        )
+        dofs = self._element_dofs
+        size = len(self.nodes) * NODE_DOFS
+        return coo_matrix(
+            (
+                stiffness.ravel(),
+                (np.repeat(dofs, 6, axis=1).ravel(), np.tile(dofs, 6).ravel()),
+            ),
+            shape=(size, size),
+        ).tocsc()
+
+    @property
+    def load_vector(self) -> np.ndarray:
+        loads = np.einsum("eki,ek->ei", self._transforms, self._local_loads)
+        return np.bincount(
+            self._element_dofs.ravel(),
+            weights=loads.ravel(),
+            minlength=len(self.nodes) * NODE_DOFS,
+        )
+
+    @property
+    def supported_nodes(self) -> np.ndarray:
+        """Nodes connected to a single element, i.e. free member ends."""
+        mesh = self._mesh
+        ends = np.concatenate([mesh["start"], mesh["end"]])
+        return np.flatnonzero(np.bincount(ends, minlength=len(self.nodes)) == 1)
+
+    @property
+    def _restrained_dofs(self) -> np.ndarray:
+        mesh = self._mesh
+        supported = self.supported_nodes
+        member_by_node = np.empty(len(self.nodes), dtype=int)
+        member_by_node[mesh["end"]] = mesh["member"]
+        member_by_node[mesh["start"]] = mesh["member"]
+        fixed = np.array(
+            [
+                self.members[member].stiffener.bound_cond == BoundaryCondition.FIXED
+                for member in member_by_node[supported]
+            ],
+            dtype=bool,
+        )
+        restrained = [
+            supported * NODE_DOFS,
+            (supported[fixed, None] * NODE_DOFS + np.arange(1, NODE_DOFS)).ravel(),
+            # Rotations without stiffness, e.g. twist of members without
+            # torsional stiffness not crossed by any other member.
+            np.flatnonzero(self.stiffness_matrix.diagonal() == 0),
+        ]
+        return np.unique(np.concatenate(restrained))
+
+    @property
+    def displacements(self) -> np.ndarray:
+        """Nodal deflection (m) and rotations about x and y (rad), shape
+        (nodes, 3).
+        """
+        size = len(self.nodes) * NODE_DOFS
+        free = np.setdiff1d(np.arange(size), self._restrained_dofs)
+        stiffness = self.stiffness_matrix[free][:, free]
+        displacements = np.zeros(size)
+        displacements[free] = spsolve(stiffness, self.load_vector[free])
+        if not np.all(np.isfinite(displacements)):
+            raise ValueError("grillage is a mechanism, check the member supports")
+        return displacements.reshape(-1, NODE_DOFS)
+
+    @property
+    def element_results(self) -> pd.DataFrame:
+        """Maximum absolute bending moment (kN m), shear force (kN) and
+        deflection (m) along each element. Bending moments without curvature
+        correction.
+        """
+        props = self._element_props
+        length, load = props["length"], props["load"]
+        local = np.einsum(
+            "eij,ej->ei",
+            self._transforms,
+            self.displacements.ravel()[self._element_dofs],
+        )
+        forces = np.einsum("eij,ej->ei", self._local_stiffness, local)
+        forces -= self._local_loads
+        shear_start, moment_start = forces[:, 0], forces[:, 2]
+        # Zero shear point, where the bending moment is extreme
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_zero_shear = np.where(load != 0, -shear_start / load, 0)
+        x_zero_shear = np.clip(x_zero_shear, 0, length)
+
+        def moment(x):
+            return -moment_start + shear_start * x + load * x**2 / 2
+
+        xi = DEFLECTION_POINTS[:, None]
+        x = xi * length
+        deflection = (
+            (1 - 3 * xi**2 + 2 * xi**3) * local[:, 0]
+            + length * (xi - 2 * xi**2 + xi**3) * local[:, 2]
+            + (3 * xi**2 - 2 * xi**3) * local[:, 3]
+            + length * (xi**3 - xi**2) * local[:, 5]
+            + load * x**2 * (length - x) ** 2 / (24 * props["bend_stiff"])
+        )
+        return pd.DataFrame(
+            {
+                "member": self._mesh["member"],
+                "bending_momt": np.max(
+                    np.abs([moment(0), moment(length), moment(x_zero_shear)]), axis=0
+                ),
+                "shear_force": np.maximum(
+                    np.abs(shear_start), np.abs(shear_start + load * length)
+                ),
+                "deflection": np.max(np.abs(deflection), axis=0),
+            }
+        )
+
+    @property
+    def member_results(self) -> pd.DataFrame:
+        """Maximum absolute bending moment (kN m), shear force (kN) and
+        deflection (m) of each member.
+        """
+        results = (
+            self.element_results.groupby("member")
+            .max()
+            .reindex(range(len(self.members)), fill_value=0)
+        )
+        results["bending_momt"] *= self.batch.curvature_correction_coef
+        results.insert(0, "name", [member.name for member in self.members])
+        return results.reset_index(drop=True)
+
+    @property
+    def criteria(self) -> dict[str, Criteria]:
+        """Stiffener criteria of each member, with array values."""
+        results = self.member_results
+        return self.batch.load_criteria(
+            results["bending_momt"].to_numpy(),
+            results["shear_force"].to_numpy(),
+            results["deflection"].to_numpy(),
+        )
+
+    @property
+    def rule_check(self) -> pd.DataFrame:
+        """Criteria ratios (allowable/calculated), one row per member."""
+        ratios = criteria_ratios(self.criteria)
+        ratios.insert(0, "name", [member.name for member in self.members])
+        return ratios
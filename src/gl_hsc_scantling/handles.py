@@ -0,0 +1,177 @@
+"""
+What-if re-evaluation of structural elements.
+
+An ElementHandle keeps the invariant parts of an element's rule check (vessel,
+location and laminate responses) between input changes and re-evaluates only
+what depends on the changed input. The panel and stiffener checks are linear
+in the pressure, so they are kept per unit pressure: moving an element only
+recalculates its pressures.
+"""
+
+from dataclasses import dataclass, field, is_dataclass, replace
+from typing import Optional
+
+import pandas as pd
+from quantities import Quantity
+
+from .composites import CORE_SHEAR_CRITERIA, Laminate
+from .elements import StructuralElement, _scale_criteria
+from .panels import Panel
+from .pressure_tables import _signature
+from .stiffeners import Stiffener
+from .utils import Criteria
+
+
+def _model_key(model: Panel | Stiffener) -> tuple:
+    """Hashable key of the model's input parameters. Laminates and sections
+    are compared by identity.
+    """
+    return tuple(
+        id(value) if is_dataclass(value) else value for value in _signature(model)
+    )
+
+
+def _criteria(check: pd.DataFrame) -> dict[str, Criteria]:
+    return dict(check.iloc[0].items())
+
+
+def _scale(criteria: dict[str, Criteria], factor: float) -> dict[str, Criteria]:
+    return {name: _scale_criteria(value, factor) for name, value in criteria.items()}
+
+
+@dataclass
+class UnitChecks:
+    """Memo of model rule checks at unit pressure, keyed by model
+    configuration. The checks are linear in the pressure, so scaling them
+    gives the check at any pressure. Panels share the laminate check between
+    all dimensions with the same laminate and span direction.
+    """
+
+    # Memo values keep a reference to the model or laminate, so the ids in the
+    # keys can't be reused by other objects.
+    _models: dict = field(default_factory=dict, repr=False, compare=False)
+    _laminates: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def _laminate_criteria(self, panel: Panel) -> dict[str, Criteria]:
+        """The panel's laminate check depends on its dimensions only through
+        the bending moment and shear force, so it is evaluated once per
+        laminate and span direction and scaled.
+        """
+        key = (id(panel.laminate), panel.span_direction)
+        if key not in self._laminates:
+            check = panel.laminate.panel_rule_check(panel, pressure=1)
+            self._laminates[key] = (
+                panel.laminate,
+                _criteria(check),
+                panel.max_bend_moment(1),
+                panel.max_shear_force(1),
+            )
+        _, criteria, moment, shear_force = self._laminates[key]
+        moment_factor = panel.max_bend_moment(1) / moment
+        shear_factor = panel.max_shear_force(1) / shear_force
+        return {
+            name: _scale_criteria(
+                value, shear_factor if name == CORE_SHEAR_CRITERIA else moment_factor
+            )
+            for name, value in criteria.items()
+        }
+
+    def unit_criteria(self, model: Panel | Stiffener) -> dict[str, Criteria]:
+        """Rule check criteria at unit pressure."""
+        key = _model_key(model)
+        if key not in self._models:
+            if isinstance(model, Panel):
+                criteria = {
+                    **_criteria(model.panel_check(1)),
+                    **self._laminate_criteria(model),
+                }
+            else:
+                criteria = _criteria(model.rule_check(1))
+            self._models[key] = (model, criteria)
+        return self._models[key][1]
+
+    def criteria(
+        self, model: Panel | Stiffener, pressure: float
+    ) -> dict[str, Criteria]:
+        return _scale(self.unit_criteria(model), pressure)
+
+
+@dataclass
+class ElementHandle:
+    """Mutable wrapper of a StructuralElement for interactive what-if studies.
+    The setters replace the element with an updated copy. Model checks are
+    memoized per model configuration (see UnitChecks), so going back to a
+    previous one is free.
+    """
+
+    element: StructuralElement
+    _pressures: dict = field(default=None, init=False, repr=False, compare=False)
+    _checks: UnitChecks = field(
+        default_factory=UnitChecks, init=False, repr=False, compare=False
+    )
+
+    def set_position(self, x: Optional[float] = None, z: Optional[float] = None):
+        self.element = replace(
+            self.element,
+            x=self.element.x if x is None else x,
+            z=self.element.z if z is None else z,
+        )
+        self._pressures = None
+
+    def update_model(self, **changes):
+        """Replaces model input parameters, e.g. dim_x or spacing_1."""
+        self.element = replace(
+            self.element, model=replace(self.element.model, **changes)
+        )
+        # The model's area affects the impact pressures
+        self._pressures = None
+
+    def set_dims(self, dim_x: float, dim_y: float):
+        self.update_model(dim_x=dim_x, dim_y=dim_y)
+
+    def set_laminate(self, laminate: Laminate):
+        """Panel laminate, or both attached plates of a stiffener."""
+        if isinstance(self.element.model, Stiffener):
+            self.update_model(att_plate_1=laminate, att_plate_2=laminate)
+        else:
+            self.update_model(laminate=laminate)
+
+    def set_spacing(self, spacing_1: float, spacing_2: Optional[float] = None):
+        """Stiffener spacings, spacing_2 defaults to spacing_1."""
+        self.update_model(
+            spacing_1=spacing_1,
+            spacing_2=spacing_1 if spacing_2 is None else spacing_2,
+        )
+
+    @property
+    def pressures(self) -> dict[str, float]:
+        if self._pressures is None:
+            self._pressures = self.element.pressures
+        return self._pressures
+
+    @property
+    def design_pressure_type(self) -> str:
+        return max(self.pressures, key=lambda k: self.pressures[k])
+
+    @property
+    def design_pressure(self) -> float:
+        return self.pressures[self.design_pressure_type]
+
+    @property
+    def criteria(self) -> dict[str, Criteria]:
+        """Rule check criteria at the design pressure."""
+        return self._checks.criteria(self.element.model, self.design_pressure)
+
+    @property
+    def rule_check(self) -> pd.DataFrame:
+        """Same as StructuralElement.rule_check."""
+        return pd.DataFrame(
+            {
+                "name": [self.element.name],
+                "design_pressure_type": [self.design_pressure_type],
+                "design_pressure": [
+                    Quantity(self.design_pressure, self.element.location.units)
+                ],
+                **{name: [value] for name, value in self.criteria.items()},
+            }
+        )
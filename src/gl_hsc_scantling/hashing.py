@@ -0,0 +1,119 @@
+"""
+Content hashes of model objects.
+
+content_hash digests an object's type and field values, referenced entities
+contributing their own content hash, so two objects get the same hash when
+they're built from the same inputs, whatever their names or the session or
+process they're in. It's the key of persistent caches, deduplication and
+change detection.
+Hashes are computed from the objects' current values on every call, not
+cached on the objects: model objects are mutable and may be edited in place
+without invalidating anything, and a stale hash would key persisted values
+and rule check rows of the old inputs. Within a call, shared references are
+hashed once; callers hashing many related objects at once (interning) pass
+a memo shared between calls.
+"""
+
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import cache, cached_property
+from hashlib import blake2b
+from typing import Optional
+
+import numpy as np
+
+DIGEST_SIZE = 16
+# Display only fields, not changing what an object models
+IGNORED_FIELDS = frozenset({"name"})
+
+
+def _type_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _digest(data: bytes) -> str:
+    return blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+
+@cache
+def _slots(cls: type) -> tuple[str, ...]:
+    """Attributes of a slotted class, e.g. Vector2D, along its bases."""
+    slots = []
+    for base in reversed(cls.__mro__):
+        names = base.__dict__.get("__slots__", ())
+        slots.extend([names] if isinstance(names, str) else names)
+    return tuple(slots)
+
+
+def _items(obj) -> list[tuple[str, object]]:
+    """Dataclass fields taking part in comparisons, or public attributes of
+    other objects, slotted or not, except cached values and IGNORED_FIELDS.
+    """
+    if is_dataclass(obj):
+        return [
+            (field_.name, getattr(obj, field_.name))
+            for field_ in fields(obj)
+            if field_.compare
+        ]
+    cls = type(obj)
+    if not hasattr(obj, "__dict__"):
+        return [
+            (name, getattr(obj, name))
+            for name in _slots(cls)
+            if not name.startswith("_")
+        ]
+    return [
+        (name, value)
+        for name, value in sorted(vars(obj).items())
+        if not name.startswith("_")
+        and not isinstance(getattr(cls, name, None), cached_property)
+    ]
+
+
+def _token(value, memo: dict) -> str:
+    if isinstance(value, Enum):
+        # Members of str enums compare equal to their values
+        return _token(value.value, memo)
+    if value is None:
+        return "None"
+    if isinstance(value, (bool, np.bool_)):
+        return repr(bool(value))
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # Equal ints and floats hash the same, as they compare equal
+        return repr(float(value))
+    if isinstance(value, str):
+        return repr(value)
+    if isinstance(value, np.ndarray):
+        return f"array({value.dtype.str},{value.shape},{_digest(value.tobytes())})"
+    if isinstance(value, (list, tuple)):
+        return f"[{','.join(_token(item, memo) for item in value)}]"
+    if isinstance(value, dict):
+        items = sorted(
+            f"{_token(key, memo)}:{_token(item, memo)}" for key, item in value.items()
+        )
+        return f"{{{','.join(items)}}}"
+    if isinstance(value, type):
+        return f"{_type_name(type(value))}{value!r}"
+    if hasattr(value, "__dict__") or _slots(type(value)):
+        # e.g. Vector2D, whose components are tokenized rather than repr'd
+        return content_hash(value, memo)
+    return f"{_type_name(type(value))}{value!r}"
+
+
+def content_hash(obj, memo: Optional[dict] = None) -> str:
+    """Hex digest of the object's type and fields, ignoring IGNORED_FIELDS.
+    memo maps ids of already hashed objects to their hashes; it must only be
+    shared while those objects are alive and unchanged.
+    """
+    if memo is None:
+        memo = {}
+    if id(obj) in memo:
+        return memo[id(obj)]
+    items = ",".join(
+        f"{name}={_token(value, memo)}"
+        for name, value in _items(obj)
+        if name not in IGNORED_FIELDS
+    )
+    digest = _digest(f"{_type_name(type(obj))}({items})".encode())
+    memo[id(obj)] = digest
+    return digest
@@ -0,0 +1,158 @@
+"""
+Interning of content identical entities.
+
+Sessions built from several files or by scripts often hold distinct but
+identical vessels, materials, laminates, sections or elements, each
+computing and keeping its own cached values. intern_entities replaces every
+reference to such a duplicate with one canonical instance, so each is
+computed and kept once.
+Only named entities, those with a name field or held by the collections,
+which serialized sessions refer to by name, are merged, with identically
+named ones. Nameless parts (plies, ply stacks, lamina data, panel and
+stiffener models, locations, whose class level names are only their kind's)
+are owned by the entity holding them inline, as in serialized sessions, so
+they are only shared along with their owner: merging them across owners
+would make Session.update of one owner's part edit the others' too.
+Content identical entities left distinct, differently named or nameless,
+share their persistent properties' values instead (persistent.share), so
+e.g. identical laminates of different names compute their ABD matrices
+once.
+"""
+
+import sys
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from functools import cache
+from typing import Iterable
+
+import numpy as np
+
+from .dependencies import DependencyGraph, _cached_names, _collect
+from .hashing import content_hash
+from .persistent import SHARED_VALUES, persistent_names, share
+
+
+@dataclass
+class InternReport:
+    """merged: duplicates replaced by their canonical instance, by type.
+    shared: content identical instances kept distinct but sharing their
+    persistent properties' values with another, by type.
+    bytes_saved: approximate size of the duplicates, the parts only they
+    held and their cached values.
+    cached_values_shared: cached properties computed once per canonical
+    instance instead of once per duplicate, and persistent properties
+    computed once per group of instances sharing them.
+    """
+
+    merged: dict[str, int] = field(default_factory=dict)
+    shared: dict[str, int] = field(default_factory=dict)
+    bytes_saved: int = 0
+    cached_values_shared: int = 0
+
+    @property
+    def total_merged(self) -> int:
+        return sum(self.merged.values())
+
+
+def _key(entity, memo: dict) -> tuple:
+    return type(entity), content_hash(entity, memo), entity.name
+
+
+@cache
+def _has_name_field(cls: type) -> bool:
+    return any(field_.name == "name" for field_ in fields(cls))
+
+
+def _footprint(entity) -> int:
+    """Shallow size of the entity, its attributes and cached values."""
+    values = vars(entity).values()
+    return (
+        sys.getsizeof(entity)
+        + sys.getsizeof(vars(entity))
+        + sum(
+            value.nbytes if isinstance(value, np.ndarray) else sys.getsizeof(value)
+            for value in values
+        )
+    )
+
+
+def _replace(value, canonical: dict[int, object]):
+    """The value with its entities replaced by their canonical instances, lists
+    and dicts edited in place.
+    """
+    if id(value) in canonical:
+        return canonical[id(value)]
+    if isinstance(value, list):
+        value[:] = [_replace(item, canonical) for item in value]
+    elif isinstance(value, tuple):
+        return type(value)(_replace(item, canonical) for item in value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _replace(item, canonical)
+    return value
+
+
+def _share(entities: list, memo: dict, report: InternReport):
+    """Links the content identical entities with persistent properties."""
+    groups: dict[tuple, list] = {}
+    for entity in entities:
+        if persistent_names(type(entity)):
+            key = (type(entity), content_hash(entity, memo))
+            groups.setdefault(key, []).append(entity)
+    shared = Counter()
+    for (cls, _), group in groups.items():
+        if len(group) == 1:
+            group[0].__dict__.pop(SHARED_VALUES, None)
+            continue
+        share(group)
+        shared[cls.__name__] += len(group) - 1
+        report.cached_values_shared += (len(group) - 1) * len(persistent_names(cls))
+    report.shared = dict(shared)
+
+
+def intern_entities(collections: Iterable) -> InternReport:
+    """Merges the content identical named entities reachable from
+    collections, e.g. a session's, editing references in place, and makes
+    the remaining content identical entities share their persistent
+    properties' values.
+    """
+    collections = list(collections)
+    entities = list(DependencyGraph(collections))
+    members = {id(entity) for entity in _collect(collections)}
+    # Entities aren't edited while their keys are computed
+    memo: dict[int, str] = {}
+    first: dict[tuple, object] = {}
+    canonical: dict[int, object] = {}
+    report = InternReport()
+    merged = Counter()
+    for entity in entities:
+        # Locations' names are class attributes, the same for every instance
+        if id(entity) not in members and not _has_name_field(type(entity)):
+            continue
+        original = first.setdefault(_key(entity, memo), entity)
+        if original is entity:
+            continue
+        canonical[id(entity)] = original
+        merged[type(entity).__name__] += 1
+    report.merged = dict(merged)
+    if not canonical:
+        _share(entities, memo, report)
+        return report
+    for entity in entities:
+        if id(entity) in canonical:
+            continue
+        for field_ in fields(entity):
+            value = getattr(entity, field_.name)
+            new = _replace(value, canonical)
+            if new is not value:
+                object.__setattr__(entity, field_.name, new)
+    for collection in collections:
+        _replace(collection, canonical)
+    # Duplicates and the parts only they held
+    remaining = DependencyGraph(collections)
+    for entity in entities:
+        if entity not in remaining:
+            report.bytes_saved += _footprint(entity)
+            report.cached_values_shared += len(_cached_names(type(entity)))
+    _share(list(remaining), memo, report)
+    return report
@@ -0,0 +1,186 @@
+"""
+Stiffened panel layout optimization of a hull zone.
+
+The zone's structural mass per square metre depends jointly on the number of
+stiffeners (their spacing), the panel laminate and the stiffener section:
+the spacing sets the panels' and stiffeners' areas, hence their impact
+pressures (coefficient k2), and the laminate is the stiffeners' attached
+plate. Every combination is checked and the lightest passing one is picked.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .batch import StiffenerBatch
+from .composites import Laminate
+from .elements import StructuralElementArray
+from .handles import UnitChecks
+from .locations_abc import Location
+from .panels import Panel
+from .stiffeners import Stiffener, StiffenerSectionWithFoot
+from .vessel import Catamaran, Monohull
+
+
+@dataclass
+class ZoneLayout:
+    """Layout of a hull zone spanning x and z (min, max) (m), with stiffeners
+    of the given span (m) evenly spread over the zone's breadth (m), panels
+    spanning between them. The stiffener template gives the stiffeners'
+    remaining inputs (boundary condition, attached side...) and panel_inputs
+    the panels' ones (curvatures, chine...).
+    Design pressures are the maximum over a grid_points x grid_points grid
+    of the zone.
+    """
+
+    vessel: Monohull | Catamaran
+    location: Location
+    x: tuple[float, float]
+    z: tuple[float, float]
+    breadth: float
+    span: float
+    stiffener: Stiffener
+    laminates: list[Laminate]
+    sections: list[StiffenerSectionWithFoot]
+    stiffener_counts: list[int]
+    panel_inputs: Optional[dict] = None
+    grid_points: int = 3
+
+    def spacing(self, count: int) -> float:
+        """Stiffener spacing, the zone's edges being supported."""
+        return self.breadth / (count + 1)
+
+    def design_pressure(self, model_type: type, area: float) -> float:
+        xs = np.linspace(*self.x, self.grid_points)
+        zs = np.linspace(*self.z, self.grid_points)
+        zone = StructuralElementArray(
+            x=xs[:, None],
+            z=zs[None, :],
+            area=area,
+            vessel=self.vessel,
+            location=self.location,
+            model_type=model_type,
+        )
+        return float(np.max(zone.design_pressure))
+
+    def layouts(self, count: int, checks: Optional[UnitChecks] = None) -> pd.DataFrame:
+        """Every section combined with every laminate passing the panel check,
+        with count stiffeners. Design pressures are taken at the areas the
+        panel and stiffener checks use (Panel.area being capped by the rule and
+        depending on the laminate through the panel's span direction). The
+        stiffeners of all combinations are evaluated in one StiffenerBatch.
+        """
+        checks = checks or UnitChecks()
+        spacing = self.spacing(count)
+        pressures = {}
+        # By laminate identity, candidates' names being only for display
+        panel_pressures = {}
+        panel_ratios = {}
+        for laminate in self.laminates:
+            panel = Panel(
+                dim_x=self.span,
+                dim_y=spacing,
+                laminate=laminate,
+                **(self.panel_inputs or {}),
+            )
+            area = float(panel.area)
+            if area not in pressures:
+                pressures[area] = self.design_pressure(Panel, area)
+            panel_pressures[id(laminate)] = pressures[area]
+            criteria = checks.criteria(panel, pressures[area])
+            panel_ratios[id(laminate)] = min(value.ratio for value in criteria.values())
+        combinations = [
+            (laminate, section)
+            for laminate in self.laminates
+            if panel_ratios[id(laminate)] >= 1
+            for section in self.sections
+        ]
+        if not combinations:
+            return pd.DataFrame()
+        stiffener = replace(
+            self.stiffener,
+            span=self.span,
+            spacing_1=spacing / 2,
+            spacing_2=spacing / 2,
+        )
+        stiffener_pressure = self.design_pressure(Stiffener, stiffener.area)
+        batch = StiffenerBatch(
+            [
+                replace(
+                    stiffener,
+                    stiff_section=section,
+                    att_plate_1=laminate,
+                    att_plate_2=laminate,
+                )
+                for laminate, section in combinations
+            ]
+        )
+        stiffener_ratios = batch.ratios(stiffener_pressure).min(axis=1)
+        return pd.DataFrame(
+            {
+                "stiffener_count": count,
+                "spacing": spacing,
+                "laminate": [laminate.name for laminate, _ in combinations],
+                "section": [section.name for _, section in combinations],
+                "panel_pressure": [
+                    panel_pressures[id(laminate)] for laminate, _ in combinations
+                ],
+                "stiffener_pressure": stiffener_pressure,
+                "panel_min_ratio": [
+                    panel_ratios[id(laminate)] for laminate, _ in combinations
+                ],
+                "stiffener_min_ratio": stiffener_ratios,
+                "mass": [
+                    self.mass(count, laminate, section)
+                    for laminate, section in combinations
+                ],
+            }
+        )
+
+    def mass(
+        self, count: int, laminate: Laminate, section: StiffenerSectionWithFoot
+    ) -> float:
+        """Zone mass per square metre (kg/m2): the panel laminate and count
+        stiffener profiles over the zone's breadth.
+        """
+        return laminate.area_density + count * section.linear_density / self.breadth
+
+    def _count_layouts(self, counts: list[int]) -> pd.DataFrame:
+        checks = UnitChecks()
+        return pd.concat(
+            [self.layouts(count, checks) for count in counts], ignore_index=True
+        )
+
+    def evaluate(self, max_workers: Optional[int] = None) -> pd.DataFrame:
+        """Layouts of every stiffener count, counts split between parallel
+        processes unless max_workers is 1. Mass (kg/m2) includes the panel
+        laminate and the stiffener profiles.
+        """
+        if max_workers == 1:
+            return self._count_layouts(self.stiffener_counts)
+        # Counts are chunked so each process reuses its laminate checks
+        workers = max_workers or os.cpu_count() or 1
+        chunks = [
+            [int(count) for count in chunk]
+            for chunk in np.array_split(self.stiffener_counts, workers)
+            if len(chunk)
+        ]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._count_layouts, chunks))
+        return pd.concat(results, ignore_index=True)
+
+    def optimum(self, max_workers: Optional[int] = None) -> Optional[pd.Series]:
+        """Lightest layout passing the panel and stiffener checks, None if
+        there's none.
+        """
+        layouts = self.evaluate(max_workers=max_workers)
+        if layouts.empty:
+            return None
+        passing = layouts[layouts["stiffener_min_ratio"] >= 1]
+        if passing.empty:
+            return None
+        return passing.loc[passing["mass"].idxmin()]
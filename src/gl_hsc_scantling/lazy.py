@@ -0,0 +1,146 @@
+"""
+Lazily materialized session collections.
+
+A LazyCollection keeps the serialized dicts of its entities indexed by name
+and deserializes an entity the first time it's looked up. References to
+other collections are resolved through those collections, so only the
+entities an access actually needs get built: checking one panel builds its
+vessel, laminate and materials, not the rest of the session. Iterating over a
+collection (values, items, comparisons...) builds all of it.
+"""
+
+from typing import Any, Callable
+
+
+class LazyCollection(dict):
+    """Dict of entities by name, deserialized on first access by build from
+    their serialized dict.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._raw: dict[str, dict] = {}
+        self._order: list[str] = list(super().keys())
+        self._build: Callable[[dict], Any] = None
+
+    def defer(self, raw: dict[str, dict], build: Callable[[dict], Any]):
+        """Adds serialized entities by name, replacing those of the same
+        name.
+        """
+        for name in raw:
+            super().pop(name, None)
+            if name not in self._raw:
+                self._order.append(name)
+        self._raw.update(raw)
+        self._build = build
+
+    @property
+    def pending(self) -> list[str]:
+        """Names of the entities not built yet."""
+        return list(self._raw)
+
+    def _materialize(self, name: str):
+        value = self._build(self._raw[name])
+        del self._raw[name]
+        super().__setitem__(name, value)
+        return value
+
+    def materialize(self):
+        """Builds every pending entity, keeping the collection's order."""
+        if not self._raw:
+            return
+        for name in list(self._raw):
+            self._materialize(name)
+        ordered = {
+            name: super(LazyCollection, self).__getitem__(name)
+            for name in self._order
+            if super(LazyCollection, self).__contains__(name)
+        }
+        ordered.update(super().items())
+        super().clear()
+        super().update(ordered)
+
+    def __missing__(self, name: str):
+        if name in self._raw:
+            return self._materialize(name)
+        raise KeyError(name)
+
+    def get(self, name: str, default=None):
+        return self[name] if name in self else default
+
+    def __contains__(self, name) -> bool:
+        return super().__contains__(name) or name in self._raw
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self._raw)
+
+    def __iter__(self):
+        self.materialize()
+        return super().__iter__()
+
+    def keys(self):
+        self.materialize()
+        return super().keys()
+
+    def values(self):
+        self.materialize()
+        return super().values()
+
+    def items(self):
+        self.materialize()
+        return super().items()
+
+    def __eq__(self, other) -> bool:
+        self.materialize()
+        if isinstance(other, LazyCollection):
+            other.materialize()
+        return super().__eq__(other)
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        self.materialize()
+        return super().__repr__()
+
+    def __setitem__(self, name: str, value):
+        if name not in self:
+            self._order.append(name)
+        self._raw.pop(name, None)
+        super().__setitem__(name, value)
+
+    def __delitem__(self, name: str):
+        if name in self._raw:
+            del self._raw[name]
+            return
+        super().__delitem__(name)
+
+    def update(self, *args, **kwargs):
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def setdefault(self, name: str, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def pop(self, name: str, *default):
+        if name in self._raw:
+            self._materialize(name)
+        return super().pop(name, *default)
+
+    def popitem(self):
+        self.materialize()
+        return super().popitem()
+
+    def clear(self):
+        self._raw.clear()
+        self._order.clear()
+        super().clear()
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def __reduce__(self):
+        # Built entities only, the builder being bound to its session
+        return dict, (dict(self.items()),)
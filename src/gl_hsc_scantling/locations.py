@@ -28,55 +28,57 @@ from gl_hsc_scantling.vessel import Monohull, Catamaran
 
 if TYPE_CHECKING:
     from .elements import StructuralElement
-# Helper functions, all 'pure'.
+
+# Helper functions, all 'pure'. They accept either floats or numpy arrays
+# (broadcast against each other), so the same formulas back the single element
+# calculation and the gridded/batched evaluations.
 def _pressure_sea_f(z_baseline, draft, p_sea_min, factor_S):
-    if z_baseline <= draft:
-        p = 10 * (draft + 0.75 * factor_S - (1 - 0.25 * factor_S / draft) * z_baseline)
-    else:
-        p = 10 * (draft + factor_S - z_baseline)
-    return np.max([p_sea_min, p])
+    p = np.where(
+        z_baseline <= draft,
+        10 * (draft + 0.75 * factor_S - (1 - 0.25 * factor_S / draft) * z_baseline),
+        10 * (draft + factor_S - z_baseline),
+    )
+    return np.maximum(p_sea_min, p)
+
+
+def _linear_interp_f(x, x0, x1, f0, f1):
+    """Two point linear interpolation, clamped outside [x0, x1]. Unlike np.interp,
+    f0 and f1 may be arrays.
+    """
+    ratio = np.clip((x - x0) / (x1 - x0), 0, 1)
+    return f0 + ratio * (f1 - f0)
 
 
 def _pressure_sea_interpolate_f(
     x_pos: float, pressure_below_05: float, pressure_above_09: float
 ) -> float:
-    xp = [0.5, 0.9]
-    fp = [pressure_below_05, pressure_above_09]
-    return np.interp(x_pos, xp, fp)
+    return _linear_interp_f(x_pos, 0.5, 0.9, pressure_below_05, pressure_above_09)
 
 
 def _factor_S_fwd_f(vert_acg, length, block_coef, draft):
     """Table C3.5.2"""
-    return np.max(
-        [
-            np.min(
-                [
-                    0.36 * vert_acg * length**0.5 / np.min([block_coef, 0.5]),
-                    3.5 * draft,
-                ]
-            ),
-            draft,
-        ]
+    return np.maximum(
+        np.minimum(
+            0.36 * vert_acg * length**0.5 / np.minimum(block_coef, 0.5),
+            3.5 * draft,
+        ),
+        draft,
     )
 
 
 def _factor_S_aft_f(vert_acg, length, draft):
     """Table C3.5.2"""
-    return np.max(
-        [
-            np.min(
-                [
-                    0.60 * vert_acg * length**0.5,
-                    2.5 * draft,
-                ]
-            ),
-            draft,
-        ]
+    return np.maximum(
+        np.minimum(
+            0.60 * vert_acg * length**0.5,
+            2.5 * draft,
+        ),
+        draft,
     )
 
 
 def _preassure_sea_min_aft_f(length):
-    return np.max([10, np.min([(length + 75) / 10, 20])])
+    return np.maximum(10, np.minimum((length + 75) / 10, 20))
 
 
 def _preassure_sea_min_f(preassure_sea_min_aft, preassure_sea_min_fwd, x_pos):
@@ -91,16 +93,13 @@ def _preassure_sea_min_f(preassure_sea_min_aft, preassure_sea_min_fwd, x_pos):
 
 
 def _preassure_sea_min_fwd_f(length):
-    return np.max([20, np.min([(length + 75) / 5, 35])])
+    return np.maximum(20, np.minimum((length + 75) / 5, 35))
 
 
 def _x_lim_f(vert_acg, x_lim_Froude_n_min, x_lim_Froude_n_max):
-    if vert_acg <= 1:
-        return x_lim_Froude_n_min
-    elif vert_acg <= 1.5:
-        return x_lim_Froude_n_max
-    else:
-        return 0
+    return np.select(
+        [vert_acg <= 1, vert_acg <= 1.5], [x_lim_Froude_n_min, x_lim_Froude_n_max], 0
+    )[()]
 
 
 def _x_lim_sp_len_ratio_min_f(
@@ -108,22 +107,18 @@ def _x_lim_sp_len_ratio_min_f(
     x_lim_min_acg_inf,
     x_lim_min_acg_sup,
 ):
-    if sp_len_ratio < 4.5:
-        return x_lim_min_acg_inf
-    elif sp_len_ratio <= 5:
-        return x_lim_min_acg_sup
-    else:
-        return 0
+    return np.select(
+        [sp_len_ratio < 4.5, sp_len_ratio <= 5],
+        [x_lim_min_acg_inf, x_lim_min_acg_sup],
+        0,
+    )[()]
 
 
 def _x_lim_sp_len_ratio_max_f(
     sp_len_ratio,
     x_lim_max_acg,
 ):
-    if sp_len_ratio < 5:
-        return x_lim_max_acg
-    else:
-        return 0
+    return np.where(sp_len_ratio < 5, x_lim_max_acg, 0)[()]
 
 
 def _ref_area_f(displacement, draft):
@@ -135,7 +130,7 @@ def _area_f(span, spacing):
 
 
 def _effective_deadrise(deadrise):
-    return np.max([10, np.min([deadrise, 30])])
+    return np.maximum(10, np.minimum(deadrise, 30))
 
 
 def _coef_k3_f(deadrise_eff, deadrise_lcg_eff):
@@ -148,7 +143,7 @@ def _param_u_f(area, ref_area):
 
 def _coef_k2_f(param_u, k2_min) -> float:
     k2 = 0.455 - 0.35 * ((param_u**0.75 - 1.7) / (param_u**0.75 + 1.7))
-    return np.max([k2_min, k2])
+    return np.maximum(k2_min, k2)
 
 
 def _pressure_impact_f(
@@ -158,15 +153,14 @@ def _pressure_impact_f(
     pressure_impact_limit,
     pressure_sea_lim,
 ):
-    if x_pos > x_lim:
-        return pressure_impact_pre
-    elif x_pos > x_lim - 0.1:
-        xp = [0, 0.1]
-        fp = [pressure_sea_lim, pressure_impact_limit]
-        corrected_x = x_pos - x_lim + 0.1
-        return np.interp(corrected_x, xp, fp)
-    else:
-        return 0
+    pressure_transition = _linear_interp_f(
+        x_pos - x_lim + 0.1, 0, 0.1, pressure_sea_lim, pressure_impact_limit
+    )
+    return np.select(
+        [x_pos > x_lim, x_pos > x_lim - 0.1],
+        [pressure_impact_pre, pressure_transition],
+        0,
+    )[()]
 
 
 def _coef_k1_f(x_pos):
@@ -210,28 +204,21 @@ def _pressure_deck_f(z_waterline):
 
 
 def _x1_f(midship, x_pos, x):
-    if x_pos > midship:
-        return np.abs(x - midship)
-    else:
-        return 0
+    return np.where(x_pos > midship, np.abs(x - midship), 0)[()]
 
 
 def _coef_ksu_f(beam, deckhouse_breadth):
-    return np.max([3, np.min([5, 1.5 + 3.5 * deckhouse_breadth / beam])])
+    return np.maximum(3, np.minimum(5, 1.5 + 3.5 * deckhouse_breadth / beam))
 
 
 def _pressure_walls_f(
     length, block_coef, z_waterline, coef_ksu, x1, pressure_walls_min
 ):
-    return np.max(
-        [
-            (
-                coef_ksu
-                * (1 + x1 / (2 * length * (block_coef + 0.1)))
-                * (1 + 0.045 * length - 0.38 * z_waterline)
-            ),
-            pressure_walls_min,
-        ]
+    return np.maximum(
+        coef_ksu
+        * (1 + x1 / (2 * length * (block_coef + 0.1)))
+        * (1 + 0.045 * length - 0.38 * z_waterline),
+        pressure_walls_min,
     )
 
 
@@ -352,11 +339,11 @@ class ImpactPressure(Pressure):
         )
 
     def _param_u(self, elmt: "StructuralElement"):
-        return _param_u_f(area=elmt.model.area, ref_area=self._ref_area(elmt))
+        return _param_u_f(area=elmt.area, ref_area=self._ref_area(elmt))
 
     def _coef_k2(self, elmt: "StructuralElement"):
         return _coef_k2_f(
-            self._param_u(elmt), self._coef_k2_min_table[type(elmt.model)]
+            self._param_u(elmt), self._coef_k2_min_table[elmt.model_type]
         )
 
     def _pressure_sea_limit(self, elmt: "StructuralElement") -> float:
@@ -485,7 +472,7 @@ class DeckHousePressure(Pressure):
 
     def _pressure_walls(self, elmt: "StructuralElement"):
         return _pressure_walls_f(
-            length=elmt.vessel.lenght,
+            length=elmt.vessel.length,
             block_coef=elmt.vessel.block_coef,
             z_waterline=elmt.z_waterline,
             coef_ksu=self._coef_ksu(elmt),
@@ -0,0 +1,197 @@
+"""
+Copy-on-write session overlays.
+
+A SessionOverlay is a what-if view of a base session: it records overridden
+fields of some entities ("bottom panels with laminate B", "speed 28 kn") and
+builds copies of only those entities and the ones depending on them, sharing
+every other entity, with its cached values, with the base. Evaluating an
+overlay checks only the elements it affects, and diff compares their
+criteria with the base's.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .elements import StructuralElement
+from .results import RuleCheckCache
+from .session import Session
+from .utils import Criteria
+
+
+@dataclass
+class SessionOverlay:
+    """Overrides of the base session's entities, applied with override."""
+
+    base: Session
+    name: str = ""
+    _overrides: list[tuple[object, dict]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self._reset()
+
+    def _reset(self):
+        # By id of the base entities
+        self._copies: dict[int, object] = {}
+        self._changes: dict[int, dict] = {}
+        self._affected: dict[int, object] = {}
+        for entity, changes in self._overrides:
+            self._changes.setdefault(id(entity), {}).update(changes)
+            self._affected.update(
+                (id(item), item) for item in self.base.dependencies.dependents(entity)
+            )
+
+    def __getstate__(self) -> dict:
+        # Copies are keyed by id, so they're rebuilt by the unpickled overlay
+        return {"base": self.base, "name": self.name, "_overrides": self._overrides}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._reset()
+
+    def override(self, entity, **changes) -> "SessionOverlay":
+        """Sets fields of a base session entity in the overlay, e.g.
+        override(panel.model, laminate=laminate_b) or
+        override(vessel, speed=28). Values may be base entities, which are
+        replaced by their overlay copies.
+        """
+        self._overrides.append((entity, changes))
+        self._reset()
+        return self
+
+    def _resolve_value(self, value):
+        if id(value) in self._affected:
+            return self.resolve(value)
+        if isinstance(value, list):
+            items = [self._resolve_value(item) for item in value]
+            if any(new is not old for new, old in zip(items, value)):
+                return items
+        elif isinstance(value, tuple):
+            items = tuple(self._resolve_value(item) for item in value)
+            if any(new is not old for new, old in zip(items, value)):
+                return type(value)(items)
+        return value
+
+    def resolve(self, entity):
+        """The overlay's version of a base session entity: a copy if it's
+        overridden or depends on an overridden entity, else the entity.
+        """
+        if id(entity) not in self._affected:
+            return entity
+        if id(entity) in self._copies:
+            return self._copies[id(entity)]
+        changes = {
+            field_.name: new
+            for field_ in fields(entity)
+            if field_.init
+            for value in [getattr(entity, field_.name)]
+            for new in [self._resolve_value(value)]
+            if new is not value
+        }
+        changes.update(
+            {
+                name: self._resolve_value(value)
+                for name, value in self._changes.get(id(entity), {}).items()
+            }
+        )
+        copy = replace(entity, **changes)
+        self._copies[id(entity)] = copy
+        return copy
+
+    @property
+    def session(self) -> Session:
+        """Session of the base's entities, overlay copies replacing the
+        affected ones.
+        """
+        return Session(
+            **{
+                name: {key: self.resolve(value) for key, value in collection.items()}
+                for name, collection in self.base.session_dict.items()
+            }
+        )
+
+    @property
+    def affected_elements(self) -> list[StructuralElement]:
+        """Base session elements the overrides change, panels first."""
+        return [
+            element
+            for collection in (self.base.panels, self.base.stiffener_elements)
+            for element in collection.values()
+            if id(element) in self._affected
+        ]
+
+    def rule_check(self, cache: Optional[RuleCheckCache] = None) -> pd.DataFrame:
+        """Rule checks of the affected elements in the overlay."""
+        cache = cache or RuleCheckCache()
+        return cache.rule_check(
+            [self.resolve(element) for element in self.affected_elements]
+        )
+
+    def diff(self, cache: Optional[RuleCheckCache] = None) -> pd.DataFrame:
+        """Criteria ratios of the affected elements in the base and in the
+        overlay, one row per element and criteria. A shared cache computes the
+        base's checks once for many overlays.
+        """
+        cache = cache or RuleCheckCache()
+        elements = self.affected_elements
+        if not elements:
+            return pd.DataFrame()
+        base = cache.rule_check(elements)
+        overlay = cache.rule_check([self.resolve(element) for element in elements])
+        rows = []
+        for (_, base_row), (_, overlay_row), element in zip(
+            base.iterrows(), overlay.iterrows(), elements
+        ):
+            for criteria, value in base_row.items():
+                if isinstance(value, Criteria):
+                    rows.append(
+                        {
+                            "overlay": self.name,
+                            "name": element.name,
+                            "type": type(element.model).__name__,
+                            "criteria": criteria,
+                            "base_ratio": value.ratio,
+                            "overlay_ratio": overlay_row[criteria].ratio,
+                        }
+                    )
+        diff = pd.DataFrame(rows)
+        diff["change"] = diff["overlay_ratio"] - diff["base_ratio"]
+        return diff
+
+
+def _diff_chunk(overlays: list[SessionOverlay]) -> list[pd.DataFrame]:
+    cache = RuleCheckCache()
+    return [overlay.diff(cache) for overlay in overlays]
+
+
+def evaluate(
+    overlays: list[SessionOverlay], max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """Diffs of every overlay, concatenated. Overlays are split between
+    parallel processes unless max_workers is 1, each process sharing the
+    base's checks between its overlays.
+    """
+    if max_workers == 1:
+        diffs = _diff_chunk(overlays)
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        # Chunks are pickled with their base session once
+        chunks = [
+            [overlays[i] for i in chunk]
+            for chunk in np.array_split(np.arange(len(overlays)), workers)
+            if len(chunk)
+        ]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            diffs = [
+                diff for chunk in executor.map(_diff_chunk, chunks) for diff in chunk
+            ]
+    diffs = [diff for diff in diffs if not diff.empty]
+    if not diffs:
+        return pd.DataFrame()
+    return pd.concat(diffs, ignore_index=True)
@@ -4,6 +4,7 @@ Created on Wed Mar 31 12:28:58 2021
 
 @author: ruy
 """
+
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -29,6 +30,7 @@ from .composites import Laminate
 from .structural_model import BoundaryCondition
 from .vessel import Monohull
 
+
 # TODO refactor panel_coef methods. Use dataclasses instead of primitive dicts
 @dataclass
 class Panel:
@@ -93,6 +95,11 @@ class Panel:
         table = {"x": self.dim_y, "y": self.dim_x}
         return table[self.span_direction]
 
+    @property
+    def mass(self):
+        """Panel mass (kg)."""
+        return self.laminate.area_density * self.dim_x * self.dim_y
+
     # Be careful with span and spacing definitions of panels and stiffeneres,
     # they are usually switched
     @property
@@ -235,9 +242,9 @@ class Panel:
 
         return momt / section_modulus
 
-    def rule_check(self, pressure):
+    def panel_check(self, pressure):
+        """Panel level checks, without the laminate checks."""
         momt = self.max_bend_moment(pressure)
-        laminate_check = self.laminate.panel_rule_check(self, pressure=pressure)
         section_modulus = self.laminate.section_modulus[self.span_index]
         simp_strain_check = pd.DataFrame(
             {
@@ -261,4 +268,8 @@ class Panel:
                 ]
             }
         )
-        return pd.concat([deflection_check, simp_strain_check, laminate_check], axis=1)
+        return pd.concat([deflection_check, simp_strain_check], axis=1)
+
+    def rule_check(self, pressure):
+        laminate_check = self.laminate.panel_rule_check(self, pressure=pressure)
+        return pd.concat([self.panel_check(pressure), laminate_check], axis=1)
@@ -0,0 +1,264 @@
+"""
+Persistent cache of derived properties.
+
+Derived properties declared with persistent_property (laminates' ABD and
+compliance matrices, moduli..., stiffener sections' compiled geometry) are
+cached like functools.cached_property ones and, once enable is called, also
+stored in a local SQLite file keyed by the object's content hash, so later
+processes get them without computing them again.
+
+Keys are hashed from the objects' current values, so the store never
+returns values stored for other inputs, even after edits made in place. But
+values are also cached in memory, like any cached_property, and computed
+from the cached properties of the objects referenced, which in place edits
+don't clear: edit through Session.update, or call Session.invalidate after
+editing in place, else stale values are used, and stored for the new
+inputs.
+
+Content identical instances made to share (see share, used by interning)
+also compute each value once in memory, whichever of them gets it first.
+The link is dropped with the cached values by Session.update and
+invalidate (dependencies.clear_cached).
+
+The store is bounded in size, evicting the least recently used values, and
+is emptied when opened by another package version. SQLite's locking (write
+ahead log, busy timeout) makes it safe to share between worker processes,
+each process opening its own connection.
+"""
+
+import os
+import pickle
+import sqlite3
+import time
+from functools import cache, cached_property
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Optional, Union
+
+from .hashing import content_hash
+
+# Bumped when stored values change meaning or layout
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 2**20
+TIMEOUT = 30
+# Access times are written in batches, reads not taking write locks each time
+ACCESS_FLUSH_SIZE = 256
+MISSING = object()
+# Instance attribute holding the values shared with content identical
+# instances
+SHARED_VALUES = "_shared_values"
+
+
+def _package_version() -> str:
+    try:
+        package = version("gl_hsc_scantling")
+    except PackageNotFoundError:
+        package = "unknown"
+    return f"{package}/{FORMAT_VERSION}"
+
+
+class PropertyStore:
+    """SQLite file of pickled property values by key, at most max_bytes of
+    them.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        version: Optional[str] = None,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.version = version or _package_version()
+        self._connection = None
+        self._pid = None
+        self._accessed: dict[str, float] = {}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The process' connection, opened again after forking."""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = self._connect()
+            self._pid = os.getpid()
+            self._accessed.clear()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=TIMEOUT)
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS properties ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS properties_accessed "
+                "ON properties (accessed)"
+            )
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+            if row is None or row[0] != self.version:
+                connection.execute("DELETE FROM properties")
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (self.version,),
+                )
+        return connection
+
+    def get(self, key: str, default=None):
+        row = self.connection.execute(
+            "SELECT value FROM properties WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        self._accessed[key] = time.time()
+        if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+            self.flush()
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO properties VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+        self.flush()
+
+    def flush(self):
+        """Writes the pending access times and evicts the least recently used
+        values beyond max_bytes.
+        """
+        connection = self.connection
+        with connection:
+            connection.executemany(
+                "UPDATE properties SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+            total = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM properties"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for key, size in connection.execute(
+                "SELECT key, size FROM properties ORDER BY accessed"
+            ):
+                evicted.append((key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            connection.executemany("DELETE FROM properties WHERE key = ?", evicted)
+
+    @property
+    def size(self) -> int:
+        """Bytes of stored values."""
+        return self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM properties"
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM properties").fetchone()[0]
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM properties")
+        self._accessed.clear()
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self.flush()
+            self._connection.close()
+        self._connection = None
+
+    def __getstate__(self):
+        # Each process opens its own connection
+        return {**self.__dict__, "_connection": None, "_pid": None, "_accessed": {}}
+
+
+_store: Optional[PropertyStore] = None
+
+
+def enable(
+    path: Union[str, Path] = Path.home() / ".gl_hsc_scantling" / "properties.sqlite",
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> PropertyStore:
+    """Stores persistent properties in the SQLite file at path."""
+    global _store
+    disable()
+    _store = PropertyStore(path, max_bytes=max_bytes)
+    return _store
+
+
+def disable():
+    """Persistent properties are only cached in memory, as by default."""
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = None
+
+
+def store() -> Optional[PropertyStore]:
+    """The enabled store, None if disabled."""
+    return _store
+
+
+@cache
+def persistent_names(cls: type) -> tuple[str, ...]:
+    """Names of the class' persistent properties."""
+    return tuple(
+        {
+            name
+            for klass in cls.__mro__
+            for name, value in vars(klass).items()
+            if isinstance(value, persistent_property)
+        }
+    )
+
+
+def share(instances: list):
+    """Makes content identical instances share their persistent properties'
+    values in memory.
+    """
+    values = {}
+    for instance in instances:
+        instance.__dict__[SHARED_VALUES] = values
+
+
+class persistent_property(cached_property):
+    """cached_property also looked up in, and saved to, the values shared
+    with content identical instances and the enabled PropertyStore under the
+    instance's content hash. Only for values depending on the fields
+    content_hash covers, not on names.
+    """
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        if self.attrname in cache:
+            return cache[self.attrname]
+        shared = cache.get(SHARED_VALUES)
+        if shared is not None and self.attrname in shared:
+            value = shared[self.attrname]
+        elif _store is None:
+            value = self.func(instance)
+        else:
+            key = f"{content_hash(instance)}.{self.attrname}"
+            value = _store.get(key, MISSING)
+            if value is MISSING:
+                value = self.func(instance)
+                _store.set(key, value)
+        if shared is not None:
+            shared[self.attrname] = value
+        cache[self.attrname] = value
+        return value
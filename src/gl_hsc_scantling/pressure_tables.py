@@ -0,0 +1,300 @@
+"""
+Gridded rule pressure lookup tables.
+
+Interactive tools that drag an element along the hull need its design pressure
+many times per second. A PressureTable evaluates the location pressures once,
+over a grid of x_pos, z_baseline and panel area, and answers later queries by
+multilinear interpolation.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field, fields, replace
+from functools import cache
+from math import log
+from operator import attrgetter
+from typing import Optional
+
+import numpy as np
+
+from .elements import StructuralElement, StructuralElementArray
+from .locations import ImpactPressure, Sea
+from .locations_abc import Location
+from .panels import Panel
+from .vessel import Catamaran, Monohull
+
+# Interpolation nodes of the rule tables along x_pos (k1, kwd and sea pressure)
+X_POS_BREAKPOINTS = [0, 0.2, 0.5, 0.7, 0.8, 0.9, 1]
+# Deck pressure interpolation nodes, z above the waterline (m)
+Z_WATERLINE_BREAKPOINTS = [0, 2, 3, 4]
+
+
+@cache
+def _inputs_getter(cls):
+    names = [field_.name for field_ in fields(cls)]
+    if not names:
+        return lambda obj: ()
+    return attrgetter(*names)
+
+
+def _signature(obj) -> tuple:
+    """Input values of a vessel or location, used to detect changes."""
+    return _inputs_getter(type(obj))(obj)
+
+
+def _axis(start: float, stop: float, n: int, breakpoints: list[float]) -> np.ndarray:
+    """Equally spaced nodes plus the breakpoints inside [start, stop]."""
+    nodes = np.concatenate([np.linspace(start, stop, n), breakpoints])
+    return np.unique(nodes[(nodes >= start) & (nodes <= stop)])
+
+
+def _cell_weights(axis: np.ndarray, values: np.ndarray):
+    """Lower node index and linear weight of each value along one axis."""
+    index = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, len(axis) - 2)
+    weight = (values - axis[index]) / (axis[index + 1] - axis[index])
+    return index, weight
+
+
+def _multilinear(axes: list[np.ndarray], table: np.ndarray, points: list[np.ndarray]):
+    """Multilinear interpolation of table, defined on the rectilinear grid axes,
+    at points (one array of coordinates per axis).
+    """
+    cells = [_cell_weights(axis, values) for axis, values in zip(axes, points)]
+    result = 0
+    for corner in np.ndindex(*[2] * len(axes)):
+        index = tuple(cell[0] + offset for cell, offset in zip(cells, corner))
+        weight = np.prod(
+            [cell[1] if offset else 1 - cell[1] for cell, offset in zip(cells, corner)],
+            axis=0,
+        )
+        result = result + weight * table[index]
+    return result
+
+
+@dataclass
+class PressureTable:
+    """Design pressure lookup table of a location type on a given vessel.
+    Grid axes are x_pos (-), z_baseline (m) and log(area) (m2). The n_*
+    arguments set the number of equally spaced nodes of each axis, to which the
+    breakpoints of the rule formulas are added, so kinks and jumps (e.g. the
+    start of the impact region) are represented exactly.
+    The table is rebuilt automatically on the first query after any of the
+    vessel's or location's input parameters changes.
+    """
+
+    vessel: Monohull | Catamaran
+    location: Location
+    model_type: type = Panel
+    x_pos_range: tuple[float, float] = (0, 1)
+    z_baseline_range: Optional[tuple[float, float]] = None
+    area_range: tuple[float, float] = (0.01, 10)
+    n_x: int = 41
+    n_z: int = 41
+    n_area: int = 17
+    _built_signature: tuple = field(default=None, init=False, repr=False, compare=False)
+    _axes: list = field(default=None, init=False, repr=False, compare=False)
+    _tables: dict = field(default=None, init=False, repr=False, compare=False)
+    _design_table: np.ndarray = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Plain python copies for the scalar query path
+    _axes_list: list = field(default=None, init=False, repr=False, compare=False)
+    _design_list: list = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def _current_signature(self):
+        return _signature(self.vessel), _signature(self.location)
+
+    @property
+    def is_current(self) -> bool:
+        return self._built_signature == self._current_signature
+
+    def _grid_element(self, vessel, location, x_pos, z_baseline, area):
+        x = vessel.aft_perp + x_pos * (vessel.fwd_perp - vessel.aft_perp)
+        z = vessel.z_baseline + z_baseline
+        return StructuralElementArray(
+            x=x,
+            z=z,
+            area=area,
+            vessel=vessel,
+            location=location,
+            model_type=self.model_type,
+        )
+
+    def _x_pos_breakpoints(self, elmt) -> list[float]:
+        breakpoints = list(X_POS_BREAKPOINTS)
+        for pressure in self.location._pressures:
+            if isinstance(pressure, ImpactPressure):
+                x_lim = float(pressure._x_lim(elmt))
+                # The impact pressure jumps from 0 just after x_lim - 0.1
+                start = x_lim - 0.1
+                breakpoints += [start, np.nextafter(start, np.inf), x_lim]
+        return breakpoints
+
+    def _z_baseline_breakpoints(self, elmt) -> list[float]:
+        draft = elmt.vessel.draft
+        breakpoints = [draft] + [draft + z for z in Z_WATERLINE_BREAKPOINTS]
+        sea = Sea()
+        # Above the draft the sea pressure is linear down to its minimum value
+        for factor_S, p_sea_min in [
+            (sea._factor_S_aft(elmt), sea._preassure_sea_min_aft(elmt)),
+            (sea._factor_S_fwd(elmt), sea._preassure_sea_min_fwd(elmt)),
+        ]:
+            breakpoints.append(float(draft + factor_S - p_sea_min / 10))
+        return breakpoints
+
+    def build(self):
+        """(Re)evaluates the pressures over the grid."""
+        # Fresh copies, so no stale cached_property values are used
+        vessel = replace(self.vessel)
+        location = replace(self.location)
+        probe = self._grid_element(vessel, location, 0, 0, self.area_range[0])
+        z_baseline_range = self.z_baseline_range or (0, vessel.draft + 5)
+        axes = [
+            _axis(*self.x_pos_range, self.n_x, self._x_pos_breakpoints(probe)),
+            _axis(*z_baseline_range, self.n_z, self._z_baseline_breakpoints(probe)),
+            np.linspace(*np.log(self.area_range), self.n_area),
+        ]
+        x_pos, z_baseline, log_area = np.meshgrid(*axes, indexing="ij")
+        grid = self._grid_element(vessel, location, x_pos, z_baseline, np.exp(log_area))
+        self._tables = {
+            name: np.broadcast_to(pressure, x_pos.shape)
+            for name, pressure in grid.pressures.items()
+        }
+        self._design_table = np.max(list(self._tables.values()), axis=0)
+        self._axes = axes
+        self._axes_list = [axis.tolist() for axis in axes]
+        self._design_list = self._design_table.tolist()
+        self._built_signature = self._current_signature
+
+    def _ensure_current(self):
+        if not self.is_current:
+            self.build()
+
+    def _query_points(self, x, z, area):
+        x_pos = (x - self.vessel.aft_perp) / (
+            self.vessel.fwd_perp - self.vessel.aft_perp
+        )
+        return [x_pos, z - self.vessel.z_baseline, np.log(area)]
+
+    def _in_range(self, points) -> bool:
+        return all(
+            np.all((values >= axis[0]) & (values <= axis[-1]))
+            for axis, values in zip(self._axes, points)
+        )
+
+    def _exact(self, x, z, area) -> StructuralElementArray:
+        return StructuralElementArray(
+            x=x,
+            z=z,
+            area=area,
+            vessel=replace(self.vessel),
+            location=replace(self.location),
+            model_type=self.model_type,
+        )
+
+    def pressures(self, x, z, area) -> dict[str, np.ndarray]:
+        """Interpolated pressures (kPa) by pressure type. x and z in the vessel
+        coordinate system (m), area in m2. Points outside of the grid are
+        calculated exactly.
+        """
+        self._ensure_current()
+        points = self._query_points(*np.broadcast_arrays(x, z, area))
+        if not self._in_range(points):
+            return self._exact(x, z, area).pressures
+        return {
+            name: _multilinear(self._axes, table, points)
+            for name, table in self._tables.items()
+        }
+
+    def design_pressure(self, x, z, area):
+        """Interpolated design pressure (kPa), the maximum of all pressure types.
+        Accepts floats or arrays; the float path avoids numpy overhead.
+        """
+        self._ensure_current()
+        if (
+            isinstance(x, (int, float))
+            and isinstance(z, (int, float))
+            and isinstance(area, (int, float))
+        ):
+            return self._design_pressure_scalar(x, z, area)
+        points = self._query_points(*np.broadcast_arrays(x, z, area))
+        if not self._in_range(points):
+            return self._exact(x, z, area).design_pressure
+        return _multilinear(self._axes, self._design_table, points)
+
+    def _design_pressure_scalar(self, x, z, area):
+        vessel = self.vessel
+        points = [
+            (x - vessel.aft_perp) / (vessel.fwd_perp - vessel.aft_perp),
+            z - vessel.z_baseline,
+            log(area),
+        ]
+        cells = []
+        for axis, value in zip(self._axes_list, points):
+            if not axis[0] <= value <= axis[-1]:
+                return float(self._exact(x, z, area).design_pressure)
+            index = min(bisect_right(axis, value) - 1, len(axis) - 2)
+            weight = (value - axis[index]) / (axis[index + 1] - axis[index])
+            cells.append((index, weight))
+        (i, wi), (j, wj), (k, wk) = cells
+        result = 0.0
+        for plane, wx in [
+            (self._design_list[i], 1 - wi),
+            (self._design_list[i + 1], wi),
+        ]:
+            for row, wz in [(plane[j], 1 - wj), (plane[j + 1], wj)]:
+                result += wx * wz * ((1 - wk) * row[k] + wk * row[k + 1])
+        return result
+
+    def element_design_pressure(self, element: StructuralElement) -> float:
+        return self.design_pressure(element.x, element.z, element.area)
+
+    @property
+    def error_bound(self) -> float:
+        """Estimated maximum absolute interpolation error (kPa) of the design
+        pressure, checked against the exact calculation at the center of
+        every grid cell, where the linear interpolation error peaks.
+        """
+        self._ensure_current()
+        centers = [(axis[1:] + axis[:-1]) / 2 for axis in self._axes]
+        points = np.meshgrid(*centers, indexing="ij")
+        interpolated = _multilinear(self._axes, self._design_table, points)
+        x_pos, z_baseline, log_area = points
+        exact = self._grid_element(
+            replace(self.vessel),
+            replace(self.location),
+            x_pos,
+            z_baseline,
+            np.exp(log_area),
+        ).design_pressure
+        return float(np.max(np.abs(interpolated - exact)))
+
+
+@dataclass
+class PressureTables:
+    """PressureTable registry, one table per vessel, location and model type,
+    built on first use. resolution is passed on to each PressureTable
+    (n_x, n_z, n_area, ranges).
+    """
+
+    resolution: dict = field(default_factory=dict)
+    tables: dict = field(default_factory=dict)
+
+    def table(self, element: StructuralElement) -> PressureTable:
+        key = (
+            id(element.vessel),
+            type(element.location),
+            _signature(element.location),
+            element.model_type,
+        )
+        if key not in self.tables:
+            self.tables[key] = PressureTable(
+                vessel=element.vessel,
+                location=replace(element.location),
+                model_type=element.model_type,
+                **self.resolution,
+            )
+        return self.tables[key]
+
+    def design_pressure(self, element: StructuralElement) -> float:
+        return self.table(element).element_design_pressure(element)
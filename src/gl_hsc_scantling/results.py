@@ -0,0 +1,80 @@
+"""
+Cached rule checks of structural elements.
+
+An element's rule check depends only on its inputs: vessel, model (with its
+laminates and sections), location and position. RuleCheckCache keeps each
+element's rule check row under the element's content hash, in memory or in a
+persistent PropertyStore, so re-running the checks of a session after
+editing it only computes the rows of the elements whose inputs changed, in
+this process or a later one.
+
+Keys are hashed from the elements' current inputs, so a row is never reused
+for inputs it wasn't computed from, even after edits made in place. But
+rows are computed from the models' cached properties (laminate matrices,
+section properties...), which in place edits don't clear: edit sessions
+through Session.update, or call Session.invalidate after editing in place,
+before checking them, else a row computed from stale cached values is
+stored under the new inputs' key.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from .elements import StructuralElement
+from .hashing import content_hash
+from .persistent import PropertyStore
+
+
+@dataclass
+class RuleCheckCache:
+    """Rule check rows by element content hash, stored in store if given.
+    reused and computed count the rows of the last rule_check call.
+    """
+
+    store: Optional[PropertyStore] = None
+    reused: int = field(default=0, init=False)
+    computed: int = field(default=0, init=False)
+    _rows: dict[str, pd.DataFrame] = field(default_factory=dict, init=False, repr=False)
+
+    def _get(self, key: str) -> Optional[pd.DataFrame]:
+        if self.store is None:
+            return self._rows.get(key)
+        return self.store.get(key)
+
+    def _set(self, key: str, row: pd.DataFrame):
+        if self.store is None:
+            self._rows[key] = row
+        else:
+            self.store.set(key, row)
+
+    def row(self, element: StructuralElement) -> pd.DataFrame:
+        """The element's rule check, computed only if its inputs aren't in the
+        cache. Names being left out of content hashes, the stored row is given
+        the element's name.
+        """
+        key = f"{content_hash(element)}.rule_check"
+        row = self._get(key)
+        if row is None:
+            row = element.rule_check
+            self._set(key, row)
+            self.computed += 1
+            return row
+        self.reused += 1
+        row = row.copy()
+        row["name"] = element.name
+        return row
+
+    def rule_check(self, elements: Iterable[StructuralElement]) -> pd.DataFrame:
+        """Rule checks of the elements, with the reused and computed counts
+        in the DataFrame's attrs.
+        """
+        self.reused = 0
+        self.computed = 0
+        rows = [self.row(element) for element in elements]
+        if not rows:
+            return pd.DataFrame()
+        checks = pd.concat(rows, ignore_index=True)
+        checks.attrs.update(reused=self.reused, computed=self.computed)
+        return checks
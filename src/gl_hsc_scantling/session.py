@@ -1,5 +1,8 @@
 from dataclasses import dataclass, field, fields
-from typing import Union
+from functools import cached_property, partial
+from itertools import chain
+from typing import Iterator, Optional, Union
+from io import BytesIO
 from json import dump, dumps, load, loads
 
 import pandas as pd
@@ -11,6 +14,14 @@ from dataclass_tools.tools import (
     serialize_dataclass,
 )
 
+from gl_hsc_scantling.binary import SessionFile, write_tables
+from gl_hsc_scantling.bulk import (
+    column_constructor,
+    constructor,
+    gc_paused,
+    serialized_tables,
+    subtype_column_constructor,
+)
 from gl_hsc_scantling.composites import (
     Core,
     CoreMat,
@@ -21,13 +32,18 @@ from gl_hsc_scantling.composites import (
     SandwichLaminate,
     SingleSkinLaminate,
 )
+from gl_hsc_scantling.dependencies import DependencyGraph
 from gl_hsc_scantling.elements import VESSEL_OPTIONS, StructuralElement
+from gl_hsc_scantling.interning import InternReport, intern_entities
+from gl_hsc_scantling.lazy import LazyCollection
 from gl_hsc_scantling.panels import Panel
+from gl_hsc_scantling.results import RuleCheckCache
 from gl_hsc_scantling.stiffeners import (
     Stiffener,
     StiffenerSection,
     StiffenerSectionWithFoot,
 )
+from gl_hsc_scantling.streaming import CHUNK_SIZE, iter_entities
 from gl_hsc_scantling.vessel import Catamaran, Monohull
 
 TYPE_LABEL = "typ"
@@ -36,6 +52,21 @@ LAMINATE_OPTIONS = DeSerializerOptions(add_type=True)
 STIFFENER_OPTIONS = DeSerializerOptions(add_type=True)
 VESSEL_OPTIONS = DeSerializerOptions(add_type=True)
 
+# Entity type, or types by TYPE_LABEL, of each session collection
+COLLECTION_TYPES = {
+    "vessels": {typ.__name__: typ for typ in [Monohull, Catamaran]},
+    "matrices": Matrix,
+    "fibers": Fiber,
+    "laminas": Lamina,
+    "core_materials": CoreMat,
+    "cores": Core,
+    "laminates": {typ.__name__: typ for typ in [SingleSkinLaminate, SandwichLaminate]},
+    "stiffener_sections": StiffenerSectionWithFoot,
+    "stiffener_elements": StructuralElement,
+    "panels": StructuralElement,
+}
+ELEMENT_COLLECTIONS = ["panels", "stiffener_elements"]
+
 
 @dataclass
 class Session:
@@ -56,6 +87,17 @@ class Session:
     panels: dict[str, StructuralElement] = field(default_factory=dict)
     stiffener_elements: dict[str, StructuralElement] = field(default_factory=dict)
 
+    def __post_init__(self):
+        # Elements affected by updates since the last recompute_dirty, by id
+        self._dirty: dict[int, StructuralElement] = {}
+
+    def __getstate__(self) -> dict:
+        # The dependency graph and dirty elements are keyed by id, so they're
+        # rebuilt by the unpickled session
+        state = {**self.__dict__, "_dirty": {}}
+        state.pop("dependencies", None)
+        return state
+
     @property
     def session_dict(self):
         return {field_.name: getattr(self, field_.name) for field_ in fields(self)}
@@ -132,6 +174,7 @@ class Session:
         for item in stuff:
             dictionary_of_item_type = self._sort_item(item)
             dictionary_of_item_type.update({item.name: item})
+        self._reset_dependencies()
 
     # TODO Finish function
     def load_single_entry(self, key, value):
@@ -163,15 +206,9 @@ class Session:
         )
 
     def _load_list(self, list_of_values: list[dict], typ, dict_of_collections=None):
-        return {
-            value["name"]: deserialize_dataclass(
-                dct=value,
-                dataclass=typ,
-                build_instance=True,
-                dict_of_collections=dict_of_collections,
-            )
-            for value in list_of_values
-        }
+        build = constructor(typ)
+        collections = dict_of_collections or {}
+        return {value["name"]: build(value, collections) for value in list_of_values}
 
     def _load_list_multiple_types(
         self,
@@ -179,95 +216,203 @@ class Session:
         subtypes_table: dict,
         dict_of_collections: dict = None,
     ):
-        dict_ = dict()
-        for type_key, type_class in subtypes_table.items():
-            list_of_values_filetered = list(
-                filter(lambda item: item[TYPE_LABEL] == type_key, list_of_values)
-            )
-            dict_.update(
-                self._load_list(
-                    list_of_values=list_of_values_filetered,
-                    typ=type_class,
-                    dict_of_collections=dict_of_collections,
-                )
-            )
-        return dict_
-
-    def load_session(self, session: dict):
-        if session.get("vessels"):
-            self.vessels.update(
-                self._load_list_multiple_types(
-                    session["vessels"],
-                    subtypes_table={typ.__name__: typ for typ in [Monohull, Catamaran]},
-                )
-            )
-        if session.get("matrices"):
-            self.matrices.update(self._load_list(session["matrices"], Matrix))
-        if session.get("fibers"):
-            self.fibers.update(self._load_list(session["fibers"], Fiber))
-        if session.get("laminas"):
-            self.laminas.update(
-                self._load_list(
-                    session["laminas"],
-                    Lamina,
-                    dict_of_collections=self.session_dict,
-                )
-            )
-        if session.get("core_materials"):
-            self.core_materials.update(
-                self._load_list(session["core_materials"], CoreMat)
-            )
-        if session.get("cores"):
-            self.cores.update(
-                self._load_list(
-                    session["cores"], Core, dict_of_collections=self.session_dict
-                )
-            )
-        if session.get("laminates"):
-            self.laminates.update(
-                self._load_list_multiple_types(
-                    list_of_values=session["laminates"],
-                    subtypes_table={
-                        typ.__name__: typ
-                        for typ in [SingleSkinLaminate, SandwichLaminate]
-                    },
-                    dict_of_collections=self.session_dict,
-                )
-            )
-        if session.get("stiffener_sections"):
-            self.stiffener_sections.update(
-                self._load_list(
-                    list_of_values=session["stiffener_sections"],
-                    typ=StiffenerSectionWithFoot,
-                    dict_of_collections=self.session_dict,
-                )
-            )
-        if session.get("stiffener_elements"):
-            self.stiffener_elements.update(
-                self._load_list(
-                    list_of_values=session["stiffener_elements"],
-                    typ=StructuralElement,
-                    dict_of_collections=self.session_dict,
-                )
+        """Entities of the subtypes given by their TYPE_LABEL, in one pass over
+        the list. Entities of other types are skipped.
+        """
+        builders = {key: constructor(typ) for key, typ in subtypes_table.items()}
+        collections = dict_of_collections or {}
+        return {
+            value["name"]: builders[value[TYPE_LABEL]](value, collections)
+            for value in list_of_values
+            if value[TYPE_LABEL] in builders
+        }
+
+    def _load_collection(
+        self, list_of_values: list[dict], types: type | dict, dict_of_collections: dict
+    ):
+        if isinstance(types, dict):
+            return self._load_list_multiple_types(
+                list_of_values, types, dict_of_collections
             )
-        if session.get("panels"):
-            self.panels.update(
-                self._load_list(
-                    list_of_values=session["panels"],
-                    typ=StructuralElement,
-                    dict_of_collections=self.session_dict,
-                )
+        return self._load_list(list_of_values, types, dict_of_collections)
+
+    def _deserialize(self, types: type | dict[str, type], value: dict):
+        typ = types[value[TYPE_LABEL]] if isinstance(types, dict) else types
+        return constructor(typ)(value, self.session_dict)
+
+    def _load_lazy(self, session: dict):
+        for name, types in COLLECTION_TYPES.items():
+            if not session.get(name):
+                continue
+            collection = getattr(self, name)
+            if not isinstance(collection, LazyCollection):
+                collection = LazyCollection(collection)
+                setattr(self, name, collection)
+            collection.defer(
+                {value["name"]: value for value in session[name]},
+                partial(self._deserialize, types),
             )
 
-    def load_json(self, f):
+    def load_session(self, session: dict, lazy: bool = False, intern: bool = False):
+        """Loads the collections of a serialized session. If lazy, entities
+        are kept serialized and built the first time they're accessed, along
+        with the entities they reference. If intern, content identical
+        entities are then merged (see intern), building every entity.
+        """
+        self._reset_dependencies()
+        if lazy:
+            self._load_lazy(session)
+        else:
+            # Collections are updated in place, so their dict is built once
+            collections = self.session_dict
+            for name, types in COLLECTION_TYPES.items():
+                if session.get(name):
+                    collections[name].update(
+                        self._load_collection(session[name], types, collections)
+                    )
+        if intern:
+            self.intern()
+
+    def intern(self) -> InternReport:
+        """Makes the session's entities share one instance of content
+        identical named entities, keeping their names, and the other content
+        identical entities share their persistent values, see
+        interning.intern_entities.
+        """
+        report = intern_entities(self.session_dict.values())
+        self._reset_dependencies()
+        return report
+
+    def load_json(self, f, lazy: bool = False, intern: bool = False):
         """Loads a json file from a IO stream"""
         d = load(f)
-        self.load_session(d)
+        self.load_session(d, lazy=lazy, intern=intern)
 
-    def loads_json(self, string):
+    def loads_json(self, string, lazy: bool = False, intern: bool = False):
         """Loads a json string"""
         d = loads(string)
-        self.load_session(d)
+        self.load_session(d, lazy=lazy, intern=intern)
+
+    def _load_session_file(self, session_file: SessionFile, lazy: bool):
+        """Loads a binary session file's collections, building the entities
+        of each table from its columns, with no dict per entity, unless lazy.
+        """
+        if lazy:
+            self.load_session(session_file.to_dict(), lazy=True)
+            return
+        self._reset_dependencies()
+        collections = self.session_dict
+        with gc_paused():
+            for name, types in COLLECTION_TYPES.items():
+                if name not in session_file.header["collections"]:
+                    continue
+                if isinstance(types, dict):
+                    build = subtype_column_constructor(types, TYPE_LABEL)
+                else:
+                    build = column_constructor(types)
+                count = session_file.header["collections"][name]["count"]
+                names = [None] * count
+                entities = [None] * count
+                # Nested values are shared, as they're built into new entities
+                for positions, columns in session_file.tables(name, shared=True):
+                    built = build(columns, len(positions), collections)
+                    for position, key, entity in zip(positions, columns["name"], built):
+                        names[position] = key
+                        entities[position] = entity
+                collections[name].update(
+                    (key, entity)
+                    for key, entity in zip(names, entities)
+                    if entity is not None
+                )
+
+    def load_binary(self, file_name: str = "session.bin", lazy: bool = False):
+        """Loads a binary session file, see binary.SessionFile."""
+        self._load_session_file(SessionFile(file_name), lazy)
+
+    def loads_binary(self, data: bytes, lazy: bool = False):
+        """Loads a binary session from bytes."""
+        self._load_session_file(SessionFile(data), lazy)
+
+    def _stream(self, f, chunk_size: int) -> Iterator[tuple[str, str, object]]:
+        self._reset_dependencies()
+        for collection, value in iter_entities(f, chunk_size):
+            if collection in COLLECTION_TYPES:
+                entity = self._deserialize(COLLECTION_TYPES[collection], value)
+                yield collection, value["name"], entity
+
+    def load_json_stream(self, f, chunk_size: int = CHUNK_SIZE):
+        """Loads a json file from a IO stream entity by entity, reading
+        chunk_size characters at a time. References are resolved against the
+        entities already loaded, so referenced collections must come first, as
+        in the files written by dump_json.
+        """
+        for collection, name, entity in self._stream(f, chunk_size):
+            getattr(self, collection)[name] = entity
+
+    def iter_rule_checks(
+        self, f, chunk_size: int = CHUNK_SIZE, elements_per_check: int = 100
+    ) -> Iterator[pd.DataFrame]:
+        """Streams a json file as load_json_stream does, except for the
+        structural elements, which are rule checked and discarded as they're
+        read. Yields the rule check of every elements_per_check elements of a
+        collection, so at most that many elements are held at a time.
+        """
+        group = []
+        group_collection = None
+        for collection, name, entity in self._stream(f, chunk_size):
+            if collection not in ELEMENT_COLLECTIONS:
+                getattr(self, collection)[name] = entity
+                continue
+            if group and (
+                collection != group_collection or len(group) == elements_per_check
+            ):
+                yield pd.concat([elmt.rule_check for elmt in group], ignore_index=True)
+                group = []
+            group_collection = collection
+            group.append(entity)
+        if group:
+            yield pd.concat([elmt.rule_check for elmt in group], ignore_index=True)
+
+    @cached_property
+    def dependencies(self) -> DependencyGraph:
+        """Reference graph of the session's entities, rebuilt after add_stuff
+        and load_session. Builds every entity of a lazily loaded session.
+        """
+        return DependencyGraph(self.session_dict.values())
+
+    def _reset_dependencies(self):
+        self.__dict__.pop("dependencies", None)
+
+    def _mark_dirty(self, affected: list) -> list[StructuralElement]:
+        elements = [item for item in affected if isinstance(item, StructuralElement)]
+        self._dirty.update({id(element): element for element in elements})
+        return elements
+
+    def update(self, item, **changes) -> list[StructuralElement]:
+        """Sets fields of a session entity, e.g. a fiber's modulus_x or a
+        core's thickness, and clears the cached values of everything depending
+        on it. Returns the affected structural elements, which are marked
+        dirty.
+        """
+        return self._mark_dirty(self.dependencies.update(item, **changes))
+
+    def invalidate(self, item) -> list[StructuralElement]:
+        """Same as update, for an entity already edited in place."""
+        return self._mark_dirty(self.dependencies.invalidate(item))
+
+    def recompute_dirty(self) -> pd.DataFrame:
+        """Rule checks of the elements affected by updates since the last
+        call, panels first.
+        """
+        dirty = [
+            element
+            for element in chain(self.panels.values(), self.stiffener_elements.values())
+            if id(element) in self._dirty
+        ]
+        self._dirty.clear()
+        if not dirty:
+            return pd.DataFrame()
+        return pd.concat([element.rule_check for element in dirty], ignore_index=True)
 
     def laminates_resume(self):
         """Resume of laminates properties."""
@@ -283,13 +428,21 @@ class Session:
             df = pd.concat([df, stiff.resume], ignore_index=True)
         return df
 
-    def panels_rule_check(self):
+    def panels_rule_check(self, cache: Optional[RuleCheckCache] = None):
+        """Rule checks of the panels. With a cache, only the panels whose
+        inputs aren't in it are checked.
+        """
+        if cache is not None:
+            return cache.rule_check(self.panels.values())
         df = pd.DataFrame()
         for panel in self.panels.values():
             df = pd.concat([df, panel.rule_check], ignore_index=True)
         return df
 
-    def stiffeners_rule_check(self):
+    def stiffeners_rule_check(self, cache: Optional[RuleCheckCache] = None):
+        """Rule checks of the stiffeners, see panels_rule_check."""
+        if cache is not None:
+            return cache.rule_check(self.stiffener_elements.values())
         df = pd.DataFrame()
         for stifferner in self.stiffener_elements.values():
             df = pd.concat([df, stifferner.rule_check], ignore_index=True)
@@ -303,6 +456,22 @@ class Session:
             for key, values in serialize_dataclass(self).items()
         }
 
+    @property
+    def _binary_tables(self) -> dict[str, list[tuple[list[int], dict[str, list]]]]:
+        """Serialized columns of the collections' entities, as
+        _pre_process_json serializes them, see bulk.serialized_tables.
+        """
+        tables = {}
+        with gc_paused():
+            for field_ in fields(self):
+                options = field_.metadata.get(DESERIALIZER_OPTIONS)
+                type_label = TYPE_LABEL if options and options.add_type else None
+                if options and options.type_label:
+                    type_label = options.type_label
+                entities = list(getattr(self, field_.name).values())
+                tables[field_.name] = serialized_tables(entities, type_label)
+        return tables
+
     def dump_json(self, file_name: str = "session.json"):
         """Dumps session to a json file.
         file_name = file path/name to write to.
@@ -315,3 +484,16 @@ class Session:
         """Dumps session to a json str."""
 
         return dumps(self._pre_process_json)
+
+    def dump_binary(self, file_name: str = "session.bin"):
+        """Dumps session to a binary file, whose numeric element data can
+        be memory mapped with binary.SessionFile.
+        """
+        with open(file_name, "wb") as f:
+            write_tables(self._binary_tables, f)
+
+    def dumps_binary(self) -> bytes:
+        """Dumps session to binary session bytes."""
+        f = BytesIO()
+        write_tables(self._binary_tables, f)
+        return f.getvalue()
@@ -0,0 +1,199 @@
+"""
+Stiffener section sizing.
+
+Searches profile dimensions and laminates for the lightest stiffener section
+(linear density) that passes the C3.8.4 stiffener checks - deflection, top
+and bottom linear strains, web shear strain and shear buckling - for a given
+span, spacings, attached plates and design pressure.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from itertools import product
+from typing import Optional
+
+import pandas as pd
+
+from .composites import Laminate
+from .elements import StructuralElement
+from .hashing import content_hash
+from .stiffeners import LBar, Stiffener, StiffenerSectionWithFoot
+
+# Criteria depending only on the profile's web
+WEB_CRITERIA = ["shear_strain_ratio", "shear_strain_buckling_ratio"]
+
+
+def _web_key(section: StiffenerSectionWithFoot) -> tuple:
+    """Inputs of the web criteria: the web rectangles, whose shear stiffness
+    gives the shear strain, and the web laminate and dimension giving the
+    shear buckling strain. Profiles such as Box have webs shortened by the
+    flange, so the web rectangles aren't given by the web inputs alone.
+    """
+    rects = section.rects
+    web = rects.web.astype(bool)
+    profile = section.elmt_container
+    return (
+        rects.width[web].tobytes(),
+        rects.height[web].tobytes(),
+        rects.modulus_shear[web].tobytes(),
+        content_hash(profile.laminate_web),
+        profile.dimension_web,
+    )
+
+
+def _profile_name(profile: type, inputs: dict) -> str:
+    dimensions = "x".join(
+        f"{inputs[name] * 1000:.0f}"
+        for name in ["dimension_web", "dimension_flange"]
+        if name in inputs
+    )
+    laminates = "/".join(
+        inputs[name].name
+        for name in ["laminate_web", "laminate_flange"]
+        if name in inputs
+    )
+    return f"{profile.__name__} {dimensions} {laminates}"
+
+
+@dataclass
+class SectionSizing:
+    """Sizing of a stiffener's section over the parameter space given by the
+    web and flange dimensions (m) and laminates. Profile inputs other than
+    those (e.g. ClosedU's laminate_flange_lower) are taken from profile_inputs.
+    Flange lists default to the web ones and are ignored by profiles without a
+    flange (FlatBar).
+    Candidates are checked in ascending linear density and the search stops at
+    the first one passing all criteria, so candidates heavier than the optimum
+    are never evaluated. Web shear strain and shear buckling depend only on
+    the web, so once a web fails them, every other candidate with the same web
+    geometry and laminate is pruned.
+    """
+
+    stiffener: Stiffener
+    pressure: float
+    dimensions_web: list[float]
+    laminates_web: list[Laminate]
+    profile: type = LBar
+    dimensions_flange: Optional[list[float]] = None
+    laminates_flange: Optional[list[Laminate]] = None
+    profile_inputs: dict = field(default_factory=dict)
+
+    @property
+    def candidates(self) -> list[StiffenerSectionWithFoot]:
+        """Candidate sections, sorted by linear density."""
+        space = {
+            "dimension_web": self.dimensions_web,
+            "laminate_web": self.laminates_web,
+            "dimension_flange": self.dimensions_flange or self.dimensions_web,
+            "laminate_flange": self.laminates_flange or self.laminates_web,
+        }
+        names = {field_.name for field_ in fields(self.profile)}
+        space = {name: values for name, values in space.items() if name in names}
+        sections = []
+        for values in product(*space.values()):
+            inputs = dict(zip(space, values))
+            sections.append(
+                StiffenerSectionWithFoot(
+                    self.profile(
+                        **self.profile_inputs,
+                        **inputs,
+                        name=_profile_name(self.profile, inputs),
+                    )
+                )
+            )
+        return sorted(sections, key=lambda section: section.linear_density)
+
+    def check(self, section: StiffenerSectionWithFoot) -> dict:
+        """Criteria ratios of the stiffener with the given section."""
+        criteria = replace(self.stiffener, stiff_section=section).criteria(
+            self.pressure
+        )
+        ratios = {name: value.ratio for name, value in criteria.items()}
+        governing = min(ratios, key=ratios.get)
+        return {
+            "section": section.name,
+            "linear_density": section.linear_density,
+            **ratios,
+            "governing_criteria": governing,
+            "min_ratio": ratios[governing],
+        }
+
+    def _checked(self, prune: bool = True):
+        failed_webs = set()
+        for section in self.candidates:
+            web = _web_key(section) if prune else None
+            if web in failed_webs:
+                continue
+            result = self.check(section)
+            if prune and min(result[name] for name in WEB_CRITERIA) < 1:
+                failed_webs.add(web)
+            yield section, result
+
+    def evaluate(self, exhaustive: bool = False) -> pd.DataFrame:
+        """Checked candidates in ascending linear density, pruned ones left
+        out. If exhaustive, every candidate is checked, without pruning,
+        instead of stopping at the first passing one.
+        """
+        results = []
+        for _, result in self._checked(prune=not exhaustive):
+            results.append(result)
+            if not exhaustive and result["min_ratio"] >= 1:
+                break
+        return pd.DataFrame(results)
+
+    @property
+    def optimum(self) -> Optional[StiffenerSectionWithFoot]:
+        """Lightest passing section, None if no candidate passes."""
+        return next(
+            (
+                section
+                for section, result in self._checked()
+                if result["min_ratio"] >= 1
+            ),
+            None,
+        )
+
+
+def _optimum(sizing: SectionSizing) -> Optional[StiffenerSectionWithFoot]:
+    return sizing.optimum
+
+
+def size_sections(
+    sizings: list[SectionSizing], max_workers: Optional[int] = None
+) -> list[Optional[StiffenerSectionWithFoot]]:
+    """Optimum section of each sizing, in parallel processes unless
+    max_workers is 1.
+    """
+    if max_workers == 1:
+        return [_optimum(sizing) for sizing in sizings]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_optimum, sizings))
+
+
+def stiffener_schedule(
+    elements: list[StructuralElement],
+    max_workers: Optional[int] = None,
+    **space,
+) -> pd.DataFrame:
+    """Sizes the section of every stiffener element at its design pressure.
+    space holds the SectionSizing search parameters (dimensions_web,
+    laminates_web, profile...).
+    """
+    elements = [elmt for elmt in elements if isinstance(elmt.model, Stiffener)]
+    sizings = [
+        SectionSizing(stiffener=elmt.model, pressure=elmt.design_pressure, **space)
+        for elmt in elements
+    ]
+    optima = size_sections(sizings, max_workers=max_workers)
+    return pd.DataFrame(
+        [
+            {
+                "name": elmt.name,
+                "design_pressure": elmt.design_pressure,
+                "current_section": elmt.model.stiff_section.name,
+                "current_linear_density": elmt.model.stiff_section.linear_density,
+                **(sizing.check(optimum) if optimum is not None else {"section": None}),
+            }
+            for elmt, sizing, optimum in zip(elements, sizings, optima)
+        ]
+    )
@@ -4,8 +4,11 @@ Created on Wed Mar 31 12:28:58 2021
 
 @author: ruy
 """
+
 import abc
-from dataclasses import astuple, dataclass, field, fields
+import builtins
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, replace
 from itertools import chain
 from functools import cached_property as property
 
@@ -38,96 +41,117 @@ from .common_field_options import (
     STIFF_ATT_PLATE_OPTIONS,
 )
 from .composites import Laminate, SandwichLaminate, SingleSkinLaminate
+from .persistent import persistent_property
 from .structural_model import BoundaryCondition, StructuralModel
 
 
-class DimensionalData:
+class Vector2D:
+    """y and z components - floats or numpy arrays - with element-wise
+    arithmetic. The other operand is a vector or anything broadcasting against
+    both components (number or array).
+    """
+
+    __slots__ = ("y", "z")
+    # numpy operands defer to the vector's reflected operators
+    __array_ufunc__ = None
+
+    def __init__(self, y, z):
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def stack(cls, vectors):
+        """Single vector with the components of the given ones stacked along a
+        new first axis, e.g. points to arrays of coordinates.
+        """
+        vectors = list(vectors)
+        components = np.broadcast_arrays(*chain.from_iterable(vectors))
+        return cls(np.array(components[::2]), np.array(components[1::2]))
+
+    def to_array(self) -> np.ndarray:
+        """Components stacked along a new first axis (y, z)."""
+        return np.array(np.broadcast_arrays(self.y, self.z))
+
+    def sum(self, axis=None):
+        """Sum of the components of a stacked vector."""
+        return self.__class__(np.sum(self.y, axis=axis), np.sum(self.z, axis=axis))
+
+    @staticmethod
+    def _components(other):
+        if isinstance(other, Vector2D):
+            return other.y, other.z
+        return other, other
+
     def __add__(self, other):
-        return self.__class__(
-            *(
-                getattr(self, dim.name) + getattr(other, dim.name)
-                for dim in fields(self)
-            )
-        )
+        y, z = self._components(other)
+        return self.__class__(self.y + y, self.z + z)
+
+    __radd__ = __add__
 
     def __sub__(self, other):
-        return self.__class__(
-            *(
-                getattr(self, dim.name) - getattr(other, dim.name)
-                for dim in fields(self)
-            )
-        )
+        y, z = self._components(other)
+        return self.__class__(self.y - y, self.z - z)
+
+    def __rsub__(self, other):
+        y, z = self._components(other)
+        return self.__class__(y - self.y, z - self.z)
 
     def __mul__(self, other):
-        # waiting for numpy to be avaliable for python 3.10 to use pattern matching
-        if isinstance(other, self.__class__):
-            return self.__class__(
-                *(
-                    getattr(self, dim.name) * getattr(other, dim.name)
-                    for dim in fields(self)
-                )
-            )
-        else:
-            try:
-                other = float(other)
-            except ValueError:
-                raise TypeError(
-                    f"unsupported operand type(s) for *: '{type(self).__name__}' and '{type(other).__name__}'"
-                )
-            return self.__class__(
-                *(getattr(self, dim.name) * other for dim in fields(self))
-            )
+        y, z = self._components(other)
+        return self.__class__(self.y * y, self.z * z)
 
-    def __rmul__(self, other):
-        return self.__mul__(other)
+    __rmul__ = __mul__
 
     def __truediv__(self, other):
-        # waiting for numpy to be avaliable for python 3.10 to use pattern matching
-        if isinstance(other, self.__class__):
-            return self.__class__(
-                *(
-                    getattr(self, dim.name) / getattr(other, dim.name)
-                    for dim in fields(self)
-                )
-            )
-        else:
-            try:
-                other = float(other)
-            except ValueError:
-                raise TypeError(
-                    f"unsupported operand type(s) for *: '{type(self).__name__}' and '{type(other).__name__}'"
-                )
-            return self.__class__(
-                *(getattr(self, dim.name) / other for dim in fields(self))
-            )
+        y, z = self._components(other)
+        return self.__class__(self.y / y, self.z / z)
 
     def __rtruediv__(self, other):
-        return self.__truediv__(other)
+        y, z = self._components(other)
+        return self.__class__(y / self.y, z / self.z)
+
+    def __neg__(self):
+        return self.__class__(-self.y, -self.z)
 
     def __iter__(self):
-        return iter(astuple(self))
+        yield self.y
+        yield self.z
 
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.y, self.z) == (other.y, other.z)
 
-@dataclass
-class Point2D(DimensionalData):
-    y: float
-    z: float
+    def __hash__(self):
+        return hash((self.__class__, self.y, self.z))
 
+    def __repr__(self):
+        return f"{self.__class__.__name__}(y={self.y!r}, z={self.z!r})"
 
-@dataclass
-class Inertia(DimensionalData):
+    def __reduce__(self):
+        return self.__class__, (self.y, self.z)
+
+
+# Former dataclass based name
+DimensionalData = Vector2D
+
+
+class Point2D(Vector2D):
+    """Point or vector in the section's plane (m)."""
+
+    __slots__ = ()
+
+
+class Inertia(Vector2D):
     """Container class for 2D section's moments of inertia (m4)."""
 
-    y: float
-    z: float
+    __slots__ = ()
 
 
-@dataclass
-class BendStiff(DimensionalData):
+class BendStiff(Vector2D):
     """Container class for 2D section's bending stiffness (kN m2)."""
 
-    y: float
-    z: float
+    __slots__ = ()
 
 
 def _coord_transform(position: Point2D, angle: float) -> Point2D:
@@ -140,6 +164,10 @@ def _coord_transform(position: Point2D, angle: float) -> Point2D:
 
 
 class SectionElement(abc.ABC):
+    """Angles in degrees. Methods taking an angle also accept an array of
+    angles, returning arrays of the same shape.
+    """
+
     @abc.abstractmethod
     def bend_stiff(self, angle=0) -> BendStiff:
         """Bending stiffness with respect to y (main)
@@ -185,8 +213,9 @@ class SectionElement(abc.ABC):
     def limit_z_anchor_pt(self, angle: float = 0) -> list[float]:
         return [pt.z for pt in self.limit_z_points(angle=angle)]
 
-    def limit_z_center(self, angle: float = 0) -> list[float]:
-        return self.limit_z_anchor_pt(angle) - self.center(angle).z
+    def limit_z_center(self, angle: float = 0) -> np.ndarray:
+        """Extreme fibres' z distances to the centroid."""
+        return np.array(self.limit_z_anchor_pt(angle)) - self.center(angle).z
 
     def linear_strain(self, bend_moment: float, angle: float = 0):
         bend_stiff = self.bend_stiff(angle=angle).y
@@ -264,9 +293,11 @@ class RectSectionElement(HomogeneousSectionElement):
         return [_coord_transform(corner, angle) for corner in corners]
 
     def limit_z_points(self, angle=0) -> list[Point2D]:
-        z = np.array([pt.z for pt in self._corners(angle=angle)])
-        indexes = [np.argmin(z), np.argmax(z)]
-        return [self._corners(angle)[i] for i in indexes]
+        y, z = Point2D.stack(self._corners(angle=angle))
+        return [
+            Point2D(*(_take(coords, index[None], axis=0) for coords in (y, z)))
+            for index in [np.argmin(z, axis=0), np.argmax(z, axis=0)]
+        ]
 
     def center(self, angle=0) -> Point2D:
         return _coord_transform(Point2D(0, self.height / 2), angle)
@@ -377,6 +408,204 @@ class Elmt(SectionElement):
         return self.sect_elmt.linear_density
 
 
+def _take(array: np.ndarray, index: np.ndarray, axis: int):
+    """Single value along axis, picked by index, as in np.take_along_axis."""
+    return np.squeeze(np.take_along_axis(array, index, axis=axis), axis=axis)[()]
+
+
+def _angle_axis(angle, ndim: int = 1) -> np.ndarray:
+    """angle with ndim trailing axes, to broadcast against rectangle arrays."""
+    return np.asarray(angle, dtype=float)[(...,) + (None,) * ndim]
+
+
+def _rotate(y, z, angle):
+    """Array counterpart of _coord_transform, (y, z) coordinates in the
+    coordinate system rotated by angle (degrees).
+    """
+    rad = np.radians(angle)
+    sin = np.sin(rad)
+    cos = np.cos(rad)
+    return -sin * z + cos * y, cos * z + sin * y
+
+
+def _rect_row(elmt: Elmt) -> tuple:
+    """(width, height, anchor y, anchor z, angle, E, G, density, web) of a
+    placed rectangular element.
+    """
+    sect_elmt = elmt.sect_elmt
+    return (
+        sect_elmt.width,
+        sect_elmt.height,
+        elmt.anchor_pt.y,
+        elmt.anchor_pt.z,
+        elmt.angle,
+        sect_elmt.laminate.modulus_x,
+        sect_elmt.laminate.modulus_xy,
+        sect_elmt.density,
+        elmt.web,
+    )
+
+
+@dataclass
+class RectArrays:
+    """Rectangular elements of a section compiled into arrays, one entry per
+    rectangle. Anchor points (mid width of the rectangle's base) and angles
+    are in the section's coordinate system, with nested placed sections
+    flattened. Section properties are NumPy reductions over the rectangles,
+    broadcast over arrays of angles.
+    """
+
+    width: np.ndarray
+    height: np.ndarray
+    anchor_y: np.ndarray
+    anchor_z: np.ndarray
+    angle: np.ndarray
+    modulus: np.ndarray
+    modulus_shear: np.ndarray
+    density: np.ndarray
+    web: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple]) -> "RectArrays":
+        return cls(*(np.array(column) for column in zip(*rows)))
+
+    @classmethod
+    def from_elmts(cls, elmts: list[Elmt]) -> "RectArrays":
+        """Nested sections (e.g. PlacedStiffnerSection) reuse their own
+        compiled arrays, placed in this section's coordinate system.
+        """
+        parts = []
+        rows = []
+        for elmt in elmts:
+            if isinstance(elmt.sect_elmt, RectSectionElement):
+                rows.append(_rect_row(elmt))
+                continue
+            if rows:
+                parts.append(cls.from_rows(rows))
+                rows = []
+            parts.append(
+                elmt.sect_elmt.rects.placed(elmt.anchor_pt, elmt.angle, elmt.web)
+            )
+        if rows:
+            parts.append(cls.from_rows(rows))
+        return cls.concatenate(parts)
+
+    @classmethod
+    def concatenate(cls, parts: list["RectArrays"]) -> "RectArrays":
+        if len(parts) == 1:
+            return parts[0]
+        return cls(
+            *(
+                np.concatenate([getattr(part, field_.name) for part in parts])
+                for field_ in fields(cls)
+            )
+        )
+
+    def placed(self, anchor: Point2D, angle: float = 0, web: bool = True):
+        """Rectangles in the coordinate system of a section in which this one is
+        placed at anchor, rotated by angle. Only web rectangles of a web
+        element count as web.
+        """
+        y, z = _rotate(self.anchor_y, self.anchor_z, angle)
+        return replace(
+            self,
+            anchor_y=anchor.y + y,
+            anchor_z=anchor.z + z,
+            angle=self.angle + angle,
+            web=self.web & web,
+        )
+
+    @property
+    def content_key(self) -> tuple:
+        """Hashable key of the rectangles' values."""
+        return tuple(getattr(self, field_.name).tobytes() for field_ in fields(self))
+
+    @property
+    def area(self) -> np.ndarray:
+        return self.width * self.height
+
+    @property
+    def stiffs(self) -> np.ndarray:
+        return self.area * self.modulus
+
+    @property
+    def stiff(self) -> float:
+        return np.sum(self.stiffs)
+
+    @property
+    def shear_stiff(self) -> float:
+        return np.sum(self.area * self.modulus_shear * self.web)
+
+    @property
+    def linear_density(self) -> float:
+        return np.sum(self.area * self.density)
+
+    @property
+    def centers(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rectangles' centroids (y, z) in the section's coordinate system."""
+        y, z = _rotate(0, self.height / 2, self.angle)
+        return self.anchor_y + y, self.anchor_z + z
+
+    @property
+    def corners(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rectangles' corners (y, z), shape (n, 4), in the section's
+        coordinate system.
+        """
+        half_width = self.width[:, None] / 2
+        height = self.height[:, None]
+        y = np.hstack([half_width, half_width, -half_width, -half_width])
+        z = np.hstack([0 * height, height, height, 0 * height])
+        y, z = _rotate(y, z, self.angle[:, None])
+        return self.anchor_y[:, None] + y, self.anchor_z[:, None] + z
+
+    def center(self, angle=0) -> Point2D:
+        y, z = self.centers
+        stiffs = self.stiffs
+        center = _rotate(y @ stiffs / self.stiff, z @ stiffs / self.stiff, angle)
+        return Point2D(*center)
+
+    def inertia(self, angle=0) -> Inertia:
+        """Rectangles' moments of inertia about their own centroids, shape
+        angle.shape + (n,).
+        """
+        rad = np.radians(_angle_axis(angle) + self.angle)
+        sin2 = np.sin(rad) ** 2
+        cos2 = np.cos(rad) ** 2
+        width, height = self.width, self.height
+        return Inertia(
+            width * height * (height**2 * cos2 + width**2 * sin2) / 12,
+            width * height * (width**2 * cos2 + height**2 * sin2) / 12,
+        )
+
+    def bend_stiff_base(self, angle=0) -> BendStiff:
+        y, z = _rotate(*self.centers, _angle_axis(angle))
+        inertia = self.inertia(angle)
+        stiffs = self.stiffs
+        # y and z switched due to moment of inertia defintion
+        return BendStiff(
+            (inertia.y @ self.modulus + z**2 @ stiffs)[()],
+            (inertia.z @ self.modulus + y**2 @ stiffs)[()],
+        )
+
+    def bend_stiff(self, angle=0) -> BendStiff:
+        bend_stiff_base = self.bend_stiff_base(angle)
+        center = self.center(angle)
+        return BendStiff(
+            bend_stiff_base.y - self.stiff * center.z**2,
+            bend_stiff_base.z - self.stiff * center.y**2,
+        )
+
+    def limit_z_points(self, angle=0) -> list[Point2D]:
+        y, z = (
+            coords.reshape(*coords.shape[:-2], -1)
+            for coords in _rotate(*self.corners, _angle_axis(angle, ndim=2))
+        )
+        return [
+            Point2D(*(_take(coords, index[..., None], axis=-1) for coords in (y, z)))
+            for index in [np.argmin(z, axis=-1), np.argmax(z, axis=-1)]
+        ]
+
+
 class SectionElementList(abc.ABC):
     @abc.abstractproperty
     def elmts(self) -> list[Elmt]:
@@ -423,40 +652,34 @@ class StiffenerSection(SectionElement):
     def web(self) -> list[Elmt]:
         return filter(lambda elmt: elmt.web, self.elmts)
 
+    @persistent_property
+    def rects(self) -> RectArrays:
+        """Section geometry compiled into arrays of rectangles."""
+        return RectArrays.from_elmts(self.elmts)
+
     @property
     def stiff(self):
-        return np.sum([elmt.sect_elmt.stiff for elmt in self.elmts])
+        return self.rects.stiff
 
     def limit_z_points(self, angle=0) -> list[Point2D]:
-        z__limts = np.array([elmt.limit_z_anchor_pt(angle) for elmt in self.elmts])
-        z__limts = z__limts.reshape(2, len(z__limts))
-        z_limit_points = [elmt.limit_z_points(angle) for elmt in self.elmts]
-        idx = [np.argmin(z__limts[0]), np.argmax(z__limts[1])]
-        return [z_limit_points[i][j] for j, i in enumerate(idx)]
+        return self.rects.limit_z_points(angle)
 
     def center(self, angle=0) -> Point2D:
-        return (
-            np.sum([elmt.center(angle) * elmt.sect_elmt.stiff for elmt in self.elmts])
-            / self.stiff
-        )
+        return self.rects.center(angle)
 
     def bend_stiff_base(self, angle=0) -> BendStiff:
-        return BendStiff(*np.sum([elmt.bend_stiff_base(angle) for elmt in self.elmts]))
+        return self.rects.bend_stiff_base(angle)
 
     def bend_stiff(self, angle=0) -> BendStiff:
-        bend_stiff_base = self.bend_stiff_base(angle)
-        center = self.center(angle)
-        bend_stiff_y = bend_stiff_base.y - self.stiff * center.z**2
-        bend_stiff_z = bend_stiff_base.z - self.stiff * center.y**2
-        return BendStiff(bend_stiff_y, bend_stiff_z)
+        return self.rects.bend_stiff(angle)
 
     @property
     def shear_stiff(self):
-        return np.sum([elmt.sect_elmt.shear_stiff for elmt in self.web])
+        return self.rects.shear_stiff
 
     @property
     def linear_density(self) -> float:
-        return sum([elmt.linear_density for elmt in self.elmts])
+        return self.rects.linear_density
 
     @property
     def resume(self):
@@ -919,7 +1142,7 @@ class Box(SectionElementListWithFoot):
                     SectionElmtRectVert(self.laminate_web, dimension),
                     web=True,
                     anchor_pt=Point2D(
-                        self.dimension_flange / 2 - self.thickness,
+                        self.dimension_flange / 2 - self.laminate_web.thickness,
                         self.laminate_flange.thickness,
                     ),
                 ),
@@ -1114,6 +1337,67 @@ class PlacedStiffnerSection(SectionElementList):
         ]
 
 
+@dataclass
+class SectionCache:
+    """Content keyed cache of sections composed of section element lists,
+    e.g. stiffener profiles with their attached plates. Sections with the same
+    compiled rectangles share one StiffenerSection, so its cached properties
+    are computed once. Nested profiles reuse their own compiled arrays, so
+    only the attached plates are compiled on each lookup.
+    At most max_size sections are kept, the least recently used ones being
+    evicted, so sizing sweeps and layout searches don't grow it without bound.
+    """
+
+    max_size: int = 1024
+    sections: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def section(self, elmt_lists: list[SectionElementList]) -> StiffenerSection:
+        parts = [RectArrays.from_elmts(elmt_list.elmts) for elmt_list in elmt_lists]
+        key = tuple(part.content_key for part in parts)
+        if key in self.sections:
+            self.hits += 1
+            self.sections.move_to_end(key)
+            return self.sections[key]
+        self.misses += 1
+        section = StiffenerSection(SectionElementListChain(elmt_lists))
+        # Already compiled, overrides the cached property
+        section.rects = RectArrays.concatenate(parts)
+        self.sections[key] = section
+        while len(self.sections) > self.max_size:
+            self.sections.popitem(last=False)
+            self.evictions += 1
+        return section
+
+    # Counters change with each lookup, so these aren't cached
+    @builtins.property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @builtins.property
+    def stats(self) -> dict:
+        return {
+            "size": len(self.sections),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self):
+        self.sections.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# Stiffener sections with attached plates
+ATT_PLATE_SECTIONS = SectionCache()
+
+
 STIFF_SECTION_OPTIONS = DeSerializerOptions(
     subs_by_attr="name",
     subs_collection_name="stiffener_sections",
@@ -1121,6 +1405,28 @@ STIFF_SECTION_OPTIONS = DeSerializerOptions(
 )
 
 
+# C3.8.4 attached plate effective width ratio by length between moments / spacing
+EFF_WIDTH_XP = list(range(10))
+EFF_WIDTH_FP = [0, 0.36, 0.64, 0.82, 0.91, 0.96, 0.98, 0.993, 0.998, 1]
+LENGTH_BET_MOM_FACTOR = {
+    BoundaryCondition.FIXED: 0.4,
+    BoundaryCondition.SIMPLY_SUPPORTED: 1,
+}
+BOUND_COND_COEF_BEND = {
+    BoundaryCondition.FIXED: 12.0,
+    BoundaryCondition.SIMPLY_SUPPORTED: 8.0,
+}
+BOUND_COND_COEF_DEFLECTION = {
+    BoundaryCondition.FIXED: 1,
+    BoundaryCondition.SIMPLY_SUPPORTED: 5,
+}
+# TODO get safety factos from config and strain limits from laminate properties
+STRAIN_LINEAR_LIMIT = 0.0105
+STRAIN_SHEAR_LIMIT = 0.021
+STRAIN_SAFETY_FACTOR = 3
+SPAN_DEFLECTION_FACTOR = 0.05
+
+
 @dataclass
 class Stiffener:
     """Stiffener beam model, in accordance to C3.8.2.6 and C3.8.4,
@@ -1164,15 +1470,21 @@ class Stiffener:
     def area(self):
         return self.span * self.spacing
 
+    @property
+    def mass(self):
+        """Stiffener profile mass (kg), attached plates not included."""
+        return self.stiff_section.linear_density * self.span
+
     @property
     def att_plates_lam(self):
         return [self.att_plate_1, self.att_plate_2]
 
     @property
     def eff_widths(self) -> list[float]:
-        xp = list(range(10))
-        fp = [0, 0.36, 0.64, 0.82, 0.91, 0.96, 0.98, 0.993, 0.998, 1]
-        weff = np.interp(self.length_bet_mom / (self.spacing), xp, fp) * self.spacing
+        weff = (
+            np.interp(self.length_bet_mom / (self.spacing), EFF_WIDTH_XP, EFF_WIDTH_FP)
+            * self.spacing
+        )
         weffs = [spacing / self.spacing * weff for spacing in self.spacings]
         # since att plates are numbered 1 and 2, but storing list index starts at 0
         index = (
@@ -1185,31 +1497,28 @@ class Stiffener:
 
     @property
     def length_bet_mom(self):
-        table = {
-            BoundaryCondition.FIXED: 0.4 * self.span,
-            BoundaryCondition.SIMPLY_SUPPORTED: self.span,
-        }
-        return table[self.bound_cond]
+        return LENGTH_BET_MOM_FACTOR[self.bound_cond] * self.span
 
     @property
     def stiff_section_att_plate(self):
-        return StiffenerSection(
-            SectionElementListChain(
-                [
-                    att_plate_section_factory(type(laminate))(laminate, dimension)
-                    for laminate, dimension in zip(self.att_plates_lam, self.eff_widths)
-                ]
-                + [
-                    PlacedStiffnerSection(
-                        stiff_section=self.stiff_section,
-                        anchor_pt=Point2D(
-                            0,
-                            self.att_plates_lam[self.stiff_att_plate - 1].thickness,
-                        ),
-                        angle=self.stiff_att_angle,
-                    )
-                ]
-            )
+        """Shared by all stiffeners with the same profile, attached plates and
+        effective widths, see ATT_PLATE_SECTIONS.
+        """
+        return ATT_PLATE_SECTIONS.section(
+            [
+                att_plate_section_factory(type(laminate))(laminate, dimension)
+                for laminate, dimension in zip(self.att_plates_lam, self.eff_widths)
+            ]
+            + [
+                PlacedStiffnerSection(
+                    stiff_section=self.stiff_section,
+                    anchor_pt=Point2D(
+                        0,
+                        self.att_plates_lam[self.stiff_att_plate - 1].thickness,
+                    ),
+                    angle=self.stiff_att_angle,
+                )
+            ]
         )
 
     @property
@@ -1218,13 +1527,11 @@ class Stiffener:
 
     @property
     def boundary_cond_coef_bend(self):
-        table = {BoundaryCondition.FIXED: 12.0, BoundaryCondition.SIMPLY_SUPPORTED: 8.0}
-        return table[self.bound_cond]
+        return BOUND_COND_COEF_BEND[self.bound_cond]
 
     @property
     def boundary_cond_coef_deflection(self):
-        table = {BoundaryCondition.FIXED: 1, BoundaryCondition.SIMPLY_SUPPORTED: 5}
-        return table[self.bound_cond]
+        return BOUND_COND_COEF_DEFLECTION[self.bound_cond]
 
     def bending_momt(self, pressure: float) -> float:
         return (
@@ -1244,7 +1551,7 @@ class Stiffener:
             * self.spacing
             * self.span**4
             * self.boundary_cond_coef_deflection
-            / (384 * self.stiff_section_att_plate.bend_stiff().y)
+            / (384 * self.stiff_section_att_plate.bend_stiff_0.y)
         )
 
     def linear_strains(self, pressure: float) -> list[float]:
@@ -1258,63 +1565,28 @@ class Stiffener:
     def shear_strain(self, pressure: float):
         return self.stiff_section_att_plate.shear_strain_web(self.shear_force(pressure))
 
-    def rule_check(self, pressure: float):
-        # TODO get safety factos from config and strain limits from laminate properties
-        strain_linear_limt = 0.0105
-        strain_shear_limit = 0.021
-        safety_factor = 3
+    def criteria(self, pressure: float) -> dict[str, Criteria]:
         strains = self.linear_strains(pressure)
-        span_deflection_factor = 0.05
-        deflection_check = pd.DataFrame(
-            {
-                "deflection": [
-                    Criteria(
-                        self.deflection(pressure), span_deflection_factor * self.span, 1
-                    )
-                ]
-            }
-        )
-        linear_strain_check_bottom = pd.DataFrame(
-            {
-                "linear_strain_ratio_bottom": [
-                    Criteria(np.abs(strains[0]), strain_linear_limt, safety_factor)
-                ]
-            }
-        )
-        linear_strain_check_top = pd.DataFrame(
-            {
-                "linear_strain_ratio_top": [
-                    Criteria(np.abs(strains[1]), strain_linear_limt, safety_factor)
-                ]
-            }
-        )
-        shear_strain_check = pd.DataFrame(
-            {
-                "shear_strain_ratio": [
-                    Criteria(
-                        self.shear_strain(pressure), strain_shear_limit, safety_factor
-                    )
-                ]
-            }
-        )
-        shear_buckling_strain_check = pd.DataFrame(
-            {
-                "shear_strain_buckling_ratio": [
-                    Criteria(
-                        self.shear_strain(pressure),
-                        self.stiff_section.shear_buckling_strain(self.span),
-                        1,
-                    )
-                ]
-            }
-        )
-        return pd.concat(
-            [
-                deflection_check,
-                linear_strain_check_bottom,
-                linear_strain_check_top,
-                shear_strain_check,
-                shear_buckling_strain_check,
-            ],
-            axis=1,
+        shear_strain = self.shear_strain(pressure)
+        return {
+            "deflection": Criteria(
+                self.deflection(pressure), SPAN_DEFLECTION_FACTOR * self.span, 1
+            ),
+            "linear_strain_ratio_bottom": Criteria(
+                np.abs(strains[0]), STRAIN_LINEAR_LIMIT, STRAIN_SAFETY_FACTOR
+            ),
+            "linear_strain_ratio_top": Criteria(
+                np.abs(strains[1]), STRAIN_LINEAR_LIMIT, STRAIN_SAFETY_FACTOR
+            ),
+            "shear_strain_ratio": Criteria(
+                shear_strain, STRAIN_SHEAR_LIMIT, STRAIN_SAFETY_FACTOR
+            ),
+            "shear_strain_buckling_ratio": Criteria(
+                shear_strain, self.stiff_section.shear_buckling_strain(self.span), 1
+            ),
+        }
+
+    def rule_check(self, pressure: float):
+        return pd.DataFrame(
+            {name: [value] for name, value in self.criteria(pressure).items()}
         )
@@ -0,0 +1,89 @@
+"""
+Incremental reading of json session files.
+
+Session files (Session.dump_json) are an object of collections, each a list
+of serialized entities. iter_entities reads such a file chunk by chunk and
+yields its entities one at a time, so reading it holds one chunk of the file
+and one entity in memory instead of the whole document.
+"""
+
+from json import JSONDecodeError, JSONDecoder
+from typing import IO, Iterator
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Buffered json tokens of a text stream."""
+
+    def __init__(self, f: IO[str], chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = JSONDecoder()
+
+    def _read(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non whitespace character, "" at the end of the stream."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consumes the next character, which must be one of chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                f"Expected one of {chars!r} in session file, found {char or 'end'!r}."
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decodes the next json value, reading until it's complete."""
+        self.peek()
+        while True:
+            try:
+                value, self.pos = self.decoder.raw_decode(self.buffer, self.pos)
+                return value
+            except JSONDecodeError:
+                if not self._read():
+                    raise
+
+
+def iter_entities(
+    f: IO[str], chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[str, dict]]:
+    """Collection name and serialized entity of every entity of a json session
+    file, in file order, reading chunk_size characters at a time.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        collection = reader.value()
+        reader.expect(":")
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.expect("]")
+        else:
+            while True:
+                yield collection, reader.value()
+                if reader.expect(",]") == "]":
+                    break
+        if reader.expect(",}") == "}":
+            return
@@ -0,0 +1,200 @@
+"""
+Vessel design space sweeps.
+
+Evaluates the vessel global parameters and loads (C3.3 and C3.4) over grids of
+speed, displacement, type of service and service range, then propagates each
+vessel variant through a session's structural elements.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import product
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .elements import StructuralElement
+from .utils import Criteria
+from .vessel import Catamaran, Monohull, ServiceRange, TypeOfService
+
+VESSEL_LOADS = ["vert_acg", "max_wave_height", "sig_wave_height"]
+CATAMARAN_LOADS = [
+    "transverse_bending_moment",
+    "transverse_shear_force",
+    "transverse_torsional_moment",
+]
+VARIANT_LABEL = "variant"
+
+
+def element_results(element: StructuralElement) -> dict:
+    """Design pressure, lowest criteria ratio and mass of a single element."""
+    rule_check = element.rule_check
+    criteria = {
+        column: value
+        for column, value in rule_check.iloc[0].items()
+        if isinstance(value, Criteria)
+    }
+    governing = min(criteria, key=lambda column: criteria[column].ratio)
+    return {
+        "name": element.name,
+        "design_pressure": element.design_pressure,
+        "governing_criteria": governing,
+        "min_ratio": criteria[governing].ratio,
+        "mass": element.model.mass,
+    }
+
+
+# Elements shared by all the tasks a worker process runs, so they are pickled
+# once per worker instead of once per vessel variant.
+_WORKER_ELEMENTS: list[StructuralElement] = []
+
+
+def _init_worker(elements: list[StructuralElement]):
+    global _WORKER_ELEMENTS
+    _WORKER_ELEMENTS = elements
+
+
+def _evaluate_variant(variant: tuple[int, Monohull | Catamaran]) -> list[dict]:
+    index, vessel = variant
+    return [
+        {VARIANT_LABEL: index, **element_results(replace(element, vessel=vessel))}
+        for element in _WORKER_ELEMENTS
+    ]
+
+
+@dataclass
+class VesselSweep:
+    """Design space of a base vessel. Speed and displacement are evaluated as
+    arrays for each type of service and service range combination. Unset
+    lists default to the base vessel's value.
+    """
+
+    vessel: Monohull | Catamaran
+    speeds: Optional[list[float]] = None
+    displacements: Optional[list[float]] = None
+    types_of_service: Optional[list[TypeOfService]] = None
+    service_ranges: Optional[list[ServiceRange]] = None
+    _loads: pd.DataFrame = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def _grid(self):
+        speeds = self.speeds if self.speeds is not None else [self.vessel.speed]
+        displacements = (
+            self.displacements
+            if self.displacements is not None
+            else [self.vessel.displacement]
+        )
+        return np.meshgrid(speeds, displacements, indexing="ij")
+
+    @property
+    def _discrete_cases(self):
+        return product(
+            self.types_of_service or [self.vessel.type_of_service],
+            self.service_ranges or [self.vessel.service_range],
+        )
+
+    @property
+    def load_names(self) -> list[str]:
+        if isinstance(self.vessel, Catamaran):
+            return VESSEL_LOADS + CATAMARAN_LOADS
+        return VESSEL_LOADS
+
+    @property
+    def loads(self) -> pd.DataFrame:
+        """Vessel global parameters and loads, one row per variant."""
+        if self._loads is None:
+            speeds, displacements = (array.ravel() for array in self._grid)
+            frames = []
+            for type_of_service, service_range in self._discrete_cases:
+                vessels = replace(
+                    self.vessel,
+                    speed=speeds,
+                    displacement=displacements,
+                    type_of_service=TypeOfService(type_of_service),
+                    service_range=ServiceRange(service_range),
+                )
+                frames.append(
+                    pd.DataFrame(
+                        {
+                            "speed": speeds,
+                            "displacement": displacements,
+                            "type_of_service": vessels.type_of_service,
+                            "service_range": vessels.service_range,
+                            **{
+                                name: np.broadcast_to(
+                                    getattr(vessels, name), speeds.shape
+                                )
+                                for name in self.load_names
+                            },
+                        }
+                    )
+                )
+            self._loads = pd.concat(frames, ignore_index=True)
+            self._loads.index.name = VARIANT_LABEL
+        return self._loads
+
+    @property
+    def variants(self) -> list[Monohull | Catamaran]:
+        """Scalar vessel for each row of loads."""
+        return [
+            replace(
+                self.vessel,
+                speed=row.speed,
+                displacement=row.displacement,
+                type_of_service=row.type_of_service,
+                service_range=row.service_range,
+            )
+            for row in self.loads.itertuples()
+        ]
+
+    def _elements(self, elements: list[StructuralElement]):
+        return [element for element in elements if element.vessel is self.vessel]
+
+    def element_results(
+        self, elements: list[StructuralElement], max_workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Rule check of every element built on the swept vessel, for every
+        variant. Elements are shallow copied with the variant vessel, so the
+        models, laminates and sections (and their cached properties) are
+        shared between variants. Variants run in parallel processes, unless
+        max_workers is 1.
+        """
+        elements = self._elements(elements)
+        variants = list(enumerate(self.variants))
+        if max_workers == 1:
+            _init_worker(elements)
+            results = [_evaluate_variant(variant) for variant in variants]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(elements,),
+            ) as executor:
+                results = list(executor.map(_evaluate_variant, variants))
+        return pd.DataFrame([row for rows in results for row in rows])
+
+    def session_results(
+        self, session, max_workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Summary of each variant of the session's panels and stiffeners:
+        structural mass, lowest criteria ratio and governing element.
+        """
+        elements = list(session.panels.values()) + list(
+            session.stiffener_elements.values()
+        )
+        results = self.element_results(elements, max_workers=max_workers)
+        governing = results.loc[results.groupby(VARIANT_LABEL)["min_ratio"].idxmin()]
+        summary = pd.DataFrame(
+            {
+                "structural_mass": results.groupby(VARIANT_LABEL)["mass"].sum(),
+                "min_ratio": governing.set_index(VARIANT_LABEL)["min_ratio"],
+                "governing_element": governing.set_index(VARIANT_LABEL)["name"],
+                "failed_elements": results[results["min_ratio"] < 1]
+                .groupby(VARIANT_LABEL)
+                .size(),
+            }
+        )
+        summary["failed_elements"] = summary["failed_elements"].fillna(0).astype(int)
+        summary["max_utilization"] = 1 / summary["min_ratio"]
+        return self.loads.join(summary)
@@ -0,0 +1,280 @@
+"""
+Structural mass take-off.
+
+Panel masses (laminate area density x panel area) and stiffener masses
+(profile linear density x span) of every structural element, rolled up by
+element type, location, material, zone and x station, with the longitudinal
+and vertical centres of gravity. Roll-ups keep each group's mass and x and z
+moments, so changing an element or a laminate only adds the difference of
+the affected elements' contributions.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .composites import Laminate
+from .elements import StructuralElement
+from .panels import Panel
+from .stiffeners import StiffenerSection
+
+GROUPINGS = ["type", "location", "material", "zone", "station"]
+
+
+@dataclass
+class _Labels:
+    """Integer codes of labels, in order of appearance."""
+
+    labels: list = field(default_factory=list)
+    codes: dict = field(default_factory=dict)
+
+    def encode(self, labels: Iterable) -> np.ndarray:
+        for label in labels:
+            if label not in self.codes:
+                self.codes[label] = len(self.labels)
+                self.labels.append(label)
+        return np.array([self.codes[label] for label in labels], dtype=int)
+
+
+@dataclass
+class _RollUp:
+    """Mass and x and z moments of each group, and its number of elements."""
+
+    groups: _Labels = field(default_factory=_Labels)
+    sums: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=int))
+
+    def encode(self, labels: Iterable) -> np.ndarray:
+        codes = self.groups.encode(labels)
+        missing = len(self.groups.labels) - len(self.sums)
+        if missing:
+            self.sums = np.vstack([self.sums, np.zeros((missing, 3))])
+            self.counts = np.concatenate([self.counts, np.zeros(missing, dtype=int)])
+        return codes
+
+    def add(self, codes: np.ndarray, moments: np.ndarray, members: int = 0):
+        """Adds the moments, members elements joining (or leaving, if
+        negative) each group. Emptied groups are reset, dropping rounding
+        residues.
+        """
+        np.add.at(self.sums, codes, moments)
+        if members:
+            np.add.at(self.counts, codes, members)
+            self.sums[self.counts == 0] = 0
+
+    def frame(self, name: str) -> pd.DataFrame:
+        mass, moment_x, moment_z = self.sums.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frame = pd.DataFrame(
+                {"mass": mass, "lcg": moment_x / mass, "vcg": moment_z / mass},
+                index=pd.Index(self.groups.labels, name=name),
+            )
+        return frame[(self.counts > 0) & (mass != 0)]
+
+
+def _material(element: StructuralElement) -> tuple[str, str, float, float]:
+    """Material type and name, its density (kg/m2 or kg/m) and the element's
+    size (m2 or m), its mass being the model's over the density, so material
+    updates scale it.
+    """
+    model = element.model
+    if isinstance(model, Panel):
+        kind, material = "laminate", model.laminate
+        density = material.area_density
+    else:
+        kind, material = "section", model.stiff_section
+        density = material.linear_density
+    size = model.mass / density if density else 0
+    return kind, material.name, density, size
+
+
+def _key(element: StructuralElement) -> tuple[str, str]:
+    """Panels and stiffeners may share names."""
+    return type(element.model).__name__, element.name
+
+
+@dataclass
+class MassTakeOff:
+    """Mass take-off of structural elements. Materials are the panels'
+    laminates and the stiffeners' sections. Zones are given by element name,
+    elements without zone belonging to zone "". Stations are the x positions
+    rounded down to multiples of station_length (m).
+    Elements and materials are updated in place with update_element,
+    remove_element, update_laminate and update_section, which keep the
+    roll-ups current without recomputing them.
+    """
+
+    elements: Iterable[StructuralElement]
+    station_length: float = 1
+    zones: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.elements = list(self.elements)
+        # Position in elements, the arrays' indexes staying put on removals
+        self._positions = {
+            _key(element): position for position, element in enumerate(self.elements)
+        }
+        self._index: dict[str, int] = {}
+        self._names: list[str] = []
+        self._materials = _Labels()
+        self._densities = np.zeros(0)
+        self._material = np.zeros(0, dtype=int)
+        self._size = np.zeros(0)
+        self._x = np.zeros(0)
+        self._z = np.zeros(0)
+        self._codes = {by: np.zeros(0, dtype=int) for by in GROUPINGS}
+        self._rollups = {by: _RollUp() for by in GROUPINGS}
+        self._append(self.elements)
+
+    @classmethod
+    def from_session(cls, session, **kwargs) -> "MassTakeOff":
+        return cls(
+            list(session.panels.values()) + list(session.stiffener_elements.values()),
+            **kwargs,
+        )
+
+    @property
+    def mass(self) -> np.ndarray:
+        """Mass (kg) of each element."""
+        return self._densities[self._material] * self._size
+
+    def _moments(self, index) -> np.ndarray:
+        mass = self._densities[self._material[index]] * self._size[index]
+        return np.column_stack([mass, mass * self._x[index], mass * self._z[index]])
+
+    def _add_moments(self, index, moments: np.ndarray, members: int = 0):
+        for by, rollup in self._rollups.items():
+            rollup.add(self._codes[by][index], moments, members)
+
+    def _station(self, x: float) -> float:
+        return np.floor(x / self.station_length) * self.station_length
+
+    def _labels(self, element: StructuralElement, material: str) -> dict:
+        return {
+            "type": type(element.model).__name__,
+            "location": element.location.name,
+            "material": material,
+            "zone": self.zones.get(element.name, ""),
+            "station": self._station(element.x),
+        }
+
+    def _material_code(self, key: tuple[str, str], density: float) -> int:
+        if key in self._materials.codes:
+            material = self._materials.codes[key]
+            if self._densities[material] != density:
+                self._update_material(key, density)
+            return material
+        material = self._materials.encode([key])[0]
+        self._densities = np.append(self._densities, density)
+        return material
+
+    def _append(self, elements: list[StructuralElement]):
+        materials = [_material(element) for element in elements]
+        codes = {
+            (kind, name): self._material_code((kind, name), density)
+            for kind, name, density, _ in materials
+        }
+        start = len(self._names)
+        for i, element in enumerate(elements):
+            self._index[_key(element)] = start + i
+            self._names.append(element.name)
+        self._material = np.concatenate(
+            [
+                self._material,
+                np.array([codes[(kind, name)] for kind, name, *_ in materials], int),
+            ]
+        )
+        self._size = np.concatenate([self._size, [size for *_, size in materials]])
+        self._x = np.concatenate([self._x, [element.x for element in elements]])
+        self._z = np.concatenate([self._z, [element.z for element in elements]])
+        labels = [
+            self._labels(element, name)
+            for element, (_, name, *_) in zip(elements, materials)
+        ]
+        for by, rollup in self._rollups.items():
+            codes = rollup.encode([label[by] for label in labels])
+            self._codes[by] = np.concatenate([self._codes[by], codes])
+        index = np.arange(start, len(self._names))
+        self._add_moments(index, self._moments(index), members=1)
+
+    def update_element(self, element: StructuralElement):
+        """Replaces the element with the same name and type, or adds it. A
+        material with a different density than the stored one updates every
+        element with that material.
+        """
+        if _key(element) not in self._index:
+            self._positions[_key(element)] = len(self.elements)
+            self.elements.append(element)
+            self._append([element])
+            return
+        i = self._index[_key(element)]
+        self._add_moments([i], -self._moments([i]), members=-1)
+        self._size[i] = 0
+        self.elements[self._positions[_key(element)]] = element
+        kind, name, density, size = _material(element)
+        self._material[i] = self._material_code((kind, name), density)
+        self._size[i] = size
+        self._x[i] = element.x
+        self._z[i] = element.z
+        labels = self._labels(element, name)
+        for by, rollup in self._rollups.items():
+            self._codes[by][i] = rollup.encode([labels[by]])[0]
+        self._add_moments([i], self._moments([i]), members=1)
+
+    def remove_element(self, element: StructuralElement):
+        """Removes the element with the same name and type. Its arrays' entry
+        is kept with no mass, so the others keep their index.
+        """
+        key = _key(element)
+        i = self._index.pop(key)
+        self._add_moments([i], -self._moments([i]), members=-1)
+        self._size[i] = 0
+        position = self._positions.pop(key)
+        del self.elements[position]
+        for other, other_position in self._positions.items():
+            if other_position > position:
+                self._positions[other] = other_position - 1
+
+    def _update_material(self, key: tuple[str, str], density: float):
+        if key not in self._materials.codes:
+            return
+        material = self._materials.codes[key]
+        index = np.flatnonzero(self._material == material)
+        old = self._moments(index)
+        self._densities[material] = density
+        self._add_moments(index, self._moments(index) - old)
+
+    def update_laminate(self, laminate: Laminate):
+        """Area density of the panels with a laminate of the same name."""
+        self._update_material(("laminate", laminate.name), laminate.area_density)
+
+    def update_section(self, section: StiffenerSection):
+        """Linear density of the stiffeners with a section of the same name."""
+        self._update_material(("section", section.name), section.linear_density)
+
+    def rollup(self, by: str) -> pd.DataFrame:
+        """Mass (kg), LCG and VCG (m) of each group, by one of GROUPINGS."""
+        return self._rollups[by].frame(by)
+
+    @property
+    def total(self) -> pd.Series:
+        mass, moment_x, moment_z = self._rollups["type"].sums.sum(axis=0)
+        return pd.Series({"mass": mass, "lcg": moment_x / mass, "vcg": moment_z / mass})
+
+    def to_frame(self) -> pd.DataFrame:
+        """Mass (kg) and position of each element."""
+        index = np.array(sorted(self._index.values()), dtype=int)
+        return pd.DataFrame(
+            {
+                "name": [self._names[i] for i in index],
+                **{
+                    by: [self._rollups[by].groups.labels[code] for code in codes]
+                    for by, codes in ((by, self._codes[by][index]) for by in GROUPINGS)
+                },
+                "x": self._x[index],
+                "z": self._z[index],
+                "mass": self.mass[index],
+            }
+        )
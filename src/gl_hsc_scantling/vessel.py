@@ -206,7 +206,8 @@ class VesselLoads:
 @dataclass
 class Monohull:
     """Vessel for the 2012 German Lloyds High Speed Craft
-    scantling rules.
+    scantling rules. The numerical inputs may also be numpy arrays, in which
+    case the rule formulas are evaluated for all the variants at once.
     """
 
     name: str = field(metadata={DESERIALIZER_OPTIONS: NAME_OPTIONS})
@@ -281,7 +282,7 @@ class Monohull:
         """Vertical acceletation at LCGm, output in g (9.81 m/s2)"""
         acg = self.serv_type_coef * self.serv_range_coef * self.sp_len_ratio
         if self.type_of_service == TypeOfService.PASSENGER:
-            return min([1.0, acg])
+            return np.minimum(1.0, acg)
         return acg
 
     @property
@@ -289,7 +290,7 @@ class Monohull:
         """C3.3.3 Assessment of limit operating conditions"""
         return (
             5
-            * np.max([self.vert_acg, 1])
+            * np.maximum(self.vert_acg, 1)
             / self.speed
             * self.length**1.5
             / (6 + 0.14 * self.length)
@@ -337,8 +338,8 @@ class Catamaran(Monohull):
     # C3.3.3.2
     @property
     def coef_kcat(self):
-        return np.max(
-            [1 + (self.dist_hull_cl - self.max_wave_height) / self.length, 1.0]
+        return np.maximum(
+            1 + (self.dist_hull_cl - self.max_wave_height) / self.length, 1.0
         )
 
     # C3.4.2.3
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest as pt
+from gl_hsc_scantling.catalog import SectionCatalog, att_plate_column
+from gl_hsc_scantling.shortcut import LBar, StiffenerSectionWithFoot
+
+
+@pt.fixture
+def lbar_library(et_0900_20x, et_0900_20x_45deg):
+    return [
+        StiffenerSectionWithFoot(
+            LBar(
+                laminate_web=laminate,
+                dimension_web=web,
+                laminate_flange=et_0900_20x,
+                dimension_flange=flange,
+                name=f"L {web * 1000:.0f}x{flange * 1000:.0f} {laminate.name}",
+            )
+        )
+        for laminate in [et_0900_20x, et_0900_20x_45deg]
+        for web in np.linspace(0.02, 0.15, 14)
+        for flange in np.linspace(0.02, 0.08, 7)
+    ]
+
+
+def test_catalog_query(lbar_library, et_0900_20x, tmp_path):
+    catalog = SectionCatalog.from_sections(
+        lbar_library, att_plate=et_0900_20x, att_plate_widths=[0.1, 0.3]
+    )
+    file_name = tmp_path / "catalog.npz"
+    catalog.save(file_name)
+    catalog = SectionCatalog.load(file_name)
+    frame = catalog.to_frame()
+    assert len(frame) == len(lbar_library)
+    bend_stiff, shear_stiff = (
+        frame["bend_stiff"].median(),
+        frame["shear_stiff"].median(),
+    )
+    feasible = frame[
+        (frame["bend_stiff"] >= bend_stiff) & (frame["shear_stiff"] >= shear_stiff)
+    ]
+    assert (
+        catalog.lightest(bend_stiff=(bend_stiff, None), shear_stiff=(shear_stiff, None))
+        == feasible["linear_density"].idxmin()
+    )
+    rows = catalog.range("linear_density", 0.5, 1)
+    expected = frame["linear_density"].between(0.5, 1)
+    assert sorted(catalog.names[rows]) == sorted(frame.index[expected])
+    assert catalog.lightest(bend_stiff=(np.inf, None)) is None
+
+
+def test_catalog_att_plate(stiffener_bottom_01):
+    stiffener = stiffener_bottom_01.model
+    section = stiffener.stiff_section
+    width = stiffener.eff_widths[0]
+    catalog = SectionCatalog.from_sections(
+        [section], att_plate=stiffener.att_plate_1, att_plate_widths=[width]
+    )
+    assert (
+        catalog.columns[att_plate_column(width)][0] > catalog.columns["bend_stiff"][0]
+    )
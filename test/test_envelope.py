@@ -0,0 +1,44 @@
+from dataclasses import replace
+
+import pytest as pt
+from gl_hsc_scantling.envelope import (
+    ENVELOPE_COEFS,
+    ENVELOPE_CURVES,
+    OperatingEnvelope,
+)
+from gl_hsc_scantling.vessel import Catamaran
+
+
+def test_envelope_matches_single_vessel(vessel_ex1: Catamaran):
+    envelope = OperatingEnvelope(
+        vessel_ex1,
+        speeds=[5, 15, 30, 45],
+        displacements=[4, 6],
+        lcgs=[3, 4],
+        water_plane_areas=[8, 10],
+    )
+    frame = envelope.to_frame()
+    assert len(frame) == 4 * 2 * 2 * 2
+    for row in frame.itertuples():
+        vessel = replace(
+            vessel_ex1,
+            speed=row.speed,
+            displacement=row.displacement,
+            lcg=row.lcg,
+            water_plane_area=row.water_plane_area,
+        )
+        expected = [
+            getattr(vessel, name) for name in ENVELOPE_COEFS + ENVELOPE_CURVES[:2]
+        ]
+        assert [
+            getattr(row, name) for name in ENVELOPE_COEFS + ENVELOPE_CURVES[:2]
+        ] == pt.approx(expected)
+        assert row.limit_wave_height == pt.approx(min(expected[-2:]))
+
+
+def test_envelope_export(vessel_ex1: Catamaran, tmp_path):
+    envelope = OperatingEnvelope(vessel_ex1, speeds=[10, 20])
+    assert envelope.curves["sig_wave_height"].shape == (2, 1, 1, 1)
+    file_name = tmp_path / "envelope.csv"
+    envelope.to_csv(file_name)
+    assert file_name.read_text().splitlines()[0].startswith("speed,displacement")
@@ -0,0 +1,58 @@
+from dataclasses import replace
+
+import pytest as pt
+from gl_hsc_scantling.grillage import Grillage, GrillageMember
+from gl_hsc_scantling.stiffeners import BoundaryCondition
+
+
+@pt.mark.parametrize(
+    "bound_cond", [BoundaryCondition.FIXED, BoundaryCondition.SIMPLY_SUPPORTED]
+)
+def test_single_member(bound_cond, stiffener_bottom_01):
+    """An isolated member matches the rule's table coefficients."""
+    stiffener = replace(stiffener_bottom_01.model, bound_cond=bound_cond)
+    pressure = 50
+    grillage = Grillage(
+        [GrillageMember(stiffener, (0, 0), (stiffener.span, 0), pressure)]
+    )
+    criteria = stiffener.criteria(pressure)
+    assert list(grillage.rule_check.iloc[0, 1:]) == pt.approx(
+        [value.ratio for value in criteria.values()]
+    )
+
+
+def test_crossing_members(stiffener_bottom_01):
+    """Two equal simply supported members crossing at mid span, one loaded:
+    the crossing force is 5/16 of the load, the crossing deflection
+    5 q L^4 / (768 EI) and the loaded member's reactions 11/32 of the load.
+    """
+    stiffener = replace(
+        stiffener_bottom_01.model, bound_cond=BoundaryCondition.SIMPLY_SUPPORTED
+    )
+    span = stiffener.span
+    pressure = 20
+    grillage = Grillage(
+        [
+            GrillageMember(stiffener, (0, 0), (span, 0), pressure, name="long"),
+            GrillageMember(stiffener, (span / 2, -span / 2), (span / 2, span / 2)),
+        ]
+    )
+    assert len(grillage.nodes) == 5
+    assert len(grillage.elements) == 4
+    assert len(grillage.supported_nodes) == 4
+    load = pressure * stiffener.spacing
+    bend_stiff = stiffener.stiff_section_att_plate.bend_stiff_0.y
+    center = grillage.displacements[
+        ((grillage.nodes[:, 0] - span / 2) ** 2 + grillage.nodes[:, 1] ** 2).argmin()
+    ]
+    assert center[0] == pt.approx(5 * load * span**4 / (768 * bend_stiff))
+    results = grillage.member_results
+    assert results["shear_force"][1] == pt.approx(5 * load * span / 32)
+    assert results["shear_force"][0] == pt.approx(11 * load * span / 32)
+    assert list(grillage.rule_check["name"]) == ["long", ""]
+
+
+def test_oblique_member(stiffener_bottom_01):
+    stiffener = stiffener_bottom_01.model
+    with pt.raises(ValueError):
+        Grillage([GrillageMember(stiffener, (0, 0), (1, 1))]).nodes
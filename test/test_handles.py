@@ -0,0 +1,43 @@
+from dataclasses import replace
+
+import pytest as pt
+from gl_hsc_scantling.handles import ElementHandle
+from gl_hsc_scantling.shortcut import StructuralElement
+from gl_hsc_scantling.utils import Criteria
+
+
+def _ratios(rule_check) -> dict[str, float]:
+    return {
+        name: value.ratio
+        for name, value in rule_check.iloc[0].items()
+        if isinstance(value, Criteria)
+    }
+
+
+def handle_check(handle: ElementHandle, expected: StructuralElement):
+    check = handle.rule_check
+    assert check.at[0, "design_pressure_type"] == expected.design_pressure_type
+    assert _ratios(check) == pt.approx(_ratios(expected.rule_check))
+
+
+def test_handle_panel(panel_bottom_01, sandwich_laminate):
+    handle = ElementHandle(panel_bottom_01)
+    handle_check(handle, panel_bottom_01)
+    handle.set_position(x=10, z=0.2)
+    handle_check(handle, replace(panel_bottom_01, x=10, z=0.2))
+    handle.set_dims(0.5, 1.5)
+    model = replace(panel_bottom_01.model, dim_x=0.5, dim_y=1.5)
+    handle_check(handle, replace(panel_bottom_01, x=10, z=0.2, model=model))
+    handle.set_laminate(sandwich_laminate)
+    handle.set_dims(1.2, 0.8)
+    model = replace(model, laminate=sandwich_laminate, dim_x=1.2, dim_y=0.8)
+    handle_check(handle, replace(panel_bottom_01, x=10, z=0.2, model=model))
+
+
+def test_handle_stiffener(stiffener_bottom_01):
+    handle = ElementHandle(stiffener_bottom_01)
+    handle_check(handle, stiffener_bottom_01)
+    handle.set_spacing(0.3)
+    handle.set_position(z=0.1)
+    model = replace(stiffener_bottom_01.model, spacing_1=0.3, spacing_2=0.3)
+    handle_check(handle, replace(stiffener_bottom_01, z=0.1, model=model))
@@ -0,0 +1,50 @@
+from dataclasses import replace
+
+from gl_hsc_scantling.hashing import content_hash
+from gl_hsc_scantling.session import Session
+from gl_hsc_scantling.stiffeners import Point2D
+
+
+def test_content_hash_ignores_names(session_example: Session):
+    laminate = next(iter(session_example.laminates.values()))
+    assert content_hash(replace(laminate, name="renamed")) == content_hash(laminate)
+    panel = next(iter(session_example.panels.values()))
+    assert content_hash(replace(panel, name="renamed")) == content_hash(panel)
+    assert content_hash(replace(panel, x=panel.x + 1)) != content_hash(panel)
+
+
+def test_content_hash_stable_across_sessions(session_example: Session):
+    loaded = Session()
+    loaded.loads_json(session_example.dumps_json())
+    for name, collection in session_example.session_dict.items():
+        for key, item in collection.items():
+            assert content_hash(loaded.session_dict[name][key]) == content_hash(item)
+    hashes = {content_hash(laminate) for laminate in session_example.laminates.values()}
+    assert len(hashes) == len(session_example.laminates)
+
+
+def test_content_hash_follows_updates(session_example: Session):
+    lamina = session_example.laminas["et_0900"].data
+    panel = next(iter(session_example.panels.values()))
+    before = content_hash(panel)
+    session_example.update(lamina, modulus_x=lamina.modulus_x * 2)
+    assert content_hash(panel) != before
+    session_example.update(lamina, modulus_x=lamina.modulus_x / 2)
+    assert content_hash(panel) == before
+
+
+def test_content_hash_follows_edits_in_place(session_example: Session):
+    # Edits not going through Session.update aren't missed either
+    lamina = session_example.laminas["et_0900"].data
+    panel = next(iter(session_example.panels.values()))
+    before = content_hash(panel)
+    lamina.modulus_x *= 2
+    assert content_hash(panel) != before
+    lamina.modulus_x /= 2
+    assert content_hash(panel) == before
+
+
+def test_content_hash_vectors():
+    assert content_hash(Point2D(0, 0)) == content_hash(Point2D(0.0, 0.0))
+    assert content_hash(Point2D(0, 1)) != content_hash(Point2D(0, 0))
+    assert content_hash([Point2D(1, 2)]) == content_hash([Point2D(1.0, 2.0)])
@@ -0,0 +1,101 @@
+from json import loads
+
+import numpy as np
+
+from gl_hsc_scantling.session import Session
+
+
+def test_session_intern(session_example: Session):
+    serialized = loads(session_example.dumps_json())
+    copies = [
+        dict(panel, name=f"{panel['name']} copy") for panel in serialized["panels"]
+    ]
+    # Loading two files builds each material twice
+    session = Session()
+    session.load_session(serialized)
+    session.load_session({**serialized, "panels": copies})
+    panel = session.panels[serialized["panels"][0]["name"]]
+    copy = session.panels[copies[0]["name"]]
+    assert panel.model is not copy.model
+    assert panel.model.laminate is not copy.model.laminate
+    before = session.dumps_json()
+    report = session.intern()
+    assert report.merged["SingleSkinLaminate"] >= 1
+    assert "Panel" not in report.merged
+    assert report.bytes_saved > 0
+    assert report.cached_values_shared > 0
+    # Elements keep their own models, sharing the named laminate
+    assert panel.model is not copy.model
+    assert panel.model.laminate is copy.model.laminate
+    assert panel.model.laminate is session.laminates[panel.model.laminate.name]
+    assert session.dumps_json() == before
+    assert session.intern().total_merged == 0
+
+
+def test_update_after_intern(session_example: Session):
+    serialized = loads(session_example.dumps_json())
+    copies = [
+        dict(panel, name=f"{panel['name']} copy") for panel in serialized["panels"]
+    ]
+    session = Session()
+    session.load_session(serialized)
+    session.load_session({**serialized, "panels": copies})
+    session.intern()
+    panel = session.panels[serialized["panels"][0]["name"]]
+    copy = session.panels[copies[0]["name"]]
+    laminate = copy.model.laminate
+    other = next(item for item in session.laminates.values() if item is not laminate)
+    affected = session.update(panel.model, laminate=other)
+    assert panel in affected
+    assert copy not in affected
+    assert copy.model.laminate is laminate
+    dumped = {item["name"]: item for item in loads(session.dumps_json())["panels"]}
+    assert dumped[copy.name] == copies[0]
+
+
+def test_load_interned(session_example: Session):
+    serialized = session_example.dumps_json()
+    session = Session()
+    session.loads_json(serialized, intern=True)
+    assert session == session_example
+
+
+def test_update_location_after_intern(session_example: Session):
+    session = Session()
+    session.loads_json(session_example.dumps_json())
+    panel = session.panels["Wet Deck 01"]
+    stiffener = session.stiffener_elements["Wet Deck 01"]
+    # Content identical, their class level names alike
+    assert panel.location == stiffener.location
+    assert panel.location is not stiffener.location
+    session.intern()
+    assert panel.location is not stiffener.location
+    affected = session.update(panel.location, air_gap=5.0)
+    assert panel in affected
+    assert stiffener not in affected
+    assert stiffener.location.air_gap == 0.7
+    dumped = loads(session.dumps_json())
+    assert [item["air_gap"] for item in dumped["stiffener_elements"]] == [0.7]
+
+
+def test_intern_shares_persistent_values(session_example: Session):
+    serialized = loads(session_example.dumps_json())
+    laminate = next(
+        item for item in serialized["laminates"] if item["name"] == "et_0900_20x"
+    )
+    serialized["laminates"].append(dict(laminate, name="et_0900_20x copy"))
+    session = Session()
+    session.load_session(serialized)
+    original = session.laminates["et_0900_20x"]
+    copy = session.laminates["et_0900_20x copy"]
+    report = session.intern()
+    # Differently named, so kept apart, but computing their values once
+    assert "SingleSkinLaminate" not in report.merged
+    assert report.shared["SingleSkinLaminate"] == 1
+    assert report.cached_values_shared > 0
+    assert copy.stiff_matrix is original.stiff_matrix
+    session.update(copy.ply_stack, multiple=copy.ply_stack.multiple * 2)
+    assert not np.allclose(copy.stiff_matrix, original.stiff_matrix)
+    assert np.allclose(
+        original.stiff_matrix, session_example.laminates[original.name].stiff_matrix
+    )
@@ -0,0 +1,112 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest as pt
+from gl_hsc_scantling.layout import ZoneLayout
+from gl_hsc_scantling.panels import Panel
+from gl_hsc_scantling.stiffeners import LBar, Stiffener, StiffenerSectionWithFoot
+
+
+def _layout(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg) -> ZoneLayout:
+    sections = [
+        StiffenerSectionWithFoot(
+            LBar(
+                name=f"LBar {web * 1000:.0f}",
+                laminate_web=et_0900_20x,
+                dimension_web=web,
+                laminate_flange=et_0900_20x,
+                dimension_flange=0.02,
+            )
+        )
+        for web in np.linspace(0.03, 0.12, 4)
+    ]
+    return ZoneLayout(
+        vessel=stiffener_bottom_01.vessel,
+        location=stiffener_bottom_01.location,
+        x=(6, 9),
+        z=(-0.4, -0.2),
+        breadth=1.5,
+        span=1,
+        stiffener=stiffener_bottom_01.model,
+        laminates=[et_0900_20x, et_0900_20x_45deg],
+        sections=sections,
+        stiffener_counts=[1, 2, 3, 4, 5],
+    )
+
+
+def test_zone_layout(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg):
+    layout = _layout(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg)
+    layouts = layout.evaluate(max_workers=1)
+    assert set(layouts["stiffener_count"]) <= set(layout.stiffener_counts)
+    assert (layouts["panel_min_ratio"] >= 1).all()
+    row = layouts.iloc[0]
+    panel = Panel(dim_x=1, dim_y=row["spacing"], laminate=et_0900_20x)
+    check = panel.rule_check(row["panel_pressure"])
+    assert row["panel_min_ratio"] == pt.approx(
+        min(value.ratio for value in check.iloc[0])
+    )
+    optimum = layout.optimum(max_workers=1)
+    passing = layouts[layouts["stiffener_min_ratio"] >= 1]
+    assert optimum["mass"] == passing["mass"].min()
+    parallel = layout.optimum(max_workers=2)
+    assert (parallel["stiffener_count"], parallel["section"]) == (
+        optimum["stiffener_count"],
+        optimum["section"],
+    )
+
+
+def test_zone_layout_mass(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg):
+    layout = _layout(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg)
+    section = layout.sections[0]
+    # 3 stiffeners over the 1.5 m breadth: 2 profile metres per square metre
+    assert layout.mass(3, et_0900_20x, section) == pt.approx(
+        et_0900_20x.area_density + 2 * section.linear_density
+    )
+    layouts = layout.layouts(3)
+    row = layouts[
+        (layouts["laminate"] == et_0900_20x.name) & (layouts["section"] == section.name)
+    ]
+    assert row["mass"].iloc[0] == pt.approx(
+        et_0900_20x.area_density + 2 * section.linear_density
+    )
+
+
+def test_zone_layout_capped_area(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg):
+    # Wide spacing for the span: the panel area is capped at 3 span²
+    layout = replace(
+        _layout(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg),
+        span=0.3,
+        breadth=3,
+        stiffener_counts=[1],
+    )
+    panel = Panel(dim_x=0.3, dim_y=1.5, laminate=et_0900_20x)
+    assert panel.area < panel.span * panel.spacing
+    layouts = layout.layouts(1)
+    rows = layouts[layouts["laminate"] == et_0900_20x.name]
+    assert not rows.empty
+    assert (rows["panel_pressure"] == layout.design_pressure(Panel, panel.area)).all()
+    assert (
+        rows["stiffener_pressure"] == layout.design_pressure(Stiffener, 0.3 * 1.5)
+    ).all()
+
+
+def test_zone_layout_same_name_laminates(
+    stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg
+):
+    renamed = replace(et_0900_20x_45deg, name=et_0900_20x.name)
+    layout = replace(
+        _layout(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg),
+        laminates=[et_0900_20x, renamed],
+    )
+    layouts = layout.layouts(3)
+    section = layout.sections[0].name
+    ratios = layouts[layouts["section"] == section]["panel_min_ratio"]
+    expected = []
+    for laminate in layout.laminates:
+        panel = Panel(dim_x=1, dim_y=layout.spacing(3), laminate=laminate)
+        pressure = layout.design_pressure(Panel, panel.area)
+        ratio = min(value.ratio for value in panel.rule_check(pressure).iloc[0])
+        if ratio >= 1:
+            expected.append(ratio)
+    assert list(ratios) == pt.approx(expected)
+    assert len(set(ratios)) == len(expected)
@@ -0,0 +1,115 @@
+import pickle
+
+import pandas as pd
+from gl_hsc_scantling.overlays import SessionOverlay, evaluate
+from gl_hsc_scantling.session import Session
+
+
+def test_overlay(session_example: Session):
+    before = session_example.dumps_json()
+    lamina = session_example.laminas["et_0900"].data
+    overlay = SessionOverlay(session_example, name="stiffer").override(
+        lamina, modulus_x=lamina.modulus_x * 2
+    )
+    session = overlay.session
+    assert session.laminas["et_0900"].data.modulus_x == lamina.modulus_x * 2
+    assert session.vessels == session_example.vessels
+    for name, vessel in session.vessels.items():
+        assert vessel is session_example.vessels[name]
+    affected = overlay.affected_elements
+    assert affected
+    for element in affected:
+        assert overlay.resolve(element) is not element
+    unaffected = [
+        element
+        for element in session_example.stiffener_elements.values()
+        if element not in affected
+    ]
+    for element in unaffected:
+        assert session.stiffener_elements[element.name] is element
+    # The same edit applied to a separate copy of the session
+    expected = Session()
+    expected.loads_json(before)
+    expected_lamina = expected.laminas["et_0900"].data
+    expected.update(expected_lamina, modulus_x=expected_lamina.modulus_x * 2)
+    diff = overlay.diff()
+    assert set(diff["name"]) == {element.name for element in affected}
+    for row in diff.itertuples():
+        collection = (
+            expected.panels if row.type == "Panel" else expected.stiffener_elements
+        )
+        check = collection[row.name].rule_check
+        assert row.overlay_ratio == check[row.criteria][0].ratio
+    assert session_example.dumps_json() == before
+
+
+def test_overlay_vessel(session_example: Session):
+    vessel = next(iter(session_example.vessels.values()))
+    overlay = SessionOverlay(session_example).override(vessel, speed=vessel.speed * 2)
+    assert len(overlay.affected_elements) == len(session_example.panels) + len(
+        session_example.stiffener_elements
+    )
+    assert overlay.session.vessels[vessel.name].speed == vessel.speed * 2
+    assert overlay.session.laminates == session_example.laminates
+    assert vessel.speed != overlay.resolve(vessel).speed
+
+
+def test_evaluate(session_example: Session):
+    lamina = session_example.laminas["et_0900"].data
+    overlays = [
+        SessionOverlay(session_example, name=str(factor)).override(
+            lamina, modulus_x=lamina.modulus_x * factor
+        )
+        for factor in (1, 2)
+    ]
+    diffs = evaluate(overlays, max_workers=1)
+    pd.testing.assert_frame_equal(
+        diffs[diffs["overlay"] == "2"].reset_index(drop=True), overlays[1].diff()
+    )
+    # Unchanged inputs give unchanged criteria
+    assert (diffs[diffs["overlay"] == "1"]["change"] == 0).all()
+
+
+def test_evaluate_parallel(session_example: Session):
+    lamina = session_example.laminas["et_0900"].data
+    vessel = next(iter(session_example.vessels.values()))
+    overlays = [
+        SessionOverlay(session_example, name="lamina").override(
+            lamina, modulus_x=lamina.modulus_x * 2
+        ),
+        SessionOverlay(session_example, name="speed").override(
+            vessel, speed=vessel.speed * 2
+        ),
+        SessionOverlay(session_example, name="both")
+        .override(lamina, modulus_x=lamina.modulus_x / 2)
+        .override(vessel, speed=vessel.speed / 2),
+    ]
+    pd.testing.assert_frame_equal(
+        evaluate(overlays, max_workers=2), evaluate(overlays, max_workers=1)
+    )
+
+
+def test_overlay_pickle(session_example: Session):
+    lamina = session_example.laminas["et_0900"].data
+    overlays = [
+        SessionOverlay(session_example, name=str(factor)).override(
+            lamina, modulus_x=lamina.modulus_x * factor
+        )
+        for factor in (2, 3)
+    ]
+    # As a chunk is sent to a worker
+    unpickled = pickle.loads(pickle.dumps(overlays))
+    base = unpickled[0].base
+    assert unpickled[1].base is base
+    elements = list(base.panels.values()) + list(base.stiffener_elements.values())
+    for overlay, original in zip(unpickled, overlays):
+        # The affected entities are the unpickled base's
+        affected = overlay.affected_elements
+        assert [element.name for element in affected] == [
+            element.name for element in original.affected_elements
+        ]
+        assert all(any(element is item for item in elements) for element in affected)
+        assert (
+            overlay.session.laminas["et_0900"].data is not base.laminas["et_0900"].data
+        )
+        pd.testing.assert_frame_equal(overlay.diff(), original.diff())
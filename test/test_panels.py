@@ -64,3 +64,30 @@ def test_panel_deck_02(panel_deck_02, panel_deck_02_exp):
 
 def test_panel_deck_03(panel_deck_03, panel_deck_03_exp):
     panel_pressure_check(panel_deck_03, panel_deck_03_exp)
+
+
+@pt.mark.parametrize(
+    "elmt", ["panel_bottom_01", "panel_side_01", "stiffener_bottom_01"]
+)
+def test_load_cases_check(elmt, request):
+    elmt: StructuralElement = request.getfixturevalue(elmt)
+    scaled = elmt.load_cases_check()
+    exact = elmt.load_cases_check(exact=True)
+    assert list(scaled.columns) == list(exact.columns)
+    for column in scaled.columns[3:]:
+        assert [criteria.ratio for criteria in scaled[column]] == pt.approx(
+            [criteria.ratio for criteria in exact[column]]
+        )
+    governing = elmt.governing_load_cases
+    assert set(governing["pressure_type"]) <= set(elmt.pressures)
+
+
+def test_load_cases_check_no_pressure(panel_bottom_01, monkeypatch):
+    monkeypatch.setattr(
+        type(panel_bottom_01.location),
+        "calc_pressures",
+        lambda self, elmt: {"sea": 0.0, "impact": 0.0},
+    )
+    assert panel_bottom_01.load_cases_check().empty
+    assert panel_bottom_01.load_cases_check(exact=True).empty
+    assert panel_bottom_01.governing_load_cases.empty
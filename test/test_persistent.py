@@ -0,0 +1,48 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest as pt
+from gl_hsc_scantling import persistent
+from gl_hsc_scantling.hashing import content_hash
+from gl_hsc_scantling.persistent import PropertyStore
+
+
+@pt.fixture
+def store(tmp_path):
+    yield persistent.enable(tmp_path / "properties.sqlite")
+    persistent.disable()
+
+
+def test_persistent_properties(store: PropertyStore, et_0900_20x, lbar_01):
+    laminate = replace(et_0900_20x)
+    stiff_matrix = laminate.stiff_matrix
+    assert np.allclose(stiff_matrix, et_0900_20x.stiff_matrix)
+    key = f"{content_hash(laminate)}.stiff_matrix"
+    assert np.allclose(store.get(key), stiff_matrix)
+    # A new process' copy, however named, reads the stored value
+    store.set(key, "stored")
+    assert replace(et_0900_20x, name="copy").stiff_matrix == "stored"
+    section = replace(lbar_01)
+    assert section.linear_density == pt.approx(lbar_01.linear_density)
+    assert store.get(f"{content_hash(section)}.rects") is not None
+
+
+def test_property_store_eviction(tmp_path):
+    store = PropertyStore(tmp_path / "properties.sqlite", max_bytes=2500)
+    store.set("a", b"a" * 1000)
+    store.set("b", b"b" * 1000)
+    store.get("a")
+    store.set("c", b"c" * 1000)
+    assert store.get("b") is None
+    assert store.get("a") == b"a" * 1000
+    assert len(store) == 2
+    store.close()
+
+
+def test_property_store_version(tmp_path):
+    path = tmp_path / "properties.sqlite"
+    store = PropertyStore(path, version="1")
+    store.set("a", 1)
+    store.close()
+    assert PropertyStore(path, version="1").get("a") == 1
+    assert PropertyStore(path, version="2").get("a") is None
@@ -0,0 +1,86 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest as pt
+from gl_hsc_scantling.elements import StructuralElement, StructuralElementArray
+from gl_hsc_scantling.pressure_tables import PressureTable, PressureTables
+
+
+def _element_array(elmt: StructuralElement, **kwargs):
+    inputs = dict(
+        x=elmt.x,
+        z=elmt.z,
+        area=elmt.area,
+        vessel=elmt.vessel,
+        location=elmt.location,
+        model_type=elmt.model_type,
+    )
+    inputs.update(kwargs)
+    return StructuralElementArray(**inputs)
+
+
+@pt.mark.parametrize(
+    "elmt",
+    [
+        "panel_bottom_01",
+        "panel_bottom_04",
+        "panel_side_01",
+        "panel_wet_deck_01",
+        "panel_deck_02",
+        "stiffener_bottom_01",
+    ],
+)
+def test_element_array_matches_element(elmt, request):
+    elmt = request.getfixturevalue(elmt)
+    assert _element_array(elmt).pressures == pt.approx(elmt.pressures)
+
+
+def test_element_array_broadcast(panel_bottom_01):
+    xs = np.linspace(0, 10, 11)
+    array = _element_array(panel_bottom_01, x=xs).design_pressure
+    single = [_element_array(panel_bottom_01, x=x).design_pressure for x in xs]
+    assert array == pt.approx(single)
+
+
+def test_pressure_table_panel_bottom(panel_bottom_01):
+    table = PressureTable(panel_bottom_01.vessel, panel_bottom_01.location)
+    assert table.element_design_pressure(panel_bottom_01) == pt.approx(
+        panel_bottom_01.design_pressure, rel=0.02
+    )
+    assert table.error_bound < 1
+
+
+def test_pressure_table_array_query(panel_wet_deck_01):
+    table = PressureTable(panel_wet_deck_01.vessel, panel_wet_deck_01.location)
+    xs = np.linspace(1, 9, 9)
+    exact = _element_array(panel_wet_deck_01, x=xs).design_pressure
+    interpolated = table.design_pressure(xs, panel_wet_deck_01.z, 1)
+    assert interpolated == pt.approx(exact, rel=0.02)
+
+
+def test_pressure_table_out_of_range_is_exact(panel_bottom_01):
+    table = PressureTable(panel_bottom_01.vessel, panel_bottom_01.location)
+    exact = _element_array(panel_bottom_01, x=12).design_pressure
+    assert table.design_pressure(12, panel_bottom_01.z, 1) == pt.approx(exact)
+
+
+def test_pressure_table_invalidation(panel_bottom_01):
+    vessel = replace(panel_bottom_01.vessel)
+    table = PressureTable(vessel, panel_bottom_01.location)
+    before = table.design_pressure(8, -0.3, 1)
+    vessel.deadrise_lcg = 20
+    assert not table.is_current
+    after = table.design_pressure(8, -0.3, 1)
+    exact = _element_array(panel_bottom_01, vessel=replace(vessel)).design_pressure
+    assert after != pt.approx(before)
+    assert after == pt.approx(exact, rel=0.02)
+
+
+def test_pressure_tables_registry(panel_bottom_01, panel_bottom_02):
+    tables = PressureTables(resolution={"n_x": 21})
+    for panel in [panel_bottom_01, panel_bottom_02]:
+        assert tables.design_pressure(panel) == pt.approx(
+            panel.design_pressure, rel=0.02
+        )
+    # different deadrise, different table
+    assert len(tables.tables) == 2
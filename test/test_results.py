@@ -0,0 +1,49 @@
+import pandas as pd
+from gl_hsc_scantling import persistent
+from gl_hsc_scantling.results import RuleCheckCache
+from gl_hsc_scantling.session import Session
+
+
+def _frames_equal(first: pd.DataFrame, second: pd.DataFrame):
+    assert list(first.columns) == list(second.columns)
+    assert first.astype(str).equals(second.astype(str))
+
+
+def test_rule_check_cache(session_example: Session):
+    cache = RuleCheckCache()
+    checks = session_example.panels_rule_check(cache=cache)
+    assert checks.attrs == {"reused": 0, "computed": len(session_example.panels)}
+    _frames_equal(checks, session_example.panels_rule_check())
+    assert session_example.panels_rule_check(cache=cache).attrs["computed"] == 0
+    lamina = session_example.laminas["et_0900"].data
+    affected = session_example.update(lamina, modulus_x=lamina.modulus_x * 2)
+    affected_panels = [
+        element for element in affected if element in session_example.panels.values()
+    ]
+    checks = session_example.panels_rule_check(cache=cache)
+    assert cache.computed == len(affected_panels)
+    _frames_equal(checks, session_example.panels_rule_check())
+
+
+def test_rule_check_cache_persistent(session_example: Session, tmp_path):
+    store = persistent.PropertyStore(tmp_path / "results.sqlite")
+    expected = session_example.stiffeners_rule_check(cache=RuleCheckCache(store))
+    # A new process loading the session reuses the stored rows
+    loaded = Session()
+    loaded.loads_json(session_example.dumps_json())
+    cache = RuleCheckCache(store)
+    checks = loaded.stiffeners_rule_check(cache=cache)
+    assert (cache.reused, cache.computed) == (len(loaded.stiffener_elements), 0)
+    _frames_equal(checks, expected)
+    store.close()
+
+
+def test_rule_check_cache_edit_in_place(session_example: Session):
+    cache = RuleCheckCache()
+    element = next(iter(session_example.panels.values()))
+    cache.rule_check([element])
+    # Elements' pressures aren't cached, so the edit needs no invalidation
+    element.x += 1
+    checks = cache.rule_check([element])
+    assert cache.computed == 1
+    _frames_equal(checks, element.rule_check)
@@ -1,6 +1,14 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
 import pytest as pt
-from dataclass_tools.tools import serialize_dataclass
-from gl_hsc_scantling.session import Session
+from dataclass_tools.tools import deserialize_dataclass, serialize_dataclass
+from gl_hsc_scantling.binary import SessionFile
+from gl_hsc_scantling.bulk import constructor
+from gl_hsc_scantling.session import COLLECTION_TYPES, Session
+from gl_hsc_scantling.utils import Criteria
+from io import StringIO
 from json import loads
 
 
@@ -9,3 +17,147 @@ def test_session_serialization(session_example: Session):
     new_session = Session()
     new_session.loads_json(orignal_session_json)
     assert session_example == new_session
+
+
+def _ratios(check: pd.DataFrame) -> list:
+    return [
+        value.ratio
+        for row in check.itertuples(index=False)
+        for value in row
+        if isinstance(value, Criteria)
+    ]
+
+
+def test_session_update(session_example: Session):
+    checked = session_example.recompute_dirty()
+    assert checked.empty
+    before = _ratios(session_example.panels_rule_check())
+    # The session's laminates are built only with et_0900
+    fiber = session_example.fibers["e_glass"]
+    assert not session_example.update(fiber, modulus_x=fiber.modulus_x * 2)
+    lamina = session_example.laminas["et_0900"].data
+    affected = session_example.update(lamina, modulus_x=lamina.modulus_x * 2)
+    assert affected
+    rechecked = session_example.recompute_dirty()
+    assert len(rechecked) == len(affected)
+    assert session_example.recompute_dirty().empty
+    fresh = Session()
+    fresh.loads_json(session_example.dumps_json())
+    expected = _ratios(
+        pd.concat(
+            [fresh.panels_rule_check(), fresh.stiffeners_rule_check()],
+            ignore_index=True,
+        )
+    )
+    assert _ratios(rechecked) == pt.approx(expected)
+    assert _ratios(session_example.panels_rule_check()) != pt.approx(before)
+
+
+def test_session_update_targets_dependents(session_example: Session):
+    core = next(iter(session_example.cores.values()))
+    sandwich = [
+        element
+        for element in session_example.panels.values()
+        if getattr(element.model.laminate, "core", None) is core
+    ]
+    single_skin = [
+        element
+        for element in session_example.panels.values()
+        if element not in sandwich
+    ]
+    for element in single_skin:
+        element.model.laminate.area_density
+    affected = session_example.update(core, thickness=core.thickness * 2)
+    assert {id(element) for element in affected} >= {id(el) for el in sandwich}
+    assert not {id(element) for element in affected} & {id(el) for el in single_skin}
+    for element in single_skin:
+        assert "area_density" in vars(element.model.laminate)
+
+
+def test_session_lazy_load(session_example: Session):
+    serialized = session_example.dumps_json()
+    lazy = Session()
+    lazy.loads_json(serialized, lazy=True)
+    name = next(iter(session_example.panels))
+    panel = lazy.panels[name]
+    assert lazy.panels.pending == [
+        other for other in session_example.panels if other != name
+    ]
+    assert panel.rule_check.equals(session_example.panels[name].rule_check)
+    assert len(lazy.stiffener_elements.pending) == len(
+        session_example.stiffener_elements
+    )
+    assert lazy.laminates.pending
+    assert lazy == session_example
+    assert not lazy.laminates.pending
+    assert loads(lazy.dumps_json()) == loads(serialized)
+
+
+def test_session_load_json_stream(session_example: Session):
+    serialized = session_example.dumps_json()
+    streamed = Session()
+    streamed.load_json_stream(StringIO(serialized), chunk_size=64)
+    assert streamed == session_example
+
+
+def test_session_iter_rule_checks(session_example: Session):
+    checks = list(
+        Session().iter_rule_checks(
+            StringIO(session_example.dumps_json()), chunk_size=64, elements_per_check=2
+        )
+    )
+    assert all(len(check) <= 2 for check in checks)
+    expected = pd.concat(
+        [session_example.panels_rule_check(), session_example.stiffeners_rule_check()],
+        ignore_index=True,
+    )
+    assert _ratios(pd.concat(checks, ignore_index=True)) == pt.approx(_ratios(expected))
+
+
+def test_session_binary(session_example: Session, tmp_path):
+    new_session = Session()
+    new_session.loads_binary(session_example.dumps_binary())
+    assert session_example == new_session
+    file_name = tmp_path / "session.bin"
+    session_example.dump_binary(file_name)
+    session_file = SessionFile(file_name)
+    assert session_file.to_dict() == loads(session_example.dumps_json())
+    assert list(session_file.columns("panels")["x"]) == [
+        panel.x for panel in session_example.panels.values()
+    ]
+    span = session_file.columns("stiffener_elements")["span"]
+    assert isinstance(span, np.memmap)
+    assert list(span) == [
+        element.model.span for element in session_example.stiffener_elements.values()
+    ]
+    loaded = Session()
+    loaded.load_binary(file_name)
+    assert session_example == loaded
+
+
+def test_session_binary_nested_values(session_example: Session):
+    laminate = session_example.laminates["et_0900_20x"]
+    session_example.add_stuff(replace(laminate, name="et_0900_20x copy"))
+    loaded = Session()
+    loaded.loads_binary(session_example.dumps_binary())
+    assert loaded == session_example
+    # Plies of the same json text are decoded once, but built for each laminate
+    original = loaded.laminates["et_0900_20x"].ply_stack
+    copy = loaded.laminates["et_0900_20x copy"].ply_stack
+    assert copy == original
+    assert copy is not original
+    assert not {id(ply) for ply in copy.plies} & {id(ply) for ply in original.plies}
+
+
+def test_constructor_matches_deserialize_dataclass(session_example: Session):
+    collections = session_example.session_dict
+    serialized = loads(session_example.dumps_json())
+    for name, types in COLLECTION_TYPES.items():
+        for value in serialized[name]:
+            typ = types[value["typ"]] if isinstance(types, dict) else types
+            assert constructor(typ)(value, collections) == deserialize_dataclass(
+                dct=value,
+                dataclass=typ,
+                build_instance=True,
+                dict_of_collections=collections,
+            )
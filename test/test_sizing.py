@@ -0,0 +1,56 @@
+import numpy as np
+import pytest as pt
+from gl_hsc_scantling.session import Session
+from gl_hsc_scantling.sizing import SectionSizing, _web_key, stiffener_schedule
+from gl_hsc_scantling.stiffeners import Box, TopHat
+
+
+def _sizing(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg, **kwargs):
+    return SectionSizing(
+        stiffener=stiffener_bottom_01.model,
+        pressure=stiffener_bottom_01.design_pressure,
+        dimensions_web=list(np.linspace(0.02, 0.12, 6)),
+        laminates_web=[et_0900_20x, et_0900_20x_45deg],
+        **kwargs,
+    )
+
+
+@pt.mark.parametrize("profile", [{}, {"profile": TopHat}])
+def test_sizing_optimum(profile, stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg):
+    sizing = _sizing(stiffener_bottom_01, et_0900_20x, et_0900_20x_45deg, **profile)
+    candidates = sizing.candidates
+    passing = [
+        section for section in candidates if sizing.check(section)["min_ratio"] >= 1
+    ]
+    assert sizing.optimum.name == passing[0].name
+    evaluated = sizing.evaluate()
+    assert evaluated["section"].iloc[-1] == passing[0].name
+    assert len(evaluated) <= len(candidates)
+
+
+def test_sizing_box_pruning(stiffener_bottom_01, et_0900_20x, sandwich_laminate_skin):
+    # Box webs are shortened by the flanges, so equal web inputs with
+    # different flanges aren't the same web
+    sizing = _sizing(
+        stiffener_bottom_01, et_0900_20x, sandwich_laminate_skin, profile=Box
+    )
+    webs = {}
+    for section in sizing.candidates:
+        profile = section.elmt_container
+        webs.setdefault((profile.laminate_web.name, profile.dimension_web), set()).add(
+            _web_key(section)
+        )
+    assert all(len(keys) == 2 for keys in webs.values())
+    exhaustive = sizing.evaluate(exhaustive=True)
+    assert len(exhaustive) == len(sizing.candidates)
+    passing = exhaustive[exhaustive["min_ratio"] >= 1]
+    assert sizing.optimum.name == passing["section"].iloc[0]
+
+
+def test_stiffener_schedule(session_example: Session, et_0900_20x):
+    elements = list(session_example.stiffener_elements.values())
+    space = dict(dimensions_web=[0.05, 0.1, 0.15], laminates_web=[et_0900_20x])
+    serial = stiffener_schedule(elements, max_workers=1, **space)
+    parallel = stiffener_schedule(elements, max_workers=2, **space)
+    assert len(serial) == len(elements)
+    assert list(serial["section"]) == list(parallel["section"])
@@ -1,5 +1,13 @@
+from dataclasses import replace
+
 import pytest as pt
-from gl_hsc_scantling.shortcut import StructuralElement, Stiffener
+from gl_hsc_scantling.shortcut import StiffenerSection, StructuralElement, Stiffener
+from gl_hsc_scantling.batch import StiffenerBatch, stiffeners_rule_check
+from gl_hsc_scantling.stiffeners import (
+    ATT_PLATE_SECTIONS,
+    BoundaryCondition,
+    SectionCache,
+)
 from .exp_output import ExpStiffenerElement
 from .test_stiffeners_sections import stiff_section_check
 
@@ -15,3 +23,69 @@ def test_bottom_stiffener_01(stiffener_bottom_01, stiffener_bottom_01_exp):
 
 def test_bottom_stiffener_02(stiffener_side_01, stiffener_side_01_exp):
     stiffener_check(stiffener_side_01, stiffener_side_01_exp)
+
+
+def test_att_plate_section_cache(stiffener_bottom_01: StructuralElement):
+    stiffener: Stiffener = stiffener_bottom_01.model
+    section = stiffener.stiff_section_att_plate
+    hits = ATT_PLATE_SECTIONS.hits
+    assert replace(stiffener).stiff_section_att_plate is section
+    assert ATT_PLATE_SECTIONS.hits == hits + 1
+    wider = replace(stiffener, spacing_1=stiffener.spacing_1 * 2)
+    assert wider.stiff_section_att_plate is not section
+    uncached = StiffenerSection(section.elmt_container)
+    assert list(section.bend_stiff(15)) == pt.approx(list(uncached.bend_stiff(15)))
+    assert section.limit_z_center() == pt.approx(uncached.limit_z_center())
+
+
+def test_section_cache_eviction(stiffener_bottom_01: StructuralElement):
+    stiffener: Stiffener = stiffener_bottom_01.model
+    elmt_lists = [
+        replace(
+            stiffener, spacing_1=stiffener.spacing_1 * factor
+        ).stiff_section_att_plate.elmt_container.elmt_lists
+        for factor in (1, 2, 3)
+    ]
+    cache = SectionCache(max_size=2)
+    first = cache.section(elmt_lists[0])
+    cache.section(elmt_lists[1])
+    # The first section is the most recently used, the second one is evicted
+    assert cache.section(elmt_lists[0]) is first
+    cache.section(elmt_lists[2])
+    assert cache.stats == {
+        "size": 2,
+        "hits": 1,
+        "misses": 3,
+        "evictions": 1,
+        "hit_rate": 0.25,
+    }
+    assert cache.section(elmt_lists[0]) is first
+    assert cache.section(elmt_lists[1]) is not first
+    assert cache.misses == 4
+
+
+def test_stiffener_batch(stiffener_bottom_01, stiffener_side_01):
+    bottom: Stiffener = stiffener_bottom_01.model
+    side: Stiffener = stiffener_side_01.model
+    stiffeners = [
+        bottom,
+        side,
+        replace(bottom, bound_cond=BoundaryCondition.SIMPLY_SUPPORTED),
+        replace(side, spacing_2=side.spacing_2 * 1.5, stiff_att_plate=2),
+        replace(bottom, curvature=0.05, stiff_att_angle=10),
+    ]
+    pressures = [100, 20, 50, 30, 80]
+    ratios = StiffenerBatch(stiffeners).ratios(pressures)
+    for (_, row), stiffener, pressure in zip(ratios.iterrows(), stiffeners, pressures):
+        criteria = stiffener.criteria(pressure)
+        assert list(row) == pt.approx([value.ratio for value in criteria.values()])
+    assert list(ratios.columns) == list(criteria)
+    check = stiffeners_rule_check([stiffener_bottom_01, stiffener_side_01])
+    assert list(check["name"]) == [stiffener_bottom_01.name, stiffener_side_01.name]
+
+
+def test_stiffener_batch_empty(panel_bottom_01):
+    assert StiffenerBatch([]).ratios(100).empty
+    assert stiffeners_rule_check([]).empty
+    # Non stiffener elements are left out
+    assert stiffeners_rule_check([panel_bottom_01]).empty
@@ -4,9 +4,22 @@ Created on Wed Jun  9 10:13:09 2021
 
 @author: ruy
 """
+
+import pickle
 from dataclasses import asdict
+
+import numpy as np
 import pytest as pt
-from gl_hsc_scantling.shortcut import StiffenerSection
+from gl_hsc_scantling.shortcut import StiffenerSection, StiffenerSectionWithFoot
+from gl_hsc_scantling.stiffeners import (
+    BendStiff,
+    Box,
+    ClosedU,
+    OpenU,
+    PlacedStiffnerSection,
+    Point2D,
+    SectionElmtRectVert,
+)
 from .exp_output import ExpStiffenerSection
 
 
@@ -34,3 +47,121 @@ def test_ibar_01(ibar_01, ibar_01_exp):
 
 def test_top_hat_01(top_hat_01, top_hat_01_exp):
     stiff_section_check(top_hat_01, top_hat_01_exp)
+
+
+def _elmt_loop_properties(section: StiffenerSection, angle: float) -> list:
+    """Section properties summed up element by element."""
+    elmts = section.elmts
+    stiff = sum(elmt.stiff for elmt in elmts)
+    center = sum((elmt.center(angle) * elmt.stiff for elmt in elmts), Point2D(0, 0))
+    center = center / stiff
+    base = sum((elmt.bend_stiff_base(angle) for elmt in elmts), BendStiff(0, 0))
+    limit_z = [pt.z for elmt in elmts for pt in elmt.limit_z_points(angle)]
+    return [
+        stiff,
+        sum(elmt.shear_stiff for elmt in elmts if elmt.web),
+        sum(elmt.linear_density for elmt in elmts),
+        *center,
+        base.y - stiff * center.z**2,
+        base.z - stiff * center.y**2,
+        min(limit_z),
+        max(limit_z),
+    ]
+
+
+def _section_properties(section: StiffenerSection, angle: float) -> list:
+    return [
+        section.stiff,
+        section.shear_stiff,
+        section.linear_density,
+        *section.center(angle),
+        *section.bend_stiff(angle),
+        *section.limit_z_anchor_pt(angle),
+    ]
+
+
+@pt.mark.parametrize("profile", [OpenU, ClosedU, Box])
+@pt.mark.parametrize("web", ["et_0900_20x", "sandwich_laminate"])
+@pt.mark.parametrize("angle", [0, 25])
+def test_section_arrays(profile, web, angle, et_0900_20x, request):
+    inputs = dict(
+        laminate_web=request.getfixturevalue(web),
+        dimension_web=0.1,
+        laminate_flange=et_0900_20x,
+        dimension_flange=0.08,
+        name="profile",
+    )
+    if profile is ClosedU:
+        inputs["laminate_flange_lower"] = et_0900_20x
+    section = StiffenerSectionWithFoot(profile(**inputs))
+    assert _section_properties(section, angle) == pt.approx(
+        _elmt_loop_properties(section, angle)
+    )
+
+
+@pt.mark.parametrize("section", ["lbar_01", "ibar_01", "top_hat_01"])
+def test_section_arrays_fixtures(section, request):
+    section = request.getfixturevalue(section)
+    assert _section_properties(section, 10) == pt.approx(
+        _elmt_loop_properties(section, 10)
+    )
+
+
+def test_placed_section(lbar_01: StiffenerSection):
+    placed = StiffenerSection(
+        PlacedStiffnerSection(lbar_01, angle=30, anchor_pt=Point2D(0.01, 0.02))
+    )
+    assert list(placed.bend_stiff()) == pt.approx(list(lbar_01.bend_stiff(30)))
+    assert list(placed.center()) == pt.approx(
+        list(lbar_01.center(30) + Point2D(0.01, 0.02))
+    )
+    assert placed.shear_stiff == pt.approx(lbar_01.shear_stiff)
+
+
+def _angle_properties(section, angle) -> list:
+    return [
+        *section.center(angle),
+        *section.bend_stiff(angle),
+        *section.limit_z_center(angle),
+        *(pt.y for pt in section.limit_z_points(angle)),
+    ]
+
+
+@pt.mark.parametrize("section", ["lbar_01", "top_hat_01", "rect"])
+def test_section_angle_array(section, et_0900_20x, request):
+    if section == "rect":
+        section = SectionElmtRectVert(et_0900_20x, 0.1)
+    else:
+        section = request.getfixturevalue(section)
+    angles = np.linspace(-90, 90, 13)
+    fan = np.array(_angle_properties(section, angles))
+    assert fan.shape == (8, 13)
+    for angle, properties in zip(angles, fan.T):
+        assert properties == pt.approx(_angle_properties(section, angle))
+
+
+def test_stiffener_angle_array(stiffener_bottom_01):
+    section = stiffener_bottom_01.model.stiff_section_att_plate
+    angles = np.array([[0, 15], [30, 45]])
+    assert section.bend_stiff(angles).y.shape == (2, 2)
+    assert section.bend_stiff(angles).y[1, 0] == pt.approx(section.bend_stiff(30).y)
+
+
+def test_vector_2d():
+    point = Point2D(1.0, 2.0)
+    assert point + Point2D(1, 1) == Point2D(2, 3)
+    assert point - 1 == Point2D(0, 1)
+    assert 2 - point == Point2D(1, 0)
+    assert np.float64(2) * point == Point2D(2, 4)
+    assert point / Point2D(2, 4) == Point2D(0.5, 0.5)
+    assert 2 / point == Point2D(2, 1)
+    assert -point == Point2D(-1, -2)
+    assert list(point) == [1, 2]
+    assert pickle.loads(pickle.dumps(point)) == point
+    assert point != BendStiff(1, 2)
+    stacked = Point2D.stack([point, Point2D(3, np.array([4, 5]))])
+    assert stacked.y.tolist() == [[1, 1], [3, 3]]
+    assert stacked.z.tolist() == [[2, 2], [4, 5]]
+    assert stacked.sum(axis=0).z.tolist() == [6, 7]
+    assert (stacked * np.array([[1], [2]])).sum().z == 22
+    assert stacked.to_array().shape == (2, 2, 2)
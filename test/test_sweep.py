@@ -0,0 +1,42 @@
+import pytest as pt
+from dataclasses import replace
+from gl_hsc_scantling.session import Session
+from gl_hsc_scantling.sweep import VesselSweep, element_results
+from gl_hsc_scantling.vessel import Catamaran, ServiceRange, TypeOfService
+
+
+def test_sweep_loads_match_single_vessel(vessel_ex1: Catamaran):
+    sweep = VesselSweep(
+        vessel_ex1,
+        speeds=[10, 15, 30],
+        displacements=[4, 6],
+        types_of_service=[TypeOfService.PASSENGER, TypeOfService.PILOT],
+        service_ranges=[ServiceRange.USR, ServiceRange.RSA_20],
+    )
+    loads = sweep.loads
+    assert len(loads) == 3 * 2 * 2 * 2
+    for vessel, row in zip(sweep.variants, loads.itertuples()):
+        expected = [getattr(vessel, name) for name in sweep.load_names]
+        assert [getattr(row, name) for name in sweep.load_names] == pt.approx(expected)
+
+
+def test_sweep_session_results(session_example: Session):
+    vessel = session_example.vessels["catamaran"]
+    sweep = VesselSweep(vessel, speeds=[15, 25], displacements=[6])
+    results = sweep.session_results(session_example, max_workers=1)
+    assert len(results) == 2
+    elements = list(session_example.panels.values()) + list(
+        session_example.stiffener_elements.values()
+    )
+    for variant, row in zip(sweep.variants, results.itertuples()):
+        expected = [element_results(replace(elmt, vessel=variant)) for elmt in elements]
+        assert row.structural_mass == pt.approx(sum(e["mass"] for e in expected))
+        assert row.min_ratio == pt.approx(min(e["min_ratio"] for e in expected))
+
+
+def test_sweep_parallel_matches_serial(session_example: Session):
+    vessel = session_example.vessels["catamaran"]
+    sweep = VesselSweep(vessel, speeds=[15, 20, 25])
+    serial = sweep.session_results(session_example, max_workers=1)
+    parallel = sweep.session_results(session_example, max_workers=2)
+    assert list(parallel["min_ratio"]) == pt.approx(list(serial["min_ratio"]))
@@ -0,0 +1,63 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest as pt
+from gl_hsc_scantling.session import Session
+from gl_hsc_scantling.takeoff import GROUPINGS, MassTakeOff
+
+
+def _assert_same_rollups(takeoff: MassTakeOff, rebuilt: MassTakeOff):
+    for by in GROUPINGS:
+        pd.testing.assert_frame_equal(
+            takeoff.rollup(by).sort_index(), rebuilt.rollup(by).sort_index()
+        )
+
+
+def test_mass_takeoff(session_example: Session):
+    takeoff = MassTakeOff.from_session(session_example, station_length=2)
+    elements = takeoff.elements
+    assert takeoff.mass == pt.approx([elmt.model.mass for elmt in elements])
+    total = takeoff.total
+    assert total["mass"] == pt.approx(takeoff.mass.sum())
+    assert total["lcg"] == pt.approx(
+        np.sum(takeoff.mass * [elmt.x for elmt in elements]) / total["mass"]
+    )
+    assert takeoff.rollup("location")["mass"].sum() == pt.approx(total["mass"])
+    assert len(takeoff.to_frame()) == len(elements)
+
+
+def test_mass_takeoff_incremental(session_example: Session):
+    takeoff = MassTakeOff.from_session(session_example, station_length=2)
+    elements = list(takeoff.elements)
+    panel = next(elmt for elmt in elements if hasattr(elmt.model, "laminate"))
+    laminate = panel.model.laminate
+    heavier = replace(
+        session_example.laminates["Sandwich Laminate"], name=laminate.name
+    )
+    assert heavier.area_density != laminate.area_density
+    takeoff.update_laminate(heavier)
+    moved = replace(elements[-1], x=elements[-1].x + 3, z=elements[-1].z + 0.5)
+    takeoff.update_element(moved)
+    takeoff.remove_element(elements[0])
+
+    def updated(elmt):
+        if hasattr(elmt.model, "laminate") and elmt.model.laminate is laminate:
+            return replace(elmt, model=replace(elmt.model, laminate=heavier))
+        return elmt
+
+    rebuilt = MassTakeOff(
+        [updated(elmt) for elmt in elements[1:-1]] + [moved], station_length=2
+    )
+    _assert_same_rollups(takeoff, rebuilt)
+    # The removed element is left out of elements, so of full rebuilds
+    assert elements[0] not in takeoff.elements
+    assert len(takeoff.elements) == len(elements) - 1
+    moved_again = replace(moved, x=moved.x + 1)
+    takeoff.update_element(moved_again)
+    assert takeoff.elements[-1] is moved_again
+    rebuilt = MassTakeOff(
+        [updated(elmt) for elmt in takeoff.elements[:-1]] + [moved_again],
+        station_length=2,
+    )
+    _assert_same_rollups(takeoff, rebuilt)